@@ -12,6 +12,23 @@ jwt = JWTManager()
 bcrypt = Bcrypt()
 login_manager = LoginManager()
 
+def start_when_serving(app, start):
+    """
+    Run `start` (which starts a background thread) when the app handles its first request.
+    CLI commands and migrations never serve one, and testing apps skip it.
+    """
+    import threading
+    lock = threading.Lock()
+    started = []
+
+    @app.before_request
+    def _start_background_worker():
+        if started or app.testing:
+            return
+        with lock:
+            if not started:
+                started.append(start())
+
 def create_app():
     app = Flask(__name__)
 
@@ -19,6 +36,10 @@ def create_app():
     from app.config import Config
     app.config.from_object(Config)
 
+    # one queue-backed root handler for the whole process, before anything logs
+    from app.logging_config import configure_logging
+    configure_logging(app.config)
+
     # init extensions
     db.init_app(app)
     migrate.init_app(app, db)
@@ -27,10 +48,34 @@ def create_app():
     login_manager.init_app(app)
     login_manager.login_view = None
 
+    from app.services.user_cache import user_identity_cache
+    user_identity_cache.configure(
+        ttl=app.config['USER_CACHE_TTL'],
+        max_size=app.config['USER_CACHE_MAX_SIZE']
+    )
+
+    # keeps match_candidates in step with users and their skills
+    from app.services.candidate_view import CandidateView
+
+    @app.cli.command("refresh-candidates")
+    def refresh_candidates():
+        """Rebuild the match_candidates table from users and their skills."""
+        count = CandidateView.rebuild(db.session.connection())
+        db.session.commit()
+        print(f"Rebuilt match_candidates with {count} helpers")
+
+    # flags near-duplicate requests as they are inserted
+    from app.services.request_dedup import request_deduplicator
+    request_deduplicator.configure(
+        threshold=app.config['DEDUP_THRESHOLD'],
+        window_days=app.config['DEDUP_WINDOW_DAYS'],
+        sync_interval=app.config['DEDUP_SYNC_INTERVAL'],
+        sync_overlap=app.config['DEDUP_SYNC_OVERLAP']
+    )
+
     @login_manager.user_loader
     def load_user(user_id):
-        from app.models.Users import User
-        return User.query.get(int(user_id))
+        return user_identity_cache.load(int(user_id))
 
     # register blueprints (safe imports inside create_app)
     try:
@@ -52,6 +97,157 @@ def create_app():
     except Exception as e:
         app.logger.warning(f"AI matching routes not registered: {e}")
 
+    try:
+        from app.routes.sponsorship_routes import sponsorship_bp
+        app.register_blueprint(sponsorship_bp)
+    except Exception as e:
+        app.logger.warning(f"Sponsorship routes not registered: {e}")
+
+    try:
+        from app.routes.metrics_routes import metrics_bp
+        app.register_blueprint(metrics_bp)
+    except Exception as e:
+        app.logger.warning(f"Metrics routes not registered: {e}")
+
+    try:
+        from app.routes.webhook_routes import webhook_bp
+        app.register_blueprint(webhook_bp)
+    except Exception as e:
+        app.logger.warning(f"Webhook routes not registered: {e}")
+
+    try:
+        from app.routes.sync_routes import sync_bp
+        app.register_blueprint(sync_bp)
+    except Exception as e:
+        app.logger.warning(f"Sync routes not registered: {e}")
+
+    from app.utils.db_routing import pool_metrics
+    from app.utils.metrics import register_metrics_source
+    register_metrics_source('db_pool', pool_metrics)
+    register_metrics_source('request_dedup', request_deduplicator.stats)
+
+    # matching requests are queued by detected urgency
+    from app.ai_matching.priority_scheduler import matching_scheduler, parse_deadlines
+    matching_scheduler.configure(
+        workers=app.config['MATCHING_WORKERS'],
+        reserved_workers=app.config['MATCHING_RESERVED_WORKERS'],
+        deadlines=parse_deadlines(app.config['MATCHING_DEADLINES']),
+        max_queue=app.config['MATCHING_QUEUE_SIZE']
+    )
+    if app.config['MATCHING_WAIT_TIMEOUT'] <= max(matching_scheduler.deadlines.values()):
+        app.logger.warning("MATCHING_WAIT_TIMEOUT is not longer than the latest matching deadline; "
+                           "low-urgency requests will time out before they are due")
+    register_metrics_source('matching_queue', matching_scheduler.stats)
+
+    from app.ai_matching.admission_control import matching_admission
+    matching_admission.configure(
+        user_rate=app.config['MATCHING_USER_RATE'],
+        user_burst=app.config['MATCHING_USER_BURST'],
+        global_rate=app.config['MATCHING_GLOBAL_RATE'],
+        global_burst=app.config['MATCHING_GLOBAL_BURST'],
+        max_in_flight=app.config['MATCHING_MAX_IN_FLIGHT'],
+        cost_unit=app.config['MATCHING_COST_UNIT']
+    )
+    register_metrics_source('matching_admission', matching_admission.stats)
+
+    from app.ai_matching.match_events import match_event_hub
+    match_event_hub.configure(buffer_size=app.config['MATCH_STREAM_BUFFER'])
+    register_metrics_source('match_events', match_event_hub.stats)
+
+    try:
+        from app.ai_matching.db_integrated_matcher import db_matcher
+        register_metrics_source('skill_registry', db_matcher.skill_registry.stats)
+        db_matcher.db_breaker.configure(
+            failure_rate=app.config['MATCHER_BREAKER_FAILURE_RATE'],
+            slow_call_rate=app.config['MATCHER_BREAKER_SLOW_RATE'],
+            slow_call_seconds=app.config['MATCHER_BREAKER_SLOW_SECONDS'],
+            window_size=app.config['MATCHER_BREAKER_WINDOW'],
+            min_calls=app.config['MATCHER_BREAKER_MIN_CALLS'],
+            open_seconds=app.config['MATCHER_BREAKER_OPEN_SECONDS'],
+            half_open_calls=app.config['MATCHER_BREAKER_HALF_OPEN_CALLS']
+        )
+        register_metrics_source('matcher_db', db_matcher.db_health)
+        db_matcher.result_cache.configure(
+            ttl=app.config['MATCH_RESULT_TTL'],
+            max_size=app.config['MATCH_RESULT_CACHE_SIZE']
+        )
+        register_metrics_source('match_results', db_matcher.result_cache.stats)
+    except Exception as e:
+        app.logger.warning(f"Matcher metrics not registered: {e}")
+
+    # webhook events are acknowledged on receipt and applied here, in batches
+    from app.services.webhook_processor import WebhookEventProcessor, start_webhook_consumer
+
+    @app.cli.command("process-webhook-events")
+    def process_webhook_events():
+        """Apply every received webhook event now."""
+        print(f"Processed {WebhookEventProcessor.drain(app.config['WEBHOOK_BATCH_SIZE'])} webhook events")
+
+    @app.cli.command("pair-requests")
+    def pair_requests():
+        """Pair unmatched pending requests into Match rows."""
+        from app.ai_matching.request_pairing import request_pairing_engine
+        summary = request_pairing_engine.run()
+        print(f"Paired {summary['matches_created']} matches from {summary['pending_requests']} pending requests "
+              f"in {summary['elapsed_ms']} ms")
+
+    if app.config['WEBHOOK_CONSUMER_ENABLED']:
+        start_when_serving(app, lambda: start_webhook_consumer(
+            app,
+            interval=app.config['WEBHOOK_CONSUMER_INTERVAL'],
+            batch_size=app.config['WEBHOOK_BATCH_SIZE']
+        ))
+
+    # batch helper assignment: on demand (CLI / route) and optionally on a timer
+    try:
+        from app.ai_matching.assignment_scheduler import assignment_scheduler, start_assignment_scheduler
+        assignment_scheduler.configure(
+            top_k=app.config['ASSIGNMENT_TOP_K'],
+            helper_capacity=app.config['ASSIGNMENT_HELPER_CAPACITY']
+        )
+
+        @app.cli.command("assign-helpers")
+        def assign_helpers():
+            """Assign helpers to every pending request in one batch."""
+            summary = assignment_scheduler.run()
+            print(f"Assigned {summary['assigned']} of {summary['pending_requests']} pending requests "
+                  f"in {summary['elapsed_ms']} ms")
+
+        if app.config['ASSIGNMENT_SCHEDULER_ENABLED']:
+            start_when_serving(app, lambda: start_assignment_scheduler(app, interval=app.config['ASSIGNMENT_INTERVAL']))
+    except Exception as e:
+        app.logger.warning(f"Assignment scheduler not available: {e}")
+
+    # helper reliability: recomputed from the outcome log, nightly or on demand
+    try:
+        from app.ai_matching.reliability_recompute import reliability_recomputer, start_reliability_recompute
+        from app.ai_matching.db_integrated_matcher import db_matcher
+        reliability_recomputer.configure(
+            half_life_days=app.config['RELIABILITY_HALF_LIFE_DAYS'],
+            prior_weight=app.config['RELIABILITY_PRIOR_WEIGHT']
+        )
+
+        @app.cli.command("recompute-reliability")
+        def recompute_reliability():
+            """Recompute every helper's reliability from match outcomes."""
+            summary = reliability_recomputer.run(matcher=db_matcher)
+            print(f"Recomputed reliability of {summary['helpers_updated']} helpers from {summary['outcomes']} outcomes "
+                  f"in {summary['elapsed_ms']} ms")
+
+        if app.config['RELIABILITY_RECOMPUTE_ENABLED']:
+            start_when_serving(app, lambda: start_reliability_recompute(
+                app, interval=app.config['RELIABILITY_RECOMPUTE_INTERVAL'], matcher=db_matcher))
+    except Exception as e:
+        app.logger.warning(f"Reliability recompute not available: {e}")
+
+    # warm the username pre-filter so sign-up needs a single username query
+    with app.app_context():
+        try:
+            from app.services.username_services import UsernameService
+            UsernameService.warm_username_filter()
+        except Exception as e:
+            app.logger.debug(f"Username filter not warmed: {e}")
+
     # dev CORS
     CORS(app, resources={r"/*": {"origins": "*"}})
 
@@ -0,0 +1,153 @@
+import math
+import threading
+import time
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when a matching request is shed; `retry_after` is in seconds"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Matching request rejected ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now: float) -> float:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def wait_for(self, cost: float) -> float:
+        """Seconds until `cost` tokens are available (0 if they are now); call refill first"""
+        return 0.0 if self.tokens >= cost else (cost - self.tokens) / self.rate
+
+
+class MatchingAdmission:
+    """
+    Admission control in front of the matching scheduler.
+
+    A request is admitted only if fewer than `max_in_flight` matching jobs are queued or
+    running, and both the caller's bucket and the global bucket hold its cost in tokens.
+    Buckets refill at `user_rate` / `global_rate` tokens per second up to their burst size.
+    The cost grows with the pool a request scans: 1 token plus 1 per `cost_unit` candidates,
+    capped at the user burst so every request stays admissible. Nothing waits here; a shed
+    request gets the time until it would have been admitted, for a Retry-After header.
+    """
+
+    def __init__(self, user_rate: float = 1.0, user_burst: float = 10.0, global_rate: float = 20.0,
+                 global_burst: float = 100.0, max_in_flight: int = 16, cost_unit: int = 5000,
+                 max_users: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self._users: Dict[object, TokenBucket] = {}
+        self.configure(user_rate, user_burst, global_rate, global_burst, max_in_flight, cost_unit)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.admitted = 0
+        self.tokens_spent = 0.0
+        self.rejected = {'user_rate': 0, 'global_rate': 0, 'concurrency': 0}
+        self._recent_times = deque(maxlen=1000)
+
+    def configure(self, user_rate=None, user_burst=None, global_rate=None, global_burst=None, max_in_flight=None,
+                  cost_unit=None):
+        with self._lock:
+            if user_rate is not None:
+                self.user_rate = user_rate
+            if user_burst is not None:
+                self.user_burst = user_burst
+            if global_rate is not None or global_burst is not None or not hasattr(self, '_global'):
+                self.global_rate = global_rate if global_rate is not None else self.global_rate
+                self.global_burst = global_burst if global_burst is not None else self.global_burst
+                self._global = TokenBucket(self.global_rate, self.global_burst, self.clock())
+            if max_in_flight is not None:
+                self.max_in_flight = max_in_flight
+            if cost_unit is not None:
+                self.cost_unit = max(1, int(cost_unit))
+            # existing buckets pick up new limits
+            for bucket in self._users.values():
+                bucket.rate, bucket.capacity = self.user_rate, self.user_burst
+
+    def cost(self, pool_size: Optional[int]) -> float:
+        """Tokens a request scanning `pool_size` candidates costs; 1 when the size is unknown"""
+        return min(self.user_burst, 1.0 + (pool_size or 0) / self.cost_unit)
+
+    def _user_bucket(self, user_id, now: float) -> TokenBucket:
+        bucket = self._users.get(user_id)
+        if bucket is None:
+            if len(self._users) >= self.max_users:
+                # a refilled bucket is the same as a new one
+                self._users = {key: b for key, b in self._users.items() if b.refill(now) < b.capacity}
+            bucket = self._users[user_id] = TokenBucket(self.user_rate, self.user_burst, now)
+        return bucket
+
+    def _reject(self, reason: str, retry_after: float):
+        self.rejected[reason] += 1
+        raise AdmissionRejected(reason, retry_after)
+
+    @contextmanager
+    def admit(self, user_id, cost: float = 1.0):
+        """Hold an in-flight slot for the body of the with-block, or raise AdmissionRejected"""
+        with self._lock:
+            now = self.clock()
+            if self.in_flight >= self.max_in_flight:
+                # a slot frees when a running job ends; matching jobs take about a second
+                self._reject('concurrency', 1.0)
+            user = self._user_bucket(user_id, now)
+            user.refill(now)
+            wait = user.wait_for(cost)
+            if wait:
+                self._reject('user_rate', wait)
+            self._global.refill(now)
+            wait = self._global.wait_for(cost)
+            if wait:
+                self._reject('global_rate', wait)
+            user.tokens -= cost
+            self._global.tokens -= cost
+            self.admitted += 1
+            self.tokens_spent += cost
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self._recent_times.append(self.clock() - now)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            recent = sorted(self._recent_times)
+            return {
+                'in_flight': self.in_flight,
+                'peak_in_flight': self.peak_in_flight,
+                'max_in_flight': self.max_in_flight,
+                'admitted': self.admitted,
+                'rejected': dict(self.rejected),
+                'tokens_spent': round(self.tokens_spent, 2),
+                'global_tokens': round(self._global.refill(self.clock()), 2),
+                'tracked_users': len(self._users),
+                'p95_in_flight_ms': round(recent[min(len(recent) - 1, int(0.95 * len(recent)))] * 1000, 3) if recent else 0.0,
+            }
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+matching_admission = MatchingAdmission()
@@ -0,0 +1,263 @@
+import threading
+import time
+import uuid
+import logging
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+try:
+    from .db_integrated_matcher import db_matcher
+    from .candidates import CandidatePool
+    from .match_events import match_event_hub
+    from .automated_ai_matcher import URGENCY_WEIGHTS, SCORE_WEIGHTS
+except ImportError:
+    from db_integrated_matcher import db_matcher
+    from candidates import CandidatePool
+    from match_events import match_event_hub
+    from automated_ai_matcher import URGENCY_WEIGHTS, SCORE_WEIGHTS
+
+OPEN_STATUSES = ('proposed', 'accepted')
+# weight of leaving a request unassigned; any real edge beats it
+UNASSIGNED_WEIGHT = 1e-6
+
+logger = logging.getLogger(__name__)
+
+
+class AssignmentScheduler:
+    """
+    Assigns helpers to all pending requests at once instead of one request at a time.
+
+    Every request keeps its top_k helpers by auto_match score (a sparse edge list, never a
+    dense requests x helpers matrix), each helper offers `capacity` slots, and the
+    assignment maximising the sum of urgency-weighted scores is solved as a sparse
+    bipartite matching. Later slots of the same helper are slightly discounted so load
+    spreads across equally good helpers.
+    """
+
+    def __init__(self, matcher=None, top_k: int = 10, helper_capacity: int = 3,
+                 load_penalty: float = 0.05, min_score: float = 0.2, chunk_size: int = 512):
+        self.matcher = matcher or db_matcher
+        self.top_k = top_k
+        self.helper_capacity = helper_capacity
+        self.load_penalty = load_penalty
+        self.min_score = min_score
+        self.chunk_size = chunk_size
+        self._run_lock = threading.Lock()
+
+    def configure(self, top_k=None, helper_capacity=None):
+        if top_k is not None:
+            self.top_k = top_k
+        if helper_capacity is not None:
+            self.helper_capacity = helper_capacity
+
+    @staticmethod
+    def _request_skill_matrix(codes: List[np.ndarray], width: int) -> csr_matrix:
+        """Requests x skill codes with unit-length rows, so a product with the helper matrix is a cosine"""
+        codes = [c[c < width] for c in codes]
+        lengths = np.array([len(c) for c in codes], dtype=np.int64)
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        indices = np.concatenate(codes) if indptr[-1] else np.zeros(0, dtype=np.int32)
+        data = np.repeat(1.0 / np.sqrt(np.maximum(lengths, 1)), lengths).astype(np.float32)
+        return csr_matrix((data, indices, indptr), shape=(len(codes), width))
+
+    def score_edges(self, requests: List[Dict], pool: CandidatePool, capacities: Optional[np.ndarray] = None):
+        """
+        Sparse top_k edges per request, over helpers with capacity left.
+        Returns (request_rows, helper_rows, scores, urgencies); scores are auto_match scores before urgency.
+
+        Only two kinds of helper can be in a request's top_k: those sharing a skill with it (the
+        nonzeros of the sparse request x helper skill product) and the best helpers for its
+        location on the skill-free part of the score, which is the same for every request there.
+        Only those candidates are scored.
+        """
+        urgencies = [self.matcher.auto_detect_urgency(r.get('description', ''), r.get('title', '')) for r in requests]
+        needed = [self.matcher.auto_extract_skills(r.get('description', ''), r.get('title', '')) for r in requests]
+
+        registry = self.matcher.skill_registry
+        helper_skills = pool.skill_matrix(registry).T.tocsr()
+        request_skills = self._request_skill_matrix(
+            [registry.encode_query(n, r.get('description', '')) for n, r in zip(needed, requests)],
+            helper_skills.shape[0]
+        )
+
+        request_locations = sorted({r.get('location') or 'gaza_center' for r in requests})
+        location_sim = np.array([
+            [self.matcher.auto_calculate_location_distance(a, b) for b in pool.location_names]
+            for a in request_locations
+        ], dtype=np.float64)
+        request_location_codes = {name: i for i, name in enumerate(request_locations)}
+
+        n_helpers = len(pool)
+        helper_scores = (pool.reliability * SCORE_WEIGHTS['reliability']
+                         + np.maximum(0, (24 - pool.avg_response) / 24) * SCORE_WEIGHTS['response'])
+        helper_ids = np.array([-1 if i is None else i for i in pool.ids], dtype=np.int64)
+        full = np.zeros(n_helpers, dtype=bool) if capacities is None else capacities <= 0
+        k = min(self.top_k, n_helpers)
+
+        # skill-free score per request location x helper; full helpers never qualify
+        base = location_sim[:, pool.location_codes] * SCORE_WEIGHTS['location'] + helper_scores
+        base[:, full] = -np.inf
+        # top_k + 1 covers an owner among them; the other top_k leave room to spread load over ties
+        n_base = min(n_helpers, 2 * k + 1)
+        by_base = np.argsort(-base, axis=1, kind='stable')[:, :n_base]
+
+        owners = np.array([r.get('user_id') or -2 for r in requests], dtype=np.int64)
+        in_shared = np.zeros(n_helpers, dtype=bool)
+        rows, cols, scores = [], [], []
+        for start in range(0, len(requests), self.chunk_size):
+            chunk = requests[start:start + self.chunk_size]
+            codes = [request_location_codes[r.get('location') or 'gaza_center'] for r in chunk]
+            skill = (request_skills[start:start + len(chunk)] @ helper_skills).tocsr()
+
+            for i, code in enumerate(codes):
+                row = start + i
+                shared = skill.indices[skill.indptr[i]:skill.indptr[i + 1]]
+                # a helper found both ways keeps its skill similarity
+                in_shared[shared] = True
+                nearby = by_base[code][~in_shared[by_base[code]]]
+                in_shared[shared] = False
+                candidates = np.concatenate([shared, nearby])
+                totals = np.concatenate([
+                    skill.data[skill.indptr[i]:skill.indptr[i + 1]] * SCORE_WEIGHTS['skill'] + base[code, shared],
+                    base[code, nearby]
+                ])
+                # nobody is assigned to their own request
+                keep = (totals >= self.min_score) & (helper_ids[candidates] != owners[row])
+                candidates, totals = candidates[keep], totals[keep]
+                if len(totals) > k:
+                    kth = np.partition(totals, len(totals) - k)[len(totals) - k]
+                    candidates, totals = candidates[totals >= kth], totals[totals >= kth]
+                # equal scores go by helper index rotated per request, so the same tied helpers
+                # are not everyone's top_k
+                top = np.lexsort(((candidates - row) % n_helpers, -totals))[:k]
+                rows.append(np.full(len(top), row, dtype=np.int64))
+                cols.append(candidates[top])
+                scores.append(totals[top])
+
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), urgencies
+        return np.concatenate(rows), np.concatenate(cols), np.concatenate(scores), urgencies
+
+    def solve(self, rows: np.ndarray, cols: np.ndarray, weights: np.ndarray,
+              n_requests: int, capacities: np.ndarray) -> List[Tuple[int, int]]:
+        """Max-weight assignment of requests to helper slots; returns (request_row, helper_row) pairs"""
+        if n_requests == 0 or len(rows) == 0:
+            return []
+
+        capacities = np.maximum(capacities.astype(np.int64), 0)
+        slot_offsets = np.concatenate([[0], np.cumsum(capacities)])
+        n_slots = int(slot_offsets[-1])
+        slot_owner = np.repeat(np.arange(len(capacities)), capacities)
+
+        # one edge per (request, helper slot)
+        edge_caps = capacities[cols]
+        edge_rows = np.repeat(rows, edge_caps)
+        edge_slots = np.arange(int(edge_caps.sum())) - np.repeat(np.cumsum(edge_caps) - edge_caps, edge_caps)
+        edge_cols = np.repeat(slot_offsets[cols], edge_caps) + edge_slots
+        edge_weights = np.repeat(weights, edge_caps) * (1 - self.load_penalty * edge_slots / max(int(capacities.max()), 1))
+
+        # a private "unassigned" column per request keeps a full matching feasible
+        dummy = np.arange(n_requests)
+        graph = csr_matrix(
+            (np.concatenate([edge_weights, np.full(n_requests, UNASSIGNED_WEIGHT)]),
+             (np.concatenate([edge_rows, dummy]), np.concatenate([edge_cols, n_slots + dummy]))),
+            shape=(n_requests, n_slots + n_requests)
+        )
+        _, assigned_cols = min_weight_full_bipartite_matching(graph, maximize=True)
+        return [(int(r), int(slot_owner[c])) for r, c in enumerate(assigned_cols) if c < n_slots]
+
+    def load_problem(self, session):
+        """Pending requests without an open assignment, eligible helpers and their remaining capacity"""
+        from app import db
+        from app.models import Request, HelperAssignment
+
+        open_assignments = session.query(HelperAssignment.request_id).filter(HelperAssignment.status.in_(OPEN_STATUSES))
+        requests = [
+            {'id': id, 'user_id': user_id, 'description': description, 'location': location or 'gaza_center'}
+            for id, user_id, description, location in session.query(
+                Request.id, Request.user_id, Request.description, Request.location
+            ).filter(
+                Request.status == 'pending',
+                ~Request.id.in_(open_assignments)
+            )
+        ]
+
+        pool = self.matcher._load_candidate_pool(session)
+
+        load = dict(session.query(HelperAssignment.helper_id, db.func.count(HelperAssignment.id)).filter(
+            HelperAssignment.status.in_(OPEN_STATUSES)
+        ).group_by(HelperAssignment.helper_id).all())
+        capacities = np.array([self.helper_capacity - load.get(i, 0) for i in pool.ids], dtype=np.int64)
+        return requests, pool, capacities
+
+    def run(self, dry_run: bool = False) -> Dict:
+        """Solve one batch over all pending requests and write the proposed assignments"""
+        from app import db
+        from app.models import HelperAssignment
+
+        with self._run_lock:
+            start = time.perf_counter()
+            requests, pool, capacities = self.load_problem(db.session)
+            if not requests or not len(pool):
+                return {'pending_requests': len(requests), 'helpers': len(pool), 'candidate_edges': 0,
+                        'assigned': 0, 'elapsed_ms': round((time.perf_counter() - start) * 1000, 1), 'assignments': []}
+
+            rows, cols, scores, urgencies = self.score_edges(requests, pool, capacities)
+            urgency_weights = np.array([URGENCY_WEIGHTS.get(u, 1.0) for u in urgencies])
+            pairs = self.solve(rows, cols, scores * urgency_weights[rows], len(requests), capacities)
+
+            edge_score = {(r, c): s for r, c, s in zip(rows.tolist(), cols.tolist(), scores.tolist())}
+            run_id = uuid.uuid4().hex
+            assignments = [{
+                'request_id': requests[r]['id'],
+                'helper_id': pool.ids[h],
+                'score': round(edge_score[(r, h)], 4),
+                'urgency': urgencies[r],
+            } for r, h in pairs]
+
+            if assignments and not dry_run:
+                db.session.execute(
+                    db.insert(HelperAssignment),
+                    [{**a, 'status': 'proposed', 'run_id': run_id} for a in assignments]
+                )
+                db.session.commit()
+                for (r, _), assignment in zip(pairs, assignments):
+                    match_event_hub.publish(assignment['helper_id'], 'assignment', assignment)
+                    match_event_hub.publish(requests[r]['user_id'], 'assignment', assignment)
+
+            summary = {
+                'run_id': None if dry_run else run_id,
+                'pending_requests': len(requests),
+                'helpers': len(pool),
+                'candidate_edges': int(len(rows)),
+                'assigned': len(assignments),
+                'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+                'assignments': assignments,
+            }
+            logger.info("Assignment run: %d/%d requests assigned across %d helpers (%d edges) in %.1f ms",
+                        len(assignments), len(requests), len(pool), len(rows), summary['elapsed_ms'])
+            return summary
+
+
+def start_assignment_scheduler(app, interval=300.0):
+    """Run the scheduler in a daemon thread every `interval` seconds; returns the stop event"""
+    from app import db
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            with app.app_context():
+                try:
+                    assignment_scheduler.run()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.warning("Assignment scheduler pass failed: %s", e)
+                finally:
+                    db.session.remove()
+
+    threading.Thread(target=run, name="assignment-scheduler", daemon=True).start()
+    return stop
+
+
+assignment_scheduler = AssignmentScheduler()
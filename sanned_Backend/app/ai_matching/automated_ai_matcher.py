@@ -7,29 +7,40 @@ import logging
 import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional
+try:
+    from .skill_embeddings import semantic_skill_engine
+    from .skill_registry import skill_registry, SKILL_CATEGORIES, GENERAL_HELP
+    from .candidates import CandidatePool, GAZA_LOCATIONS
+except ImportError:
+    from skill_embeddings import semantic_skill_engine
+    from skill_registry import skill_registry, SKILL_CATEGORIES, GENERAL_HELP
+    from candidates import CandidatePool, GAZA_LOCATIONS
+
+SKILL_SCORERS = ('registry', 'tfidf', 'semantic')
+URGENCY_WEIGHTS = {'critical': 2.0, 'high': 1.5, 'medium': 1.0, 'low': 0.7}
+# weights of the score components; each component is in [0, 1]
+SCORE_WEIGHTS = {'skill': 0.4, 'location': 0.3, 'reliability': 0.2, 'response': 0.1}
+OUTCOME_LOGGER = 'app.ai_matching.outcomes'
 
 class AutomatedAIMatcher:
     def __init__(self):
         self.skill_vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
+        self.skill_scorer = 'registry'
+        self.semantic_engine = semantic_skill_engine
+        self.skill_registry = skill_registry
         self.scaler = StandardScaler()
         self.user_reliability = {}  
         self.match_history = []     
         self.learning_enabled = True
         
         # Gaza location coordinates
-        self.gaza_locations = {
-            'gaza_city': (31.5017, 34.4668),
-            'khan_yunis': (31.3489, 34.3063),
-            'rafah': (31.2889, 34.2417),
-            'deir_al_balah': (31.4181, 34.3511),
-            'jabalya': (31.5314, 34.4833),
-            'beit_lahia': (31.5469, 34.5069),
-            'beit_hanoun': (31.5394, 34.5361),
-            'gaza_center': (31.5017, 34.4668)
-        }
+        self.gaza_locations = dict(GAZA_LOCATIONS)
+        
+        self.skill_mapping = SKILL_CATEGORIES
         
-        logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
+        # Per-outcome events; high volume, so sampled by name in LOG_SAMPLE_RATES
+        self.outcome_logger = logging.getLogger(OUTCOME_LOGGER)
 
     def auto_detect_urgency(self, request_text: str, title: str = "") -> str:
         text = f"{title} {request_text}".lower()
@@ -50,23 +61,12 @@ class AutomatedAIMatcher:
     def auto_extract_skills(self, request_text: str, title: str = "") -> str:
         text = f"{title} {request_text}".lower()
         
-        skill_mapping = {
-            'medical': ['doctor', 'medicine', 'health', 'sick', 'injury', 'hospital', 'treatment'],
-            'food': ['hungry', 'eat', 'meal', 'cooking', 'nutrition', 'bread'],
-            'transport': ['ride', 'car', 'transport', 'move', 'delivery', 'vehicle'],
-            'shelter': ['house', 'home', 'shelter', 'roof', 'building'],
-            'education': ['school', 'teach', 'learn', 'student', 'book'],
-            'tech': ['computer', 'internet', 'phone', 'repair', 'technical'],
-            'legal': ['law', 'legal', 'document', 'paperwork', 'rights'],
-            'childcare': ['baby', 'child', 'kid', 'childcare', 'children']
-        }
-        
         detected_skills = []
-        for skill, keywords in skill_mapping.items():
+        for skill, keywords in self.skill_mapping.items():
             if any(keyword in text for keyword in keywords):
                 detected_skills.append(skill)
         
-        return ' '.join(detected_skills) if detected_skills else 'general_help'
+        return ' '.join(detected_skills) if detected_skills else GENERAL_HELP
 
     def auto_calculate_location_distance(self, loc1: str, loc2: str) -> float:
         coords1 = self.gaza_locations.get(loc1.lower().replace(' ', '_'), self.gaza_locations['gaza_center'])
@@ -99,13 +99,41 @@ class AutomatedAIMatcher:
                 new_score = max(0.1, new_score - 0.02)
         
         self.user_reliability[user_id] = new_score
-        self.logger.info(f"Auto-updated reliability for user {user_id}: {current_score:.3f} -> {new_score:.3f}")
+        self.outcome_logger.info("Auto-updated reliability for user %s: %.3f -> %.3f", user_id, current_score, new_score)
+
+    def auto_location_scores(self, seeker_location: str, pool: CandidatePool) -> np.ndarray:
+        """Location similarity per candidate, computed once per distinct location in the pool"""
+        per_location = np.array([
+            self.auto_calculate_location_distance(seeker_location, name) for name in pool.location_names
+        ], dtype=np.float64)
+        return per_location[pool.location_codes] if len(per_location) else np.zeros(0)
 
-    def auto_match(self, request_data: Dict, available_users: List[Dict]) -> List[Tuple[int, float, Dict]]:
+    def auto_score_skills(self, needed_skills: str, request_data: Dict, pool: CandidatePool, scorer: str = 'registry'):
+        """Skill similarity of each candidate to the request, using the selected scorer"""
+        if scorer == 'registry':
+            # the pool first, so skills it brings are known when the request text is encoded
+            matrix = pool.skill_matrix(self.skill_registry)
+            query = self.skill_registry.encode_query(
+                needed_skills, f"{request_data.get('title', '')} {request_data.get('description', '')}"
+            )
+            return self.skill_registry.similarities(query, matrix)
+        if scorer == 'semantic':
+            if self.semantic_engine.ready:
+                query = f"{needed_skills} {request_data.get('title', '')} {request_data.get('description', '')}"
+                return self.semantic_engine.similarities(query, pool.ids, pool.skills)
+            self.logger.warning("Semantic skill scorer requested but not fitted, using tfidf")
+        
+        skill_features = self.skill_vectorizer.fit_transform([needed_skills] + pool.skills)
+        return cosine_similarity(skill_features[0], skill_features[1:])[0]
+
+    def auto_match(self, request_data: Dict, available_users, skill_scorer: Optional[str] = None,
+                   explain: bool = False, top_k: int = 5, urgency: Optional[str] = None) -> List[Tuple[int, float, Optional[Dict]]]:
+        """Top-k (user_id, score, explanation) for a request; explanations are only built when asked for"""
         if not available_users:
             return []
+        pool = CandidatePool.coerce(available_users, self.auto_get_user_reliability)
         
-        urgency = self.auto_detect_urgency(
+        urgency = urgency or self.auto_detect_urgency(
             request_data.get('description', ''), 
             request_data.get('title', '')
         )
@@ -115,110 +143,63 @@ class AutomatedAIMatcher:
         )
         
         seeker_location = request_data.get('location', 'gaza_center')
-        urgency_weight = {'critical': 2.0, 'high': 1.5, 'medium': 1.0, 'low': 0.7}.get(urgency, 1.0)
+        urgency_weight = URGENCY_WEIGHTS.get(urgency, 1.0)
+        scorer = skill_scorer or request_data.get('skill_scorer') or self.skill_scorer
         
-        matches = []
-        
-        all_skills = [needed_skills] + [user.get('skills', '') for user in available_users]
+        location_similarities = self.auto_location_scores(seeker_location, pool)
         
         try:
-            skill_features = self.skill_vectorizer.fit_transform(all_skills)
-            needed_skills_vector = skill_features[0]
-            user_skill_vectors = skill_features[1:]
-            
-            skill_similarities = cosine_similarity(needed_skills_vector, user_skill_vectors)[0]
-            
-            for i, user in enumerate(available_users):
-                user_id = user.get('id', i)
-                
-                skill_score = skill_similarities[i] * 0.4
-                
-                location_score = self.auto_calculate_location_distance(
-                    seeker_location, user.get('location', 'gaza_center')
-                ) * 0.3
-                
-                reliability_score = self.auto_get_user_reliability(user_id) * 0.2
-                
-                avg_response = user.get('avg_response_time', 12)
-                response_score = max(0, (24 - avg_response) / 24) * 0.1
-                
-                total_score = (skill_score + location_score + reliability_score + response_score) * urgency_weight
-                
-                explanation = {
-                    'urgency_detected': urgency,
-                    'skills_needed': needed_skills,
-                    'skill_match': f"{skill_similarities[i]:.2f}",
-                    'location_match': f"{location_score/0.3:.2f}",
-                    'user_reliability': f"{self.auto_get_user_reliability(user_id):.2f}",
-                    'total_score': f"{total_score:.3f}"
-                }
-                
-                matches.append((user_id, total_score, explanation))
+            skill_similarities = np.asarray(self.auto_score_skills(needed_skills, request_data, pool, scorer))
+            response_scores = np.maximum(0, (24 - pool.avg_response) / 24)
+            totals = (
+                skill_similarities * SCORE_WEIGHTS['skill']
+                + location_similarities * SCORE_WEIGHTS['location']
+                + pool.reliability * SCORE_WEIGHTS['reliability']
+                + response_scores * SCORE_WEIGHTS['response']
+            ) * urgency_weight
+            components = {'skill_match': skill_similarities, 'location_match': location_similarities,
+                          'user_reliability': pool.reliability}
+            detail = {'skills_needed': needed_skills, 'skill_scorer': scorer}
                 
         except Exception as e:
             self.logger.error(f"Auto-matching error: {e}")
-            for i, user in enumerate(available_users):
-                user_id = user.get('id', i)
-                location_score = self.auto_calculate_location_distance(
-                    seeker_location, user.get('location', 'gaza_center')
-                )
-                reliability_score = self.auto_get_user_reliability(user_id)
-                total_score = (location_score * 0.7 + reliability_score * 0.3) * urgency_weight
-                
-                explanation = {
-                    'urgency_detected': urgency,
-                    'simple_match': True,
-                    'location_score': f"{location_score:.2f}",
-                    'reliability_score': f"{reliability_score:.2f}",
-                    'total_score': f"{total_score:.3f}"
-                }
-                
-                matches.append((user_id, total_score, explanation))
+            totals = (location_similarities * 0.7 + pool.reliability * 0.3) * urgency_weight
+            components = {'location_score': location_similarities, 'reliability_score': pool.reliability}
+            detail = {'simple_match': True}
         
-        matches.sort(key=lambda x: x[1], reverse=True)
+        # only the top_k rows are ever ordered or materialized
+        k = min(top_k, len(totals))
+        top = np.argpartition(-totals, k - 1)[:k] if k < len(totals) else np.arange(len(totals))
+        top = top[np.lexsort((top, -totals[top]))]
+        
+        matches = []
+        for row in top.tolist():
+            user_id = pool.ids[row]
+            explanation = None
+            if explain:
+                explanation = {'urgency_detected': urgency, **detail}
+                for name, values in components.items():
+                    explanation[name] = round(float(values[row]), 3)
+                explanation['total_score'] = round(float(totals[row]), 3)
+            matches.append((row if user_id is None else user_id, float(totals[row]), explanation))
         
         self.match_history.append({
             'timestamp': datetime.now().isoformat(),
             'request_id': request_data.get('id'),
-            'matches_found': len(matches),
+            'matches_found': len(totals),
             'top_score': matches[0][1] if matches else 0,
             'urgency': urgency
         })
         
-        return matches[:5]  
-    def auto_process_request(self, request_data: Dict, available_users: List[Dict]) -> Dict:
+        return matches
+    def auto_process_request(self, request_data: Dict, available_users, explain: Optional[bool] = None) -> Dict:
         """Main auto-processing function that handles everything automatically"""
         try:
-            matches = self.auto_match(request_data, available_users)
-            
-            if not matches:
-                return {
-                    'success': False,
-                    'message': 'No suitable helpers found',
-                    'matches': []
-                }
-            
-            formatted_matches = []
-            for user_id, score, explanation in matches:
-                user = next((u for u in available_users if u.get('id') == user_id), None)
-                if user:
-                    formatted_matches.append({
-                        'user_id': user_id,
-                        'user_name': user.get('name', 'Unknown'),
-                        'match_score': round(score, 3),
-                        'location': user.get('location'),
-                        'skills': user.get('skills'),
-                        'reliability': f"{self.auto_get_user_reliability(user_id):.0%}",
-                        'explanation': explanation
-                    })
-            
-            return {
-                'success': True,
-                'request_id': request_data.get('id'),
-                'urgency_detected': matches[0][2].get('urgency_detected'),
-                'matches': formatted_matches,
-                'auto_processed_at': datetime.now().isoformat()
-            }
+            pool = CandidatePool.coerce(available_users, self.auto_get_user_reliability)
+            explain = request_data.get('explain', False) if explain is None else explain
+            urgency = self.auto_detect_urgency(request_data.get('description', ''), request_data.get('title', ''))
+            matches = self.auto_match(request_data, pool, explain=explain, urgency=urgency)
+            return self.auto_format_result(request_data, urgency, matches, pool.get)
             
         except Exception as e:
             self.logger.error(f"Auto-processing failed: {e}")
@@ -227,6 +208,41 @@ class AutomatedAIMatcher:
                 'message': f'Processing error: {str(e)}',
                 'matches': []
             }
+    
+    def auto_format_result(self, request_data: Dict, urgency: str, matches, lookup) -> Dict:
+        """Result payload for auto_match output; `lookup` maps a user id to its Candidate"""
+        if not matches:
+            return {
+                'success': False,
+                'message': 'No suitable helpers found',
+                'matches': []
+            }
+        
+        formatted_matches = []
+        for user_id, score, explanation in matches:
+            user = lookup(user_id)
+            if user:
+                reliability = user.reliability
+                match = {
+                    'user_id': user_id,
+                    'user_name': user.name,
+                    'match_score': round(score, 3),
+                    'location': user.location,
+                    'skills': user.skills,
+                    'reliability': f"{reliability:.0%}",
+                    'reliability_score': round(reliability, 3)
+                }
+                if explanation is not None:
+                    match['explanation'] = explanation
+                formatted_matches.append(match)
+        
+        return {
+            'success': True,
+            'request_id': request_data.get('id'),
+            'urgency_detected': urgency,
+            'matches': formatted_matches,
+            'auto_processed_at': datetime.now().isoformat()
+        }
 
     def auto_learn_from_outcome(self, match_result: Dict):
         """Auto-learn from match outcomes to improve future matching"""
@@ -238,7 +254,7 @@ class AutomatedAIMatcher:
             if user_id:
                 self.auto_update_reliability(user_id, successful, response_time)
                 
-                if self.learning_enabled:
+                if self.learning_enabled and self.outcome_logger.isEnabledFor(logging.INFO):
                     learning_data = {
                         'timestamp': datetime.now().isoformat(),
                         'user_id': user_id,
@@ -247,7 +263,7 @@ class AutomatedAIMatcher:
                         'old_reliability': self.user_reliability.get(user_id, 0.7)
                     }
                     
-                    self.logger.info(f"Auto-learned from outcome: {learning_data}")
+                    self.outcome_logger.info("Auto-learned from outcome: %s", learning_data)
                     
         except Exception as e:
             self.logger.error(f"Auto-learning failed: {e}")
@@ -0,0 +1,182 @@
+import sys
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+ROLES = ('seeker_doer', 'sponsor', 'both', 'admin')
+ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+DEFAULT_LOCATION = 'gaza_center'
+# Gaza location coordinates; a location's id is its position here
+GAZA_LOCATIONS = {
+    'gaza_city': (31.5017, 34.4668),
+    'khan_yunis': (31.3489, 34.3063),
+    'rafah': (31.2889, 34.2417),
+    'deir_al_balah': (31.4181, 34.3511),
+    'jabalya': (31.5314, 34.4833),
+    'beit_lahia': (31.5469, 34.5069),
+    'beit_hanoun': (31.5394, 34.5361),
+    'gaza_center': (31.5017, 34.4668)
+}
+LOCATION_IDS = {name: code for code, name in enumerate(GAZA_LOCATIONS)}
+DEFAULT_RESPONSE_HOURS = 12.0
+
+
+def nearest_location(latitude: float, longitude: float) -> str:
+    """Name of the Gaza location closest to a coordinate (the first one on ties)"""
+    return min(GAZA_LOCATIONS, key=lambda name: (GAZA_LOCATIONS[name][0] - latitude) ** 2
+               + (GAZA_LOCATIONS[name][1] - longitude) ** 2)
+
+
+def _intern(value: Optional[str]) -> str:
+    return sys.intern(value) if value else ''
+
+
+class Candidate:
+    """One helper in a matching pool; slotted so large pools stay cheap to build"""
+    __slots__ = ('id', 'name', 'email', 'phone', 'location', 'skills', 'role_code', 'is_in_gaza',
+                 'reliability', 'avg_response_time', 'skill_codes')
+
+    def __init__(self, id, name: str = 'Unknown', email: str = '', phone: Optional[str] = None,
+                 location: str = DEFAULT_LOCATION, skills: str = '', role: str = 'seeker_doer',
+                 is_in_gaza: bool = False, reliability: float = 0.7,
+                 avg_response_time: float = DEFAULT_RESPONSE_HOURS, skill_codes: Optional[np.ndarray] = None):
+        self.id = id
+        self.name = name or 'Unknown'
+        self.email = email or ''
+        self.phone = phone
+        self.location = _intern(location or DEFAULT_LOCATION)
+        self.skills = _intern(skills)
+        self.role_code = ROLE_CODES.get(role, 0)
+        self.is_in_gaza = bool(is_in_gaza)
+        self.reliability = reliability
+        self.avg_response_time = avg_response_time
+        # sorted skill registry codes; None until encoded
+        self.skill_codes = skill_codes
+
+    @property
+    def role(self) -> str:
+        return ROLES[self.role_code]
+
+    @classmethod
+    def from_dict(cls, user: Dict, reliability: Optional[float] = None) -> 'Candidate':
+        return cls(
+            id=user.get('id'),
+            name=user.get('name', 'Unknown'),
+            email=user.get('email', ''),
+            phone=user.get('phone'),
+            location=user.get('location', DEFAULT_LOCATION),
+            skills=user.get('skills', ''),
+            role=user.get('role', 'seeker_doer'),
+            is_in_gaza=user.get('is_in_gaza', False),
+            reliability=user.get('reliability_score', 0.7) if reliability is None else reliability,
+            avg_response_time=user.get('avg_response_time', DEFAULT_RESPONSE_HOURS)
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'email': self.email,
+            'location': self.location,
+            'skills': self.skills,
+            'role': self.role,
+            'is_in_gaza': self.is_in_gaza,
+            'reliability_score': self.reliability,
+            'avg_response_time': self.avg_response_time,
+            'completion_rate': self.reliability
+        }
+
+
+class CandidatePool:
+    """Columnar view over a list of candidates: numeric arrays for scoring, records for output"""
+
+    def __init__(self, candidates: List[Candidate]):
+        self.candidates = candidates
+        self.location_names: List[str] = []
+        location_index: Dict[str, int] = {}
+        location_codes = np.empty(len(candidates), dtype=np.int32)
+        for row, candidate in enumerate(candidates):
+            code = location_index.get(candidate.location)
+            if code is None:
+                code = location_index[candidate.location] = len(self.location_names)
+                self.location_names.append(candidate.location)
+            location_codes[row] = code
+
+        self.location_codes = location_codes
+        self.ids = [c.id for c in candidates]
+        self.skills = [c.skills for c in candidates]
+        self.role_codes = np.fromiter((c.role_code for c in candidates), dtype=np.int8, count=len(candidates))
+        self.reliability = np.fromiter((c.reliability for c in candidates), dtype=np.float64, count=len(candidates))
+        self.avg_response = np.fromiter(
+            (c.avg_response_time for c in candidates), dtype=np.float64, count=len(candidates)
+        )
+        self._rows = None
+        self._skill_matrix = None
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def __iter__(self):
+        return iter(self.candidates)
+
+    def __getitem__(self, row: int) -> Candidate:
+        return self.candidates[row]
+
+    @classmethod
+    def from_dicts(cls, users: Iterable[Dict], reliability_fn: Optional[Callable] = None) -> 'CandidatePool':
+        return cls([
+            Candidate.from_dict(u, reliability_fn(u.get('id')) if reliability_fn and u.get('id') is not None else None)
+            for u in users
+        ])
+
+    @classmethod
+    def coerce(cls, users, reliability_fn: Optional[Callable] = None) -> 'CandidatePool':
+        """Accept a pool, a list of candidates or a list of legacy user dicts"""
+        if isinstance(users, cls):
+            return users
+        users = list(users)
+        if users and isinstance(users[0], Candidate):
+            return cls(users)
+        return cls.from_dicts(users, reliability_fn)
+
+    def skill_matrix(self, registry) -> csr_matrix:
+        """
+        Candidates x skill codes, each row scaled to unit length, built once per pool.
+        Candidates that arrived without codes (legacy dicts) are encoded from their skill text.
+        """
+        if self._skill_matrix is None:
+            for candidate in self.candidates:
+                if candidate.skill_codes is None:
+                    candidate.skill_codes = registry.encode_text(candidate.skills)
+            lengths = np.fromiter((len(c.skill_codes) for c in self.candidates), dtype=np.int64, count=len(self))
+            indptr = np.concatenate([[0], np.cumsum(lengths)])
+            indices = np.concatenate([c.skill_codes for c in self.candidates]) if indptr[-1] else np.zeros(0, dtype=np.int32)
+            data = np.repeat(1.0 / np.sqrt(np.maximum(lengths, 1)), lengths).astype(np.float32)
+            self._skill_matrix = csr_matrix((data, indices, indptr), shape=(len(self), len(registry)))
+        return self._skill_matrix
+
+    def subset(self, rows) -> 'CandidatePool':
+        """Pool of the given rows, reusing this pool's arrays and skill matrix"""
+        rows = np.asarray(rows, dtype=np.int64)
+        pool = CandidatePool.__new__(CandidatePool)
+        pool.candidates = [self.candidates[row] for row in rows.tolist()]
+        pool.location_names = self.location_names
+        pool.location_codes = self.location_codes[rows]
+        pool.ids = [self.ids[row] for row in rows.tolist()]
+        pool.skills = [self.skills[row] for row in rows.tolist()]
+        pool.role_codes = self.role_codes[rows]
+        pool.reliability = self.reliability[rows]
+        pool.avg_response = self.avg_response[rows]
+        pool._rows = None
+        pool._skill_matrix = self._skill_matrix[rows] if self._skill_matrix is not None else None
+        return pool
+
+    def row_of(self, user_id) -> Optional[int]:
+        if self._rows is None:
+            self._rows = {user_id: row for row, user_id in enumerate(self.ids)}
+        return self._rows.get(user_id)
+
+    def get(self, user_id) -> Optional[Candidate]:
+        row = self.row_of(user_id)
+        return None if row is None else self.candidates[row]
@@ -4,9 +4,15 @@ import os
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
-from automated_ai_matcher import AutomatedAIMatcher
+from automated_ai_matcher import AutomatedAIMatcher, URGENCY_WEIGHTS, SCORE_WEIGHTS
+from candidates import Candidate, CandidatePool, GAZA_LOCATIONS, LOCATION_IDS, DEFAULT_LOCATION
+from result_cache import MatchResultCache
 from typing import List, Dict, Tuple, Optional
 import logging
+import threading
+import time
+import numpy as np
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
 
 class DatabaseIntegratedMatcher(AutomatedAIMatcher):
     
@@ -14,15 +20,280 @@ class DatabaseIntegratedMatcher(AutomatedAIMatcher):
         super().__init__()
         self.logger = logging.getLogger(__name__)
         self.has_db = False
+        self.skill_scorer = os.getenv("MATCHING_SKILL_SCORER", "registry")
+        self.embeddings_path = os.getenv("SKILL_EMBEDDINGS_PATH")
+        self.ann_candidates = int(os.getenv("MATCHING_ANN_CANDIDATES", "200"))
+        # one build at a time; helpers are indexed once per process, embeddings are refitted only without a saved file
+        self._semantic_lock = threading.Lock()
+        self._semantic_indexed = False
+        self._load_saved_embeddings()
+        # guards every request-path read; the last good unfiltered pool is served while it is open
+        self.db_breaker = CircuitBreaker('matcher_db')
+        self._last_pool = None
+        self._last_pool_at = None
+        # last good pool per shard set read by sharded matching
+        self._kept_pools = {}
+        self.stale_pool_served = 0
+        # area shards: the seeker's area and the areas at least this similar to it are scanned first,
+        # then one area at a time outward until the top matches are good enough
+        self.sharded = os.getenv("MATCHING_SHARDED", "true").lower() == "true"
+        self.shard_neighbour_similarity = float(os.getenv("MATCHING_SHARD_NEIGHBOUR_SIMILARITY", "0.8"))
+        self.shard_good_score = float(os.getenv("MATCHING_SHARD_GOOD_SCORE", "0.75"))
+        self.shard_stats = {'searches': 0, 'shards_scanned': 0, 'candidates_scanned': 0,
+                            'bound_stops': 0, 'quality_stops': 0, 'exhausted': 0}
+        self.last_scanned = None
+        # results per original request; near-duplicate requests reuse them
+        self.result_cache = MatchResultCache()
     
-    def _convert_user_to_dict(self, user) -> Dict:
-        """Convert user object to dictionary, handling both DB objects and dicts"""
+    def _load_saved_embeddings(self):
+        """Memory-map previously saved skill embeddings so the first semantic request does not refit them"""
+        if not self.embeddings_path or self.semantic_engine.ready or not os.path.exists(f"{self.embeddings_path}.npy"):
+            return
         try:
-            if isinstance(user, dict):
+            self.semantic_engine.load(self.embeddings_path)
+            self.logger.info(f"Loaded skill embeddings from {self.embeddings_path}")
+        except Exception as e:
+            self.logger.warning(f"Could not load skill embeddings from {self.embeddings_path}, they will be refitted: {e}")
+    
+    def build_semantic_index(self) -> bool:
+        """Index eligible helpers, fitting skill embeddings from user_skills co-occurrence unless they were loaded"""
+        with self._semantic_lock:
+            if self._semantic_indexed:
+                return True
+            try:
+                from app.models.Users import User
+                from app.models.userSkills import UserSkills
+                from app.models.skills import Skill
+                from app.utils.db_routing import read_session
+                
+                with read_session() as session:
+                    rows = session.query(UserSkills.user_id, Skill.name).join(
+                        Skill, UserSkills.skill_id == Skill.id
+                    ).join(
+                        User, User.id == UserSkills.user_id
+                    ).filter(
+                        User.roles.in_(['sponsor', 'seeker_doer', 'both']),
+                        User.is_in_gaza == True
+                    ).all()
+                
+                user_skills = {}
+                for user_id, skill_name in rows:
+                    user_skills.setdefault(user_id, []).append(skill_name)
+                
+                if self.semantic_engine.ready:
+                    self.semantic_engine.index_users(user_skills)
+                else:
+                    self.semantic_engine.fit(user_skills, keyword_groups=self.skill_mapping)
+                    if self.embeddings_path:
+                        self.semantic_engine.save(self.embeddings_path)
+                self._semantic_indexed = True
+                return True
+                
+            except Exception as e:
+                self.logger.error(f"Error building semantic skill index: {e}")
+                return False
+    
+    def _load_candidate_pool(self, session, exclude_user_id: int = None, user_ids: Optional[List[int]] = None,
+                             location: str = None, shards: Optional[List[int]] = None) -> CandidatePool:
+        """The matching pool in one scan of the materialized match_candidates table"""
+        from app.models.match_candidates import MatchCandidate
+        
+        self.skill_registry.ensure_loaded()
+        query = session.query(
+            MatchCandidate.user_id, MatchCandidate.name, MatchCandidate.email, MatchCandidate.phone,
+            MatchCandidate.role, MatchCandidate.location, MatchCandidate.skills, MatchCandidate.reliability
+        )
+        if exclude_user_id:
+            query = query.filter(MatchCandidate.user_id != exclude_user_id)
+        if user_ids is not None:
+            query = query.filter(MatchCandidate.user_id.in_(user_ids))
+        if location:
+            query = query.filter(MatchCandidate.location.ilike(f"%{'_'.join(location.lower().split())}%"))
+        if shards is not None:
+            query = query.filter(MatchCandidate.location_id.in_(shards))
+        
+        encode = self.skill_registry.encode_names
+        return CandidatePool([
+            Candidate(
+                id=user_id, name=name, email=email, phone=phone, location=location, skills=' '.join(skills),
+                role=role, is_in_gaza=True,
+                reliability=reliability if reliability is not None else self.auto_get_user_reliability(user_id),
+                skill_codes=encode(skills)
+            )
+            for user_id, name, email, phone, role, location, skills, reliability in query
+        ])
+    
+    def _read_pool(self, exclude_user_id: int = None, user_ids: Optional[List[int]] = None,
+                   location: str = None, shards: Optional[List[int]] = None) -> Tuple[CandidatePool, bool]:
+        """
+        Candidate pool through the DB circuit breaker -> (pool, stale).
+
+        Reads of the whole pool or of a set of shards are kept as the last good pool for that
+        key (the requester is dropped in memory). When a read fails or the breaker is open, the
+        kept pool for the same key, or else the whole pool, is filtered in memory instead;
+        without either the error propagates.
+        """
+        from app.utils.db_routing import read_session
+        
+        kept = user_ids is None and location is None
+        key = tuple(shards) if shards is not None else None
+        
+        def load():
+            with read_session() as session:
+                return self._load_candidate_pool(session, None if kept else exclude_user_id, user_ids, location, shards)
+        
+        try:
+            pool = self.db_breaker.call(load)
+        except Exception as e:
+            if kept and key in self._kept_pools:
+                (cached, read_at), filters = self._kept_pools[key], {}
+            else:
+                cached, read_at = self._last_pool, self._last_pool_at
+                filters = {'user_ids': user_ids, 'location': location, 'shards': shards}
+            if cached is None:
+                raise
+            self.stale_pool_served += 1
+            self.logger.warning("Serving the candidate pool from %.0fs ago: %s", time.time() - read_at, e)
+            return self._filter_pool(cached, exclude_user_id, **filters), True
+        
+        if kept:
+            if key is None:
+                self._last_pool, self._last_pool_at = pool, time.time()
+            else:
+                self._kept_pools[key] = (pool, time.time())
+            pool = self._filter_pool(pool, exclude_user_id)
+        return pool, False
+    
+    def _cached_candidate(self, user_id) -> Optional[Candidate]:
+        """A helper as last read into any kept pool"""
+        pools = [pool for pool, _ in self._kept_pools.values()]
+        if self._last_pool is not None:
+            pools.insert(0, self._last_pool)
+        for pool in pools:
+            candidate = pool.get(user_id)
+            if candidate is not None:
+                return candidate
+        return None
+    
+    @staticmethod
+    def _filter_pool(pool: CandidatePool, exclude_user_id: int = None, user_ids: Optional[List[int]] = None,
+                     location: str = None, shards: Optional[List[int]] = None) -> CandidatePool:
+        """The same filters _load_candidate_pool applies in SQL, over a pool in memory"""
+        keep = np.ones(len(pool), dtype=bool)
+        if exclude_user_id:
+            row = pool.row_of(exclude_user_id)
+            if row is not None:
+                keep[row] = False
+        if user_ids is not None:
+            wanted = set(user_ids)
+            keep &= np.fromiter((user_id in wanted for user_id in pool.ids), dtype=bool, count=len(pool))
+        if location and pool.location_names:
+            key = '_'.join(location.lower().split())
+            matching = np.array([key in (name or '').lower() for name in pool.location_names], dtype=bool)
+            keep &= matching[pool.location_codes]
+        if shards is not None and pool.location_names:
+            wanted = set(shards)
+            default = LOCATION_IDS[DEFAULT_LOCATION]
+            matching = np.array([LOCATION_IDS.get(name, default) in wanted for name in pool.location_names], dtype=bool)
+            keep &= matching[pool.location_codes]
+        return pool if keep.all() else pool.subset(np.flatnonzero(keep))
+    
+    def pool_size_estimate(self, skill_scorer: str = None) -> Optional[int]:
+        """Candidates a request will scan, from the last request or full pool read; None before either"""
+        size = self.last_scanned if self.last_scanned is not None else (
+            len(self._last_pool) if self._last_pool is not None else None
+        )
+        if size is not None and (skill_scorer or self.skill_scorer) == 'semantic' and self.semantic_engine.ready:
+            return min(size, self.ann_candidates)
+        return size
+    
+    def shard_rings(self, seeker_location: str) -> Tuple[List[List[int]], Dict[int, float]]:
+        """
+        Location ids in scan order -> (rings, location similarity of each id to the seeker).
+        The first ring is the seeker's area and its neighbours, then one area at a time outward.
+        """
+        seeker_location = seeker_location or DEFAULT_LOCATION
+        similarity = {
+            LOCATION_IDS[name]: self.auto_calculate_location_distance(seeker_location, name) for name in GAZA_LOCATIONS
+        }
+        order = sorted(similarity, key=lambda shard: (-similarity[shard], shard))
+        first = [shard for shard in order if similarity[shard] >= self.shard_neighbour_similarity] or order[:1]
+        return [first] + [[shard] for shard in order[len(first):]], similarity
+    
+    def _sharded_match(self, request_data: Dict, exclude_user_id: int = None, top_k: int = 5) -> Dict:
+        """
+        Score area shards outward from the seeker. The search stops once the k-th best score
+        reaches what any candidate in the next area could score at most (perfect skill,
+        reliability and response, that area's location score), so stopping there returns the
+        same top k as a full scan. It also stops earlier once the k-th best reaches
+        `shard_good_score` before urgency weighting.
+        """
+        urgency = self.auto_detect_urgency(request_data.get('description', ''), request_data.get('title', ''))
+        weight = URGENCY_WEIGHTS.get(urgency, 1.0)
+        explain = request_data.get('explain', False)
+        rings, similarity = self.shard_rings(request_data.get('location'))
+        
+        best, found, stale, scanned, stop = [], {}, False, 0, 'exhausted'
+        for step, ring in enumerate(rings):
+            pool, ring_stale = self._read_pool(exclude_user_id, shards=ring)
+            stale = stale or ring_stale
+            scanned += len(pool)
+            self.shard_stats['shards_scanned'] += len(ring)
+            if len(pool):
+                matches = self.auto_match(request_data, pool, explain=explain, top_k=top_k, urgency=urgency)
+                for user_id, _, _ in matches:
+                    found[user_id] = pool.get(user_id)
+                best = sorted(best + matches, key=lambda match: -match[1])[:top_k]
+            if step + 1 == len(rings) or len(best) < top_k:
+                continue
+            bound = (SCORE_WEIGHTS['skill'] + SCORE_WEIGHTS['location'] * similarity[rings[step + 1][0]]
+                     + SCORE_WEIGHTS['reliability'] + SCORE_WEIGHTS['response']) * weight
+            if best[-1][1] >= bound:
+                stop = 'bound_stops'
+                break
+            if best[-1][1] >= self.shard_good_score * weight:
+                stop = 'quality_stops'
+                break
+        
+        self.shard_stats['searches'] += 1
+        self.shard_stats['candidates_scanned'] += scanned
+        self.shard_stats[stop] += 1
+        self.last_scanned = scanned
+        if not scanned:
+            return {
+                'success': False,
+                'message': 'No available helpers found in Gaza',
+                'matches': []
+            }
+        
+        result = self.auto_format_result(request_data, urgency, best, found.get)
+        for match in result['matches']:
+            candidate = found[match['user_id']]
+            match['contact_email'] = candidate.email
+            match['contact_phone'] = candidate.phone
+        if stale:
+            result['stale'] = True
+        return result
+    
+    def db_health(self) -> Dict:
+        return {
+            **self.db_breaker.stats(),
+            'stale_pool_served': self.stale_pool_served,
+            'last_pool_size': len(self._last_pool) if self._last_pool is not None else None,
+            'last_pool_age_seconds': round(time.time() - self._last_pool_at, 1) if self._last_pool_at else None,
+            'shards': dict(self.shard_stats),
+        }
+    
+    def _convert_user_to_candidate(self, user, skill_names: Optional[List[str]] = None) -> Candidate:
+        """Convert a user object (or legacy dict) into a slotted candidate record"""
+        try:
+            if isinstance(user, Candidate):
                 return user
+            if isinstance(user, dict):
+                return Candidate.from_dict(user, self.auto_get_user_reliability(user['id']) if user.get('id') else None)
                 
-            user_skills = []
-            if hasattr(user, 'skills') and user.skills:
+            user_skills = list(skill_names) if skill_names is not None else []
+            if skill_names is None and hasattr(user, 'skills') and user.skills:
                 try:
                     for user_skill in user.skills:
                         if hasattr(user_skill, 'skill') and user_skill.skill and hasattr(user_skill.skill, 'name'):
@@ -33,206 +304,253 @@ class DatabaseIntegratedMatcher(AutomatedAIMatcher):
             location = getattr(user, 'localization', None) or getattr(user, 'location', 'gaza_center')
             user_id = getattr(user, 'id', None)
             
-            if user_id:
-                reliability = self.auto_get_user_reliability(user_id)
-            else:
-                reliability = 0.7
+            return Candidate(
+                id=user_id,
+                name=getattr(user, 'username', 'Unknown'),
+                email=getattr(user, 'email', ''),
+                phone=getattr(user, 'phone_number', None),
+                location=location,
+                skills=' '.join(user_skills),
+                role=getattr(user, 'roles', 'seeker_doer'),
+                is_in_gaza=getattr(user, 'is_in_gaza', False),
+                reliability=self.user_reliability_of(user) if user_id else 0.7,
+                skill_codes=self.skill_registry.encode_names(user_skills)
+            )
+        except Exception as e:
+            self.logger.error(f"Error converting user to candidate: {e}")
+            return Candidate(
+                id=getattr(user, 'id', None),
+                name=getattr(user, 'username', 'Unknown'),
+                reliability=0.5
+            )
+    
+    def _result_key(self, request_data: Dict):
+        """
+        Cache key of the original request this one is, or near-duplicates, with the options that
+        change the result; None when it is not near an indexed request.
+        """
+        try:
+            from app.services.request_dedup import request_deduplicator
             
-            return {
-                'id': user_id,
-                'name': getattr(user, 'username', 'Unknown'),
-                'email': getattr(user, 'email', ''),
-                'location': location,
-                'skills': ' '.join(user_skills),
-                'role': getattr(user, 'roles', 'seeker_doer'),
-                'is_in_gaza': getattr(user, 'is_in_gaza', False),
-                'reliability_score': reliability,
-                'avg_response_time': 12.0,
-                'completion_rate': reliability
-            }
+            # the id comes from the client: trust it only for the caller's own request and text
+            try:
+                root = request_deduplicator.root_for(int(request_data.get('id')), request_data.get('user_id'),
+                                                     request_data.get('description'))
+            except (TypeError, ValueError):
+                root = None
+            if root is None:
+                root = request_deduplicator.find_duplicate(request_data.get('description'), user_id=request_data.get('user_id'))
+            if root is None:
+                return None
+            location = '_'.join((request_data.get('location') or DEFAULT_LOCATION).lower().split())
+            scorer = request_data.get('skill_scorer') or self.skill_scorer
+            return root, location, scorer, bool(request_data.get('explain'))
         except Exception as e:
-            self.logger.error(f"Error converting user to dict: {e}")
+            self.logger.warning(f"Duplicate lookup skipped: {e}")
+            return None
+    
+    def find_matches_for_request_from_db(self, request_data: Dict, exclude_user_id: int = None) -> Dict:
+        """Matches for a request; a near-duplicate of a recently matched request reuses its result"""
+        key = self._result_key(request_data)
+        cached = self.result_cache.get(key) if key is not None else None
+        if cached is not None:
+            skip = {exclude_user_id, request_data.get('user_id')}
             return {
-                'id': getattr(user, 'id', None),
-                'name': getattr(user, 'username', 'Unknown'),
-                'location': 'gaza_center',
-                'skills': '',
-                'role': 'seeker_doer',
-                'reliability_score': 0.5
+                **cached,
+                'request_id': request_data.get('id'),
+                'duplicate_of': key[0],
+                'matches': [dict(match) for match in cached['matches'] if match['user_id'] not in skip]
             }
+        
+        result = self._find_matches_from_db(request_data, exclude_user_id)
+        if key is not None and result.get('success') and not result.get('stale'):
+            self.result_cache.put(key, result)
+        return result
     
-    def find_matches_for_request_from_db(self, request_data: Dict, exclude_user_id: int = None) -> Dict:
-        """Find matches using actual database users if available, fallback to test data"""
+    def _find_matches_from_db(self, request_data: Dict, exclude_user_id: int = None) -> Dict:
+        """Find matches among the database helpers; never falls back to made-up helpers"""
         try:
-            # Import database components only when needed
-            from app import db
-            from app.models.Users import User
-            from app.models.userSkills import UserSkills
-            from app.models.skills import Skill
-            from sqlalchemy.orm import joinedload
-            
-            # If we get here, database is available
             self.has_db = True
             
-            # Try to query database
-            query = User.query.filter(
-                User.roles.in_(['sponsor', 'seeker_doer', 'both']),
-                User.is_in_gaza == True
-            )
-            
-            if exclude_user_id:
-                query = query.filter(User.id != exclude_user_id)
-            
-            # Try to load skills if the relationship exists
-            try:
-                query = query.options(joinedload(User.skills))
-            except Exception:
-                pass  # Skills relationship might not be set up
-            
-            available_users = query.all()
-            
-            if not available_users:
+            # Semantic scorer: narrow the pool to the ANN top candidates before loading them
+            user_ids = None
+            scorer = request_data.get('skill_scorer') or self.skill_scorer
+            if scorer == 'semantic':
+                if not self._semantic_indexed and self.db_breaker.state == CircuitBreaker.CLOSED:
+                    self.build_semantic_index()
+                needed_skills = self.auto_extract_skills(
+                    request_data.get('description', ''), request_data.get('title', '')
+                )
+                candidates = self.semantic_engine.search(
+                    f"{needed_skills} {request_data.get('title', '')} {request_data.get('description', '')}",
+                    k=self.ann_candidates
+                )
+                if candidates:
+                    user_ids = [user_id for user_id, _ in candidates]
+            
+            if user_ids is None and self.sharded:
+                return self._sharded_match(request_data, exclude_user_id)
+            
+            # Read-only: served by the replica when one is configured
+            pool, stale = self._read_pool(exclude_user_id, user_ids)
+            self.last_scanned = len(pool)
+            
+            if not len(pool):
                 return {
                     'success': False,
                     'message': 'No available helpers found in Gaza',
                     'matches': []
                 }
             
-            users_data = [self._convert_user_to_dict(user) for user in available_users]
-            
-            result = self.auto_process_request(request_data, users_data)
+            result = self.auto_process_request(request_data, pool)
             
             if result['success']:
                 for match in result['matches']:
-                    db_user = next((u for u in available_users if u.id == match['user_id']), None)
-                    if db_user:
-                        match['db_user'] = db_user
-                        match['contact_email'] = getattr(db_user, 'email', '')
-                        match['contact_phone'] = getattr(db_user, 'phone_number', None)
+                    candidate = pool.get(match['user_id'])
+                    if candidate:
+                        match['contact_email'] = candidate.email
+                        match['contact_phone'] = candidate.phone
+            if stale:
+                result['stale'] = True
             
             return result
             
+        except CircuitOpenError:
+            return self._unavailable()
         except Exception as e:
             self.logger.error(f"Database matching error: {e}")
-            # Fallback to test data if database fails
-            return self._fallback_matching(request_data, exclude_user_id)
+            return self._unavailable()
     
-    def _fallback_matching(self, request_data: Dict, exclude_user_id: int = None) -> Dict:
-        """Fallback matching with test data when database is not available"""
-        test_users = [
-            {
-                'id': 1,
-                'name': 'Dr. Ahmed',
-                'email': 'ahmed@test.com',
-                'location': 'gaza_city',
-                'skills': 'medical doctor pediatric emergency',
-                'role': 'sponsor',
-                'is_in_gaza': True,
-                'avg_response_time': 2
-            },
-            {
-                'id': 2,
-                'name': 'Teacher Sara',
-                'email': 'sara@test.com',
-                'location': 'khan_yunis',
-                'skills': 'education teaching childcare',
-                'role': 'seeker_doer',
-                'is_in_gaza': True,
-                'avg_response_time': 6
-            },
-            {
-                'id': 3,
-                'name': 'Engineer Omar',
-                'email': 'omar@test.com',
-                'location': 'gaza_center',
-                'skills': 'tech computer repair transport',
-                'role': 'both',
-                'is_in_gaza': True,
-                'avg_response_time': 4
-            }
-        ]
-        
-        if exclude_user_id:
-            test_users = [u for u in test_users if u['id'] != exclude_user_id]
-        
-        return self.auto_process_request(request_data, test_users)
+    @staticmethod
+    def _unavailable() -> Dict:
+        """Response when the helper pool cannot be read and no earlier read is kept"""
+        return {
+            'success': False,
+            'message': 'Helper database temporarily unavailable, please retry shortly',
+            'matches': []
+        }
     
-    def find_matches_by_user_id(self, requesting_user_id: int, request_description: str = "", request_title: str = "") -> Dict:
+    def find_matches_by_user_id(self, requesting_user_id: int, request_description: str = "", request_title: str = "",
+                                explain: bool = False) -> Dict:
         """Find matches for a specific user by their ID"""
         try:
             # Import database components only when needed
-            from app import db
             from app.models.Users import User
+            from app.utils.db_routing import read_session
             
-            requesting_user = User.query.get(requesting_user_id)
-            if not requesting_user:
-                return {
-                    'success': False,
-                    'message': 'Requesting user not found',
-                    'matches': []
-                }
+            def load_user():
+                with read_session() as session:
+                    return session.get(User, requesting_user_id)
             
-            location = getattr(requesting_user, 'localization', 'gaza_center')
+            try:
+                requesting_user = self.db_breaker.call(load_user)
+                if not requesting_user:
+                    return {
+                        'success': False,
+                        'message': 'Requesting user not found',
+                        'matches': []
+                    }
+                location = getattr(requesting_user, 'localization', 'gaza_center')
+            except CircuitOpenError:
+                # database down: take the location from the last good pool and match from it
+                cached = self._cached_candidate(requesting_user_id)
+                location = cached.location if cached else 'gaza_center'
             
             request_data = {
                 'id': f"user_request_{requesting_user_id}",
                 'title': request_title or "Help needed",
                 'description': request_description or "General assistance needed",
                 'location': location,
-                'user_id': requesting_user_id
+                'user_id': requesting_user_id,
+                'explain': explain
             }
             
             return self.find_matches_for_request_from_db(request_data, requesting_user_id)
             
         except Exception as e:
             self.logger.error(f"Error finding matches for user {requesting_user_id}: {e}")
-            # Fallback to test data
-            request_data = {
-                'id': f"user_request_{requesting_user_id}",
-                'title': request_title or "Help needed", 
-                'description': request_description or "General assistance needed",
-                'location': 'gaza_center',
-                'user_id': requesting_user_id
-            }
-            return self._fallback_matching(request_data, requesting_user_id)
+            return self._unavailable()
     
-    def save_match_outcome_to_db(self, helper_user_id: int, successful: bool, response_time_hours: float = None):
-        """Save match outcome and update user reliability in the system"""
+    def save_match_outcome_to_db(self, helper_user_id: int, successful: bool, response_time_hours: float = None,
+                                 request_id: int = None, recorded_by: int = None):
+        """
+        Append the outcome to match_outcomes; reliability follows at the next recompute.
+        None when this helper already has an outcome for the request.
+        """
+        from sqlalchemy.exc import IntegrityError
         try:
-            self.auto_learn_from_outcome({
-                'helper_user_id': helper_user_id,
-                'successful': successful,
-                'response_time_hours': response_time_hours
-            })
-            
-            self.logger.info(f"Saved match outcome for user {helper_user_id}: successful={successful}")
+            from app import db
+            from app.models import MatchOutcome
+            
+            db.session.add(MatchOutcome(
+                helper_id=helper_user_id,
+                request_id=request_id,
+                recorded_by=recorded_by,
+                successful=bool(successful),
+                response_time_hours=response_time_hours
+            ))
+            db.session.commit()
+            
+            self.outcome_logger.info("Saved match outcome for user %s: successful=%s", helper_user_id, successful)
             return True
             
+        except IntegrityError as e:
+            db.session.rollback()
+            if request_id is not None and MatchOutcome.query.filter_by(request_id=request_id, helper_id=helper_user_id).first():
+                return None
+            self.logger.error(f"Error saving match outcome: {e}")
+            return False
         except Exception as e:
             self.logger.error(f"Error saving match outcome: {e}")
+            try:
+                db.session.rollback()
+            except Exception:
+                pass
             return False
     
+    def user_reliability_of(self, user) -> float:
+        """Materialized users.reliability_score, or the in-process value until the first recompute"""
+        score = getattr(user, 'reliability_score', None)
+        return score if score is not None else self.auto_get_user_reliability(user.id)
+    
+    def reliability_for_user(self, user_id: int) -> Optional[float]:
+        """Reliability read by id, for principals that do not carry the column; None while the database is unavailable"""
+        try:
+            from app.models.Users import User
+            from app.utils.db_routing import read_session
+            
+            def load_score():
+                with read_session() as session:
+                    return session.query(User.reliability_score).filter(User.id == user_id).scalar()
+            
+            score = self.db_breaker.call(load_score)
+        except Exception as e:
+            self.logger.error(f"Error reading reliability for user {user_id}: {e}")
+            return None
+        return score if score is not None else self.auto_get_user_reliability(user_id)
+    
     def get_user_stats(self, user_id: int) -> Dict:
         try:
             # Import database components only when needed
-            from app import db
             from app.models.Users import User
+            from app.models.userSkills import UserSkills
+            from app.utils.db_routing import read_session
+            
+            def load_stats():
+                with read_session() as session:
+                    user = session.get(User, user_id)
+                    if not user:
+                        return None, 0
+                    return user, session.query(UserSkills).filter(UserSkills.user_id == user_id).count()
             
-            user = User.query.get(user_id)
+            user, skill_count = self.db_breaker.call(load_stats)
             if not user:
                 return {'error': 'User not found'}
             
-            skill_count = 0
-            if hasattr(user, 'skills') and user.skills:
-                try:
-                    skill_count = user.skills.count()
-                except:
-                    skill_count = len(list(user.skills))
-            
             return {
                 'user_id': user_id,
                 'username': user.username,
-                'reliability_score': self.auto_get_user_reliability(user_id),
+                'reliability_score': self.user_reliability_of(user),
                 'skill_count': skill_count,
                 'location': getattr(user, 'localization', ''),
                 'role': getattr(user, 'roles', ''),
@@ -242,73 +560,31 @@ class DatabaseIntegratedMatcher(AutomatedAIMatcher):
             
         except Exception as e:
             self.logger.error(f"Error getting user stats: {e}")
-            # Return test data if database fails
-            return {
-                'user_id': user_id,
-                'username': f'TestUser{user_id}',
-                'reliability_score': self.auto_get_user_reliability(user_id),
-                'skill_count': 2,
-                'location': 'gaza_center',
-                'role': 'seeker_doer',
-                'is_in_gaza': True,
-                'account_created': None
-            }
+            return {'error': 'Helper database temporarily unavailable', 'unavailable': True}
     
     def search_helpers_by_skill(self, skill_name: str, location: str = None) -> List[Dict]:
+        """Helpers holding a skill, given as a Skill.id, a skill name or a category"""
         try:
-            # Import database components only when needed
-            from app import db
-            from app.models.Users import User
-            from app.models.userSkills import UserSkills
-            from app.models.skills import Skill
-            from sqlalchemy.orm import joinedload
-            
-            query = User.query.filter(
-                User.roles.in_(['sponsor', 'seeker_doer', 'both']),
-                User.is_in_gaza == True
-            )
-            
-            if location:
-                query = query.filter(User.localization.ilike(f'%{location}%'))
+            pool, _ = self._read_pool(location=location)
             
-            try:
-                query = query.options(joinedload(User.skills))
-            except:
-                pass
-            
-            users = query.all()
+            code = self.skill_registry.lookup(skill_name)
+            if code is None or not len(pool):
+                return []
+            matrix = pool.skill_matrix(self.skill_registry)
+            rows = matrix[:, code].nonzero()[0] if code < matrix.shape[1] else []
             
             matching_users = []
-            for user in users:
-                user_skills = []
-                if hasattr(user, 'skills') and user.skills:
-                    try:
-                        for user_skill in user.skills:
-                            if hasattr(user_skill, 'skill') and user_skill.skill and hasattr(user_skill.skill, 'name'):
-                                user_skills.append(user_skill.skill.name.lower())
-                    except:
-                        pass
-                
-                if skill_name.lower() in user_skills:
-                    user_dict = self._convert_user_to_dict(user)
-                    user_dict['matching_skill'] = skill_name
-                    matching_users.append(user_dict)
+            for row in sorted(rows):
+                user_dict = pool[row].to_dict()
+                user_dict['matching_skill'] = skill_name
+                matching_users.append(user_dict)
             
             return matching_users
             
+        except CircuitOpenError:
+            return []
         except Exception as e:
             self.logger.error(f"Error searching helpers by skill: {e}")
-            # Return test data for demonstration
-            test_helpers = [
-                {
-                    'id': 1,
-                    'name': 'Dr. Ahmed',
-                    'location': 'gaza_city',
-                    'skills': 'medical doctor pediatric emergency',
-                    'matching_skill': skill_name,
-                    'reliability_score': 0.9
-                }
-            ]
-            return [h for h in test_helpers if skill_name.lower() in h['skills'].lower()]
+            return []
 
 db_matcher = DatabaseIntegratedMatcher()
\ No newline at end of file
@@ -0,0 +1,142 @@
+import itertools
+import json
+import threading
+import time
+import logging
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One open stream; a bounded buffer that drops its oldest events when the client falls behind"""
+
+    def __init__(self, user_id, buffer_size: int):
+        self.user_id = user_id
+        self.events = deque(maxlen=buffer_size)
+        self.dropped = 0
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def push(self, event) -> None:
+        with self._cond:
+            if len(self.events) == self.events.maxlen:
+                self.dropped += 1
+            self.events.append(event)
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+
+    def drain(self, timeout: float) -> List[Dict]:
+        """Wait up to timeout for events and return everything buffered"""
+        with self._cond:
+            if not self.events and not self.closed:
+                self._cond.wait(timeout)
+            events = list(self.events)
+            self.events.clear()
+            return events
+
+
+class MatchEventHub:
+    """
+    In-process fan-out of match events to the streams a user has open.
+
+    publish() never blocks on a slow client: each subscription has its own bounded buffer.
+    The latest snapshot event of each kind is kept for the `max_snapshots` most recent users,
+    so a reconnecting client gets current state at once instead of re-running find-matches.
+    """
+
+    def __init__(self, buffer_size: int = 100, max_snapshots: int = 10000):
+        self.buffer_size = buffer_size
+        self.max_snapshots = max_snapshots
+        self._subscriptions = {}
+        self._snapshots = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+
+    def configure(self, buffer_size=None, max_snapshots=None):
+        if buffer_size is not None:
+            self.buffer_size = buffer_size
+        if max_snapshots is not None:
+            self.max_snapshots = max_snapshots
+
+    def subscribe(self, user_id, replay: bool = True) -> Subscription:
+        subscription = Subscription(user_id, self.buffer_size)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+            snapshots = list(self._snapshots.get(user_id, {}).values()) if replay else []
+        for event in snapshots:
+            subscription.push(event)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.close()
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id, event: str, data, snapshot: bool = False) -> int:
+        """Send an event to every open stream of user_id; returns how many streams got it"""
+        message = {'id': next(self._ids), 'event': event, 'data': data, 'ts': time.time()}
+        with self._lock:
+            self.published += 1
+            if snapshot:
+                self._snapshots.setdefault(user_id, {})[event] = message
+                self._snapshots.move_to_end(user_id)
+                while len(self._snapshots) > self.max_snapshots:
+                    self._snapshots.popitem(last=False)
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+            self.delivered += len(subscriptions)
+        for subscription in subscriptions:
+            subscription.push(message)
+        return len(subscriptions)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            streams = [s for subs in self._subscriptions.values() for s in subs]
+            return {
+                'users_connected': len(self._subscriptions),
+                'streams': len(streams),
+                'published': self.published,
+                'delivered': self.delivered,
+                'dropped': sum(s.dropped for s in streams),
+                'snapshots': len(self._snapshots),
+            }
+
+
+def format_sse(message: Dict) -> str:
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {json.dumps(message['data'], default=str)}\n\n"
+
+
+def stream_events(hub: MatchEventHub, user_id, heartbeat: float = 15.0, max_duration: Optional[float] = None):
+    """
+    SSE body for one client; a comment line is sent every `heartbeat` seconds to keep proxies from closing it.
+    The stream ends after `max_duration` seconds so it frees its worker; the client reconnects after `retry`.
+    """
+    subscription = hub.subscribe(user_id)
+    deadline = time.monotonic() + max_duration if max_duration is not None else None
+    try:
+        yield "retry: 3000\n\n"
+        while deadline is None or time.monotonic() < deadline:
+            wait = heartbeat if deadline is None else max(0.0, min(heartbeat, deadline - time.monotonic()))
+            events = subscription.drain(wait)
+            if subscription.closed:
+                break
+            if not events:
+                yield ": keep-alive\n\n"
+            for message in events:
+                yield format_sse(message)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+match_event_hub = MatchEventHub()
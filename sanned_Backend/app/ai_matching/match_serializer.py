@@ -0,0 +1,90 @@
+import json
+from typing import Dict, Iterable, List, Optional
+from flask import Response
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
+# Response schema of one match, in output order
+MATCH_FIELDS = (
+    'user_id', 'user_name', 'match_score', 'location', 'skills',
+    'reliability', 'contact_email', 'contact_phone', 'explanation'
+)
+# explanation is only sent when asked for
+DEFAULT_FIELDS = tuple(f for f in MATCH_FIELDS if f != 'explanation')
+RESULT_FIELDS = ('success', 'message', 'request_id', 'urgency_detected', 'auto_processed_at', 'stale',
+                 'duplicate_of')
+
+
+def parse_fields(value) -> Optional[List[str]]:
+    """'user_id,match_score' or ['user_id', 'match_score'] -> known field names; raises ValueError on unknown ones"""
+    if not value:
+        return None
+    names = [f.strip() for f in (value.split(',') if isinstance(value, str) else value) if f and f.strip()]
+    unknown = [f for f in names if f not in MATCH_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(MATCH_FIELDS)}")
+    return names
+
+
+def parse_flag(value) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+
+def _numeric(value):
+    if isinstance(value, str):
+        try:
+            return float(value.rstrip('%')) / (100 if value.endswith('%') else 1)
+        except ValueError:
+            return value
+    return value
+
+
+def _compact_value(match: Dict, field: str):
+    if field == 'reliability':
+        return match.get('reliability_score', _numeric(match.get('reliability')))
+    if field == 'explanation':
+        explanation = match.get('explanation')
+        return {k: _numeric(v) for k, v in explanation.items()} if explanation else explanation
+    return match.get(field)
+
+
+def serialize_matches(result: Dict, fields: Optional[Iterable[str]] = None,
+                      compact: bool = False, explain: bool = False) -> Dict:
+    """
+    Shape a matcher result for the wire.
+
+    Default: one object per match with DEFAULT_FIELDS (plus explanation if `explain`).
+    Compact: numbers instead of formatted strings, and matches as rows under a single
+    `fields` header instead of repeating every key per match.
+    """
+    fields = list(fields) if fields else list(DEFAULT_FIELDS)
+    if explain and 'explanation' not in fields:
+        fields.append('explanation')
+
+    payload = {k: result[k] for k in RESULT_FIELDS if k in result}
+    matches = result.get('matches') or []
+    if compact:
+        payload['fields'] = fields
+        payload['matches'] = [[_compact_value(m, f) for f in fields] for m in matches]
+    else:
+        payload['matches'] = [{f: m[f] for f in fields if f in m} for m in matches]
+    return payload
+
+
+def _default(value):
+    # numpy scalars and anything else the encoder does not know
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+def dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, separators=(',', ':'), default=_default).encode()
+
+
+def json_response(payload, status: int = 200) -> Response:
+    return Response(dumps(payload), status=status, mimetype='application/json')
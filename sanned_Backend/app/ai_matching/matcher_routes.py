@@ -1,13 +1,102 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from flask_login import login_required, current_user
+from concurrent.futures import TimeoutError as FutureTimeout
 try:
     from .db_integrated_matcher import db_matcher
+    from .automated_ai_matcher import SKILL_SCORERS
+    from .request_pairing import request_pairing_engine
+    from .assignment_scheduler import assignment_scheduler
+    from .priority_scheduler import matching_scheduler, MatchingQueueFull
+    from .admission_control import matching_admission, AdmissionRejected, retry_after_header
+    from .match_events import match_event_hub, stream_events
+    from .match_serializer import serialize_matches, parse_fields, parse_flag, json_response
 except ImportError:
     from db_integrated_matcher import db_matcher
+    from automated_ai_matcher import SKILL_SCORERS
+    from request_pairing import request_pairing_engine
+    from assignment_scheduler import assignment_scheduler
+    from priority_scheduler import matching_scheduler, MatchingQueueFull
+    from admission_control import matching_admission, AdmissionRejected, retry_after_header
+    from match_events import match_event_hub, stream_events
+    from match_serializer import serialize_matches, parse_fields, parse_flag, json_response
     import logging
 
 matcher_bp = Blueprint('matcher', __name__, url_prefix='/api/matching')
 
+def run_matching(urgency, fn, *args, skill_scorer=None):
+    """
+    Admit the request for the current user, then run it through the urgency scheduler
+    inside this app's context. Raises AdmissionRejected when it is shed.
+    """
+    app = current_app._get_current_object()
+    cost = matching_admission.cost(db_matcher.pool_size_estimate(skill_scorer))
+    
+    def job():
+        with app.app_context():
+            return fn(*args)
+    
+    with matching_admission.admit(current_user.id, cost):
+        return matching_scheduler.run(urgency, job, timeout=app.config['MATCHING_WAIT_TIMEOUT'])
+
+def serialization_options(data):
+    """fields / compact / explain from the JSON body, falling back to the query string"""
+    def option(name):
+        value = data.get(name) if data else None
+        return value if value is not None else request.args.get(name)
+    fields = parse_fields(option('fields'))
+    return {
+        'fields': fields,
+        'compact': parse_flag(option('compact')),
+        # asking for the explanation field is asking for explanations
+        'explain': parse_flag(option('explain')) or 'explanation' in (fields or ())
+    }
+
+def publish_matches(user_id, result, options):
+    """Publish the default payload as the stream snapshot and serialize it again only for non-default options"""
+    payload = serialize_matches(result)
+    match_event_hub.publish(user_id, 'matches', payload, snapshot=True)
+    if options['fields'] or options['compact'] or options['explain']:
+        payload = serialize_matches(result, **options)
+    return json_response(payload)
+
+def run_batch(fn, **kwargs):
+    """
+    Run a global batch job (pairing, assignment) for an admin under admission control.
+    It scans every pending request, so it costs a full user burst.
+    """
+    with matching_admission.admit(current_user.id, matching_admission.user_burst):
+        return fn(**kwargs)
+
+def admin_only_response():
+    return jsonify({
+        'success': False,
+        'message': 'Admin access required'
+    }), 403
+
+def invalid_options_response(error):
+    return jsonify({
+        'success': False,
+        'message': str(error)
+    }), 400
+
+def matching_busy_response(urgency):
+    response = jsonify({
+        'success': False,
+        'message': 'Matching is busy, please retry shortly',
+        'urgency_detected': urgency
+    })
+    response.headers['Retry-After'] = str(int(matching_scheduler.deadlines.get(urgency, 30)))
+    return response, 503
+
+def admission_rejected_response(error):
+    response = jsonify({
+        'success': False,
+        'message': 'Too many matching requests, please retry later',
+        'reason': error.reason
+    })
+    response.headers['Retry-After'] = retry_after_header(error.retry_after)
+    return response, 429
+
 @matcher_bp.route('/find-matches', methods=['POST'])
 @login_required
 def find_matches():
@@ -19,8 +108,13 @@ def find_matches():
     {
         "title": "Need medical help",
         "description": "My child is sick and needs urgent care",
-        "location": "gaza_city"  // optional, uses user's location if not provided
+        "location": "gaza_city",  // optional, uses user's location if not provided
+        "skill_scorer": "semantic",  // optional, "registry" (default), "tfidf" or "semantic"
+        "fields": "user_id,match_score",  // optional, subset of the match schema
+        "compact": true,  // optional, numeric values and matches as rows under "fields"
+        "explain": true  // optional, include the per-match explanation
     }
+    fields / compact / explain may also be passed in the query string.
     """
     try:
         data = request.get_json()
@@ -42,19 +136,38 @@ def find_matches():
                 'message': 'Request description is required'
             }), 400
         
+        skill_scorer = data.get('skill_scorer')
+        if skill_scorer and skill_scorer not in SKILL_SCORERS:
+            return jsonify({
+                'success': False,
+                'message': f"skill_scorer must be one of: {', '.join(SKILL_SCORERS)}"
+            }), 400
+        
+        try:
+            options = serialization_options(data)
+        except ValueError as e:
+            return invalid_options_response(e)
+        
         # Create request data
         request_data = {
             'id': f'request_{current_user.id}_{data.get("timestamp", "")}',
             'title': title,
             'description': description,
             'location': location,
-            'user_id': current_user.id
+            'user_id': current_user.id,
+            'skill_scorer': skill_scorer,
+            'explain': options['explain']
         }
         
-        result = db_matcher.find_matches_for_request_from_db(request_data, current_user.id)
-        
-        return jsonify(result)
+        urgency = db_matcher.auto_detect_urgency(description, title)
+        result = run_matching(urgency, db_matcher.find_matches_for_request_from_db, request_data, current_user.id,
+                              skill_scorer=skill_scorer)
+        return publish_matches(current_user.id, result, options)
         
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except (MatchingQueueFull, FutureTimeout):
+        return matching_busy_response(urgency)
     except Exception as e:
         current_app.logger.error(f"Error in find_matches: {e}")
         return jsonify({
@@ -81,10 +194,20 @@ def find_matches_for_user(user_id):
         title = data.get('request_title', '')
         description = data.get('request_description', '')
         
-        result = db_matcher.find_matches_by_user_id(user_id, description, title)
+        try:
+            options = serialization_options(data)
+        except ValueError as e:
+            return invalid_options_response(e)
+        
+        urgency = db_matcher.auto_detect_urgency(description, title)
+        result = run_matching(urgency, db_matcher.find_matches_by_user_id, user_id, description, title, options['explain'])
         
-        return jsonify(result)
+        return json_response(serialize_matches(result, **options))
         
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except (MatchingQueueFull, FutureTimeout):
+        return matching_busy_response(urgency)
     except Exception as e:
         current_app.logger.error(f"Error in find_matches_for_user: {e}")
         return jsonify({
@@ -103,7 +226,8 @@ def record_match_outcome():
     {
         "helper_user_id": 123,
         "successful": true,
-        "response_time_hours": 2.5
+        "response_time_hours": 2.5,
+        "request_id": 45  // one of your requests; one outcome per request and helper
     }
     """
     try:
@@ -119,15 +243,46 @@ def record_match_outcome():
         successful = data.get('successful', False)
         response_time = data.get('response_time_hours')
         
-        if not helper_user_id:
+        request_id = data.get('request_id')
+        
+        if not helper_user_id or not request_id:
+            return jsonify({
+                'success': False,
+                'message': 'helper_user_id and request_id are required'
+            }), 400
+        
+        if str(helper_user_id) == str(current_user.id):
             return jsonify({
                 'success': False,
-                'message': 'helper_user_id is required'
+                'message': 'You cannot record an outcome for yourself'
             }), 400
         
+        # outcomes drive every helper's reliability: only the requester reports, once per helper
+        from app import db
+        from app.models import Request, MatchOutcome
+        owned = db.session.get(Request, request_id)
+        if owned is None or owned.user_id != current_user.id:
+            return jsonify({
+                'success': False,
+                'message': 'You can only record outcomes for your own requests'
+            }), 403
+        if MatchOutcome.query.filter_by(request_id=owned.id, helper_id=helper_user_id).first():
+            return jsonify({
+                'success': False,
+                'message': 'An outcome for this helper and request is already recorded'
+            }), 409
+        
         # Save outcome and let AI learn
-        success = db_matcher.save_match_outcome_to_db(helper_user_id, successful, response_time)
+        success = db_matcher.save_match_outcome_to_db(
+            helper_user_id, successful, response_time,
+            request_id=owned.id, recorded_by=current_user.id
+        )
         
+        if success is None:
+            return jsonify({
+                'success': False,
+                'message': 'An outcome for this helper and request is already recorded'
+            }), 409
         if success:
             return jsonify({
                 'success': True,
@@ -156,6 +311,11 @@ def get_user_stats(user_id):
     try:
         stats = db_matcher.get_user_stats(user_id)
         
+        if stats.get('unavailable'):
+            return jsonify({
+                'success': False,
+                'message': stats['error']
+            }), 503
         if 'error' in stats:
             return jsonify({
                 'success': False,
@@ -178,7 +338,7 @@ def get_user_stats(user_id):
 @login_required
 def search_helpers():
     """
-    Search for helpers with specific skills
+    Search for helpers with specific skills; skill is a skill name, Skill.id or category
     GET /api/matching/search-helpers?skill=medical&location=gaza_city
     """
     try:
@@ -216,7 +376,13 @@ def get_my_reliability():
     GET /api/matching/my-reliability
     """
     try:
-        reliability = db_matcher.auto_get_user_reliability(current_user.id)
+        # the cached principal carries identity columns only; the score is kept current by the recompute
+        reliability = db_matcher.reliability_for_user(current_user.id)
+        if reliability is None:
+            return jsonify({
+                'success': False,
+                'message': 'Helper database temporarily unavailable'
+            }), 503
         
         return jsonify({
             'success': True,
@@ -240,8 +406,117 @@ def get_my_reliability():
             'message': 'Internal server error'
         }), 500
 
+@matcher_bp.route('/pair-requests', methods=['POST'])
+@login_required
+def pair_requests():
+    """
+    Pair pending requests with each other and store the pairs as Match rows (admins only)
+    POST /api/matching/pair-requests
+    
+    JSON Body (all optional):
+    {
+        "dry_run": true,     // score and select pairs without writing them
+        "min_score": 0.35
+    }
+    """
+    if current_user.roles != 'admin':
+        return admin_only_response()
+    try:
+        data = request.get_json(silent=True) or {}
+        dry_run = bool(data.get('dry_run', False))
+        
+        min_score = data.get('min_score')
+        if min_score is not None:
+            try:
+                min_score = float(min_score)
+            except (TypeError, ValueError):
+                min_score = None
+            if min_score is None or not 0.0 <= min_score <= 1.0:
+                return jsonify({
+                    'success': False,
+                    'message': 'min_score must be a number between 0 and 1'
+                }), 400
+        summary = run_batch(request_pairing_engine.run, dry_run=dry_run, min_score=min_score)
+        if not dry_run:
+            summary.pop('pairs')
+        
+        return jsonify({
+            'success': True,
+            'dry_run': dry_run,
+            **summary
+        })
+        
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except Exception as e:
+        current_app.logger.error(f"Error in pair_requests: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'Internal server error'
+        }), 500
+
+@matcher_bp.route('/assign-helpers', methods=['POST'])
+@login_required
+def assign_helpers():
+    """
+    Assign helpers to all pending requests in one batch, respecting helper capacity (admins only)
+    POST /api/matching/assign-helpers
+    
+    JSON Body (optional):
+    {
+        "dry_run": true   // solve without writing assignments
+    }
+    """
+    if current_user.roles != 'admin':
+        return admin_only_response()
+    try:
+        data = request.get_json(silent=True) or {}
+        dry_run = bool(data.get('dry_run', False))
+        
+        summary = run_batch(assignment_scheduler.run, dry_run=dry_run)
+        if not dry_run:
+            summary.pop('assignments', None)
+        
+        return jsonify({
+            'success': True,
+            'dry_run': dry_run,
+            **summary
+        })
+        
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except Exception as e:
+        current_app.logger.error(f"Error in assign_helpers: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'Internal server error'
+        }), 500
+
+@matcher_bp.route('/stream', methods=['GET'])
+@login_required
+def stream_matches():
+    """
+    Server-Sent Events stream of the current user's match events
+    GET /api/matching/stream
+    
+    Events: "matches" (latest find-matches result, replayed on connect),
+    "request_matched" (one of your requests was paired), "assignment" (helper assigned).
+    The stream closes after MATCH_STREAM_MAX_DURATION seconds and the client reconnects.
+    """
+    body = stream_events(
+        match_event_hub,
+        current_user.id,
+        heartbeat=current_app.config['MATCH_STREAM_HEARTBEAT'],
+        max_duration=current_app.config['MATCH_STREAM_MAX_DURATION']
+    )
+    return Response(stream_with_context(body), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 # Auto-trigger route for when requests are created
 @matcher_bp.route('/auto-process-request', methods=['POST'])
+@login_required
 def auto_process_new_request():
     """
     Automatically process a new request (called internally when requests are created)
@@ -269,21 +544,36 @@ def auto_process_new_request():
                 'message': 'Missing required fields: request_id, description, user_id'
             }), 400
         
+        if str(requesting_user_id) != str(current_user.id) and current_user.roles != 'admin':
+            return jsonify({
+                'success': False,
+                'message': 'You can only process your own requests'
+            }), 403
+        
+        try:
+            options = serialization_options(data)
+        except ValueError as e:
+            return invalid_options_response(e)
+        
         # Create request data for AI processing
         request_data = {
             'id': request_id,
             'title': title,
             'description': description,
             'location': location,
-            'user_id': requesting_user_id
+            'user_id': requesting_user_id,
+            'explain': options['explain']
         }
         
         # Automatically find matches
-        result = db_matcher.find_matches_for_request_from_db(request_data, requesting_user_id)
-        
-        
-        return jsonify(result)
-        
+        urgency = db_matcher.auto_detect_urgency(description, title)
+        result = run_matching(urgency, db_matcher.find_matches_for_request_from_db, request_data, requesting_user_id)
+        return publish_matches(requesting_user_id, result, options)
+        
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except (MatchingQueueFull, FutureTimeout):
+        return matching_busy_response(urgency)
     except Exception as e:
         current_app.logger.error(f"Error in auto_process_new_request: {e}")
         return jsonify({
@@ -0,0 +1,197 @@
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Optional
+
+# highest first; also the order ties are broken in
+URGENCY_LEVELS = ('critical', 'high', 'medium', 'low')
+# seconds a request of each level may wait before it should have started
+DEFAULT_DEADLINES = {'critical': 2.0, 'high': 10.0, 'medium': 30.0, 'low': 120.0}
+
+logger = logging.getLogger(__name__)
+
+
+class MatchingQueueFull(RuntimeError):
+    """Raised when the queue for an urgency level is at capacity"""
+
+
+class _Job:
+    __slots__ = ('fn', 'args', 'kwargs', 'urgency', 'enqueued', 'deadline', 'future')
+
+    def __init__(self, fn, args, kwargs, urgency, enqueued, deadline):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.urgency = urgency
+        self.enqueued = enqueued
+        self.deadline = deadline
+        self.future = Future()
+
+
+class _LevelStats:
+    __slots__ = ('submitted', 'started', 'completed', 'failed', 'rejected', 'deadline_misses', 'total_wait', 'max_wait', 'recent_waits')
+
+    def __init__(self):
+        self.submitted = self.started = self.completed = self.failed = self.rejected = self.deadline_misses = 0
+        self.total_wait = self.max_wait = 0.0
+        self.recent_waits = deque(maxlen=1000)
+
+
+class UrgencyPriorityScheduler:
+    """
+    Runs matching work on a worker pool, ordered by urgency.
+
+    Each level has its own FIFO queue and a start deadline; workers always take the job
+    whose deadline is earliest, so a low-urgency job that has waited long enough overtakes
+    newly arrived critical ones (aging) and nothing starves. `reserved_workers` only ever
+    take critical jobs, so critical requests keep their latency even when every other
+    worker is busy with a backlog.
+    """
+
+    def __init__(self, workers: int = 4, reserved_workers: int = 1, deadlines: Optional[Dict[str, float]] = None,
+                 max_queue: int = 500, clock: Callable[[], float] = time.monotonic):
+        self.workers = workers
+        self.reserved_workers = reserved_workers
+        self.deadlines = dict(DEFAULT_DEADLINES, **(deadlines or {}))
+        self.max_queue = max_queue
+        self.clock = clock
+        self._queues = {level: deque() for level in URGENCY_LEVELS}
+        self._stats = {level: _LevelStats() for level in URGENCY_LEVELS}
+        self._cond = threading.Condition()
+        self._threads = []
+        self._stopping = False
+
+    def configure(self, workers=None, reserved_workers=None, deadlines=None, max_queue=None):
+        """Apply settings; only takes effect for workers started afterwards"""
+        if workers is not None:
+            self.workers = workers
+        if reserved_workers is not None:
+            self.reserved_workers = reserved_workers
+        if deadlines:
+            self.deadlines.update(deadlines)
+        if max_queue is not None:
+            self.max_queue = max_queue
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        reserved = min(self.reserved_workers, max(self.workers - 1, 0))
+        for i in range(self.workers):
+            levels = ('critical',) if i < reserved else URGENCY_LEVELS
+            thread = threading.Thread(target=self._work, args=(levels,), name=f"matching-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, urgency: str, fn: Callable, *args, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs) at the given urgency and return its Future"""
+        if urgency not in self._queues:
+            urgency = 'medium'
+        now = self.clock()
+        job = _Job(fn, args, kwargs, urgency, now, now + self.deadlines[urgency])
+        with self._cond:
+            stats = self._stats[urgency]
+            if len(self._queues[urgency]) >= self.max_queue:
+                stats.rejected += 1
+                raise MatchingQueueFull(f"{urgency} matching queue is full")
+            self._ensure_started()
+            stats.submitted += 1
+            self._queues[urgency].append(job)
+            self._cond.notify_all()
+        return job.future
+
+    def _next_job(self, levels):
+        """Earliest-deadline head across the given levels; caller holds the lock"""
+        best = None
+        for level in levels:
+            queue = self._queues[level]
+            if queue and (best is None or queue[0].deadline < best[0].deadline):
+                best = queue
+        return best.popleft() if best else None
+
+    def _work(self, levels):
+        while True:
+            with self._cond:
+                job = self._next_job(levels)
+                while job is None:
+                    if self._stopping:
+                        return
+                    self._cond.wait()
+                    job = self._next_job(levels)
+                started = self.clock()
+                waited = started - job.enqueued
+                stats = self._stats[job.urgency]
+                stats.started += 1
+                stats.total_wait += waited
+                stats.max_wait = max(stats.max_wait, waited)
+                stats.recent_waits.append(waited)
+                if started > job.deadline:
+                    stats.deadline_misses += 1
+
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            try:
+                job.future.set_result(job.fn(*job.args, **job.kwargs))
+                failed = False
+            except Exception as e:
+                job.future.set_exception(e)
+                failed = True
+            with self._cond:
+                if failed:
+                    stats.failed += 1
+                else:
+                    stats.completed += 1
+
+    def run(self, urgency: str, fn: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """Submit and wait for the result; a job still queued when the wait times out is dropped"""
+        future = self.submit(urgency, fn, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise
+
+    def shutdown(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._stopping = False
+
+    def stats(self) -> Dict:
+        with self._cond:
+            levels = {}
+            for level in URGENCY_LEVELS:
+                stats = self._stats[level]
+                recent = sorted(stats.recent_waits)
+                levels[level] = {
+                    'depth': len(self._queues[level]),
+                    'deadline_s': self.deadlines[level],
+                    'submitted': stats.submitted,
+                    'started': stats.started,
+                    'completed': stats.completed,
+                    'failed': stats.failed,
+                    'rejected': stats.rejected,
+                    'deadline_misses': stats.deadline_misses,
+                    'avg_wait_ms': round(stats.total_wait / stats.started * 1000, 3) if stats.started else 0.0,
+                    'p95_wait_ms': round(recent[min(len(recent) - 1, int(0.95 * len(recent)))] * 1000, 3) if recent else 0.0,
+                    'max_wait_ms': round(stats.max_wait * 1000, 3),
+                }
+            return {'workers': len(self._threads), 'reserved_workers': self.reserved_workers, 'levels': levels}
+
+
+def parse_deadlines(spec):
+    """'critical=2,high=10' -> {'critical': 2.0, 'high': 10.0}"""
+    deadlines = {}
+    for item in (spec or '').split(','):
+        if '=' in item:
+            level, seconds = item.split('=', 1)
+            if level.strip() in URGENCY_LEVELS:
+                deadlines[level.strip()] = float(seconds)
+    return deadlines
+
+
+matching_scheduler = UrgencyPriorityScheduler()
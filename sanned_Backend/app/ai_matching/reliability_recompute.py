@@ -0,0 +1,156 @@
+import calendar
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict
+import numpy as np
+from sqlalchemy import func, select
+
+# same bounds and starting value auto_update_reliability uses
+MIN_RELIABILITY = 0.1
+MAX_RELIABILITY = 1.0
+PRIOR_RELIABILITY = 0.7
+# one outcome as read from the database
+OUTCOME_ROW = np.dtype([('helper_id', np.int64), ('successful', np.bool_),
+                        ('response_hours', np.float64), ('created_days', np.float64)])
+
+logger = logging.getLogger(__name__)
+
+
+class ReliabilityRecomputer:
+    """
+    Recomputes every helper's reliability from the full match_outcomes log in one pass.
+
+    Each outcome scores 1 for a success answered within `fast_hours`, falling linearly to
+    `1 - slow_penalty` at `slow_hours`, and 0 for a failure. Outcomes are weighted by
+    0.5 ** (age / half_life_days), so recent behaviour dominates, and the weighted mean is
+    shrunk towards the prior by `prior_weight` pseudo-outcomes, so a helper with one
+    failure is not ranked below one with a long, mostly good history. The per-helper sums
+    are bincounts over the whole log; nothing loops over outcomes in Python.
+    """
+
+    def __init__(self, half_life_days: float = 30.0, prior: float = PRIOR_RELIABILITY, prior_weight: float = 2.0,
+                 fast_hours: float = 2.0, slow_hours: float = 24.0, slow_penalty: float = 0.2,
+                 batch_size: int = 100000):
+        self.half_life_days = half_life_days
+        self.prior = prior
+        self.prior_weight = prior_weight
+        self.fast_hours = fast_hours
+        self.slow_hours = slow_hours
+        self.slow_penalty = slow_penalty
+        self.batch_size = batch_size
+        self._run_lock = threading.Lock()
+
+    def configure(self, half_life_days=None, prior_weight=None):
+        if half_life_days is not None:
+            self.half_life_days = half_life_days
+        if prior_weight is not None:
+            self.prior_weight = prior_weight
+
+    def compute(self, helper_ids: np.ndarray, successful: np.ndarray, response_hours: np.ndarray,
+                age_days: np.ndarray):
+        """Per-outcome columns -> (unique helper ids, reliability per helper)"""
+        if len(helper_ids) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        helpers, index = np.unique(helper_ids, return_inverse=True)
+        weights = np.power(0.5, np.maximum(age_days, 0) / self.half_life_days)
+
+        # NaN response time (not reported) counts as fast
+        lateness = np.clip((response_hours - self.fast_hours) / (self.slow_hours - self.fast_hours), 0, 1)
+        scores = np.where(successful, 1.0 - self.slow_penalty * np.nan_to_num(lateness), 0.0)
+
+        weighted = np.bincount(index, weights=weights * scores, minlength=len(helpers))
+        total = np.bincount(index, weights=weights, minlength=len(helpers))
+        reliability = (self.prior * self.prior_weight + weighted) / (self.prior_weight + total)
+        return helpers, np.clip(reliability, MIN_RELIABILITY, MAX_RELIABILITY)
+
+    @staticmethod
+    def _epoch_days(column, dialect: str):
+        """Days since 1970 as a SQL expression, so rows arrive as plain numbers instead of datetimes"""
+        if dialect == 'sqlite':
+            return func.julianday(column) - 2440587.5
+        if dialect in ('mysql', 'mariadb'):
+            return func.unix_timestamp(column) / 86400.0
+        return func.extract('epoch', column) / 86400.0
+
+    def load_outcomes(self, session, now: datetime):
+        """The outcome log as numpy columns, read in batches over a plain Core result"""
+        from app.models import MatchOutcome
+
+        connection = session.connection()
+        result = connection.execute(select(
+            MatchOutcome.helper_id,
+            MatchOutcome.successful,
+            func.coalesce(MatchOutcome.response_time_hours, -1.0),
+            self._epoch_days(MatchOutcome.created_at, connection.dialect.name)
+        ))
+        blocks = [np.fromiter(map(tuple, rows), dtype=OUTCOME_ROW, count=len(rows))
+                  for rows in result.partitions(self.batch_size)]
+        table = np.concatenate(blocks) if blocks else np.zeros(0, dtype=OUTCOME_ROW)
+
+        # response time not reported (-1) counts as fast
+        response_hours = np.where(table['response_hours'] < 0, np.nan, table['response_hours'])
+        now_days = calendar.timegm(now.utctimetuple()) / 86400.0
+        return table['helper_id'], table['successful'], response_hours, now_days - table['created_days']
+
+    def run(self, dry_run: bool = False, matcher=None) -> Dict:
+        """Recompute and store users.reliability_score for every helper with outcomes"""
+        from app import db
+        from app.models import User
+        from app.services.candidate_view import CandidateView
+
+        with self._run_lock:
+            start = time.perf_counter()
+            now = datetime.utcnow()
+            columns = self.load_outcomes(db.session, now)
+            loaded = time.perf_counter()
+            helpers, reliability = self.compute(*columns)
+            computed = time.perf_counter()
+
+            if len(helpers) and not dry_run:
+                db.session.execute(db.update(User), [
+                    {'id': helper_id, 'reliability_score': score, 'reliability_updated_at': now}
+                    for helper_id, score in zip(helpers.tolist(), np.round(reliability, 4).tolist())
+                ])
+                CandidateView.refresh_reliability(db.session.connection())
+                db.session.commit()
+                if matcher is not None:
+                    # this process reads the new values at once; others pick them up from the column
+                    matcher.user_reliability.update(zip(helpers.tolist(), reliability.tolist()))
+
+            summary = {
+                'outcomes': int(len(columns[0])),
+                'helpers_updated': 0 if dry_run else int(len(helpers)),
+                'mean_reliability': round(float(reliability.mean()), 4) if len(helpers) else None,
+                'load_ms': round((loaded - start) * 1000, 1),
+                'compute_ms': round((computed - loaded) * 1000, 1),
+                'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+            }
+            logger.info("Reliability recompute: %d outcomes, %d helpers in %.1f ms",
+                        summary['outcomes'], len(helpers), summary['elapsed_ms'])
+            return summary
+
+
+def start_reliability_recompute(app, interval=86400.0, matcher=None):
+    """Recompute every `interval` seconds (nightly by default) in a daemon thread; returns the stop event"""
+    from app import db
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            with app.app_context():
+                try:
+                    reliability_recomputer.run(matcher=matcher)
+                except Exception as e:
+                    db.session.rollback()
+                    logger.warning("Reliability recompute failed: %s", e)
+                finally:
+                    db.session.remove()
+
+    threading.Thread(target=run, name="reliability-recompute", daemon=True).start()
+    return stop
+
+
+reliability_recomputer = ReliabilityRecomputer()
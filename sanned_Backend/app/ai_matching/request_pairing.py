@@ -0,0 +1,219 @@
+import calendar
+import threading
+import time
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+try:
+    from .automated_ai_matcher import AutomatedAIMatcher
+    from .match_events import match_event_hub
+except ImportError:
+    from automated_ai_matcher import AutomatedAIMatcher
+    from match_events import match_event_hub
+
+# request type -> the type it can be paired with
+PAIRABLE_TYPES = {'donation': 'service', 'service': 'donation', 'exchange': 'exchange'}
+DEFAULT_LOCATION = 'gaza_center'
+
+
+class PendingRequest:
+    """What the pairing engine needs from a Request row"""
+    __slots__ = ('id', 'user_id', 'type', 'skill_mask', 'location', 'created_ts')
+
+    def __init__(self, id, user_id, type, skill_mask, location, created_ts):
+        self.id = id
+        self.user_id = user_id
+        self.type = type
+        self.skill_mask = skill_mask
+        self.location = location
+        self.created_ts = created_ts
+
+
+class RequestPairingEngine:
+    """
+    Pairs pending requests with each other (donation <-> service, exchange <-> exchange).
+
+    Requests are blocked by (type, skill, location); only blocks with a compatible type,
+    a shared skill and nearby locations are compared, and within a block each request is
+    compared to its `window` nearest neighbours in time. Pairs are scored in bulk and
+    selected greedily, best score first, so no request ends up in two matches.
+    """
+
+    def __init__(self, matcher: Optional[AutomatedAIMatcher] = None, window: int = 12,
+                 min_score: float = 0.35, min_location_similarity: float = 0.5):
+        self.matcher = matcher or AutomatedAIMatcher()
+        self.window = window
+        self.min_score = min_score
+        self.min_location_similarity = min_location_similarity
+        self.skill_bits = {skill: 1 << i for i, skill in enumerate(self.matcher.skill_mapping)}
+        self.skill_bits['general_help'] = 1 << len(self.skill_bits)
+        self._popcount = np.array([bin(m).count('1') for m in range(1 << len(self.skill_bits))], dtype=np.float64)
+        self._run_lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def skill_mask(self, description: str) -> int:
+        mask = 0
+        for skill in self.matcher.auto_extract_skills(description or '').split():
+            mask |= self.skill_bits.get(skill, 0)
+        return mask
+
+    def to_pending(self, id, user_id, type, description, location, created_at) -> PendingRequest:
+        created_at = created_at or datetime.utcnow()
+        return PendingRequest(id, user_id, type, self.skill_mask(description),
+                              location or DEFAULT_LOCATION,
+                              calendar.timegm(created_at.utctimetuple()) + created_at.microsecond / 1e6)
+
+    def location_similarity(self, locations: List[str]) -> np.ndarray:
+        return np.array([
+            [self.matcher.auto_calculate_location_distance(a, b) for b in locations] for a in locations
+        ], dtype=np.float64)
+
+    def _build_blocks(self, requests: List[PendingRequest]):
+        blocks = defaultdict(list)
+        for idx, req in enumerate(requests):
+            for skill, bit in self.skill_bits.items():
+                if req.skill_mask & bit:
+                    blocks[(req.type, skill, req.location)].append(idx)
+        created = np.array([r.created_ts for r in requests], dtype=np.float64)
+        return {key: np.array(sorted(ids, key=created.__getitem__), dtype=np.int64)
+                for key, ids in blocks.items()}, created
+
+    def _window_pairs(self, left: np.ndarray, right: np.ndarray, created: np.ndarray, same_block: bool):
+        """Each left request against the `window` right requests closest to it in time"""
+        if same_block:
+            offsets = np.arange(1, self.window + 1)
+            j = np.arange(len(left))[:, None] + offsets
+            valid = j < len(left)
+            return np.repeat(left, valid.sum(axis=1)), left[j[valid]]
+        half = self.window // 2
+        positions = np.searchsorted(created[right], created[left])
+        start = np.clip(positions - half, 0, max(len(right) - self.window, 0))
+        j = start[:, None] + np.arange(self.window)
+        valid = j < len(right)
+        return np.repeat(left, valid.sum(axis=1)), right[j[valid]]
+
+    def candidate_pairs(self, requests: List[PendingRequest], now: Optional[float] = None,
+                        min_score: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(a, b, score) arrays of candidate pairs, as indexes into `requests`"""
+        empty = np.zeros(0, dtype=np.int64)
+        if len(requests) < 2:
+            return empty, empty, np.zeros(0)
+
+        blocks, created = self._build_blocks(requests)
+        locations = sorted({r.location for r in requests})
+        location_codes = {name: i for i, name in enumerate(locations)}
+        location_sim = self.location_similarity(locations)
+
+        a_parts, b_parts = [], []
+        for (req_type, skill, location), left in blocks.items():
+            partner = PAIRABLE_TYPES.get(req_type)
+            # visit each unordered type pair once: donation drives donation/service
+            if partner is None or req_type == 'service':
+                continue
+            here = location_codes[location]
+            for other in locations:
+                there = location_codes[other]
+                if location_sim[here, there] < self.min_location_similarity:
+                    continue
+                if req_type == partner and there < here:
+                    continue
+                right = blocks.get((partner, skill, other))
+                if right is None:
+                    continue
+                a, b = self._window_pairs(left, right, created, same_block=req_type == partner and here == there)
+                a_parts.append(a)
+                b_parts.append(b)
+
+        if not a_parts:
+            return empty, empty, np.zeros(0)
+        a = np.concatenate(a_parts)
+        b = np.concatenate(b_parts)
+
+        user_ids = np.array([r.user_id for r in requests], dtype=np.int64)
+        keep = user_ids[a] != user_ids[b]
+        a, b = a[keep], b[keep]
+
+        # the same pair shows up once per shared skill block
+        key = np.minimum(a, b) * len(requests) + np.maximum(a, b)
+        _, first = np.unique(key, return_index=True)
+        a, b = a[first], b[first]
+
+        masks = np.array([r.skill_mask for r in requests], dtype=np.int64)
+        skill_score = self._popcount[masks[a] & masks[b]] / np.maximum(self._popcount[masks[a] | masks[b]], 1)
+        codes = np.array([location_codes[r.location] for r in requests], dtype=np.int64)
+        location_score = location_sim[codes[a], codes[b]]
+        now = now or time.time()
+        waited_hours = (now - np.minimum(created[a], created[b])) / 3600
+        wait_score = np.clip(waited_hours / 72, 0, 1)
+
+        scores = skill_score * 0.6 + location_score * 0.25 + wait_score * 0.15
+        keep = scores >= (self.min_score if min_score is None else min_score)
+        return a[keep], b[keep], scores[keep]
+
+    @staticmethod
+    def select(a: np.ndarray, b: np.ndarray, scores: np.ndarray, size: int) -> List[Tuple[int, int, float]]:
+        """Greedy maximum-weight matching: best pairs first, skipping any that reuse a request"""
+        order = np.argsort(-scores, kind='stable')
+        used = bytearray(size)
+        selected = []
+        for i, j, score in zip(a[order].tolist(), b[order].tolist(), scores[order].tolist()):
+            if used[i] or used[j]:
+                continue
+            used[i] = used[j] = 1
+            selected.append((i, j, score))
+            if len(selected) * 2 >= size - 1:
+                break
+        return selected
+
+    def load_pending(self, session) -> List[PendingRequest]:
+        from app.models import Request, Match
+
+        taken = session.query(Match.request_a_id).filter(Match.status.in_(['pending', 'confirmed'])).union(
+            session.query(Match.request_b_id).filter(Match.status.in_(['pending', 'confirmed']))
+        )
+        rows = session.query(
+            Request.id, Request.user_id, Request.type, Request.description, Request.location, Request.created_at
+        ).filter(
+            Request.status == 'pending',
+            ~Request.id.in_(taken)
+        ).yield_per(5000)
+        return [self.to_pending(*row) for row in rows]
+
+    def run(self, dry_run: bool = False, min_score: Optional[float] = None) -> Dict:
+        """Pair every unmatched pending request and commit the new Match rows in one transaction"""
+        from app import db
+        from app.models import Match
+
+        with self._run_lock:
+            start = time.perf_counter()
+            requests = self.load_pending(db.session)
+            a, b, scores = self.candidate_pairs(requests, min_score=min_score)
+            selected = self.select(a, b, scores, len(requests))
+            pairs = [(requests[i].id, requests[j].id, round(score, 4)) for i, j, score in selected]
+
+            if pairs and not dry_run:
+                db.session.execute(
+                    db.insert(Match),
+                    [{'request_a_id': x, 'request_b_id': y, 'status': 'pending'} for x, y, _ in pairs]
+                )
+                db.session.commit()
+                for i, j, score in selected:
+                    event = {'request_ids': [requests[i].id, requests[j].id], 'score': round(score, 4)}
+                    match_event_hub.publish(requests[i].user_id, 'request_matched', event)
+                    match_event_hub.publish(requests[j].user_id, 'request_matched', event)
+
+            summary = {
+                'pending_requests': len(requests),
+                'candidate_pairs': int(len(scores)),
+                'matches_created': 0 if dry_run else len(pairs),
+                'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+                'pairs': pairs,
+            }
+            self.logger.info("Request pairing: %d pending, %d candidate pairs, %d matched in %.1f ms",
+                             len(requests), len(scores), len(pairs), summary['elapsed_ms'])
+            return summary
+
+
+request_pairing_engine = RequestPairingEngine()
@@ -0,0 +1,232 @@
+import json
+import logging
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_term(term: str) -> str:
+    """Normalize a skill name or keyword into a single vocabulary term"""
+    return '_'.join(TOKEN_PATTERN.findall(term.lower()))
+
+
+def text_terms(text: str) -> List[str]:
+    """Split free text into unigram and bigram terms so multi-word skills can be found"""
+    words = TOKEN_PATTERN.findall((text or '').lower())
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+class SkillEmbeddings:
+    """Dense skill vectors derived from skill co-occurrence (PPMI + truncated SVD)"""
+
+    def __init__(self, vocabulary: Optional[List[str]] = None, vectors: Optional[np.ndarray] = None):
+        self.vocabulary = vocabulary or []
+        self.term_index = {term: i for i, term in enumerate(self.vocabulary)}
+        self.vectors = vectors
+
+    @property
+    def dim(self) -> int:
+        return 0 if self.vectors is None else self.vectors.shape[1]
+
+    @classmethod
+    def fit(cls, documents: Iterable[Iterable[str]], dim: int = 32) -> 'SkillEmbeddings':
+        """Fit embeddings from documents, each one being the set of skills held together"""
+        docs = []
+        vocabulary: Dict[str, int] = {}
+        for doc in documents:
+            terms = sorted({normalize_term(t) for t in doc if t and normalize_term(t)})
+            if not terms:
+                continue
+            for term in terms:
+                vocabulary.setdefault(term, len(vocabulary))
+            docs.append([vocabulary[t] for t in terms])
+
+        size = len(vocabulary)
+        if size == 0:
+            return cls([], np.zeros((0, dim), dtype=np.float16))
+
+        cooc = np.zeros((size, size), dtype=np.float64)
+        for ids in docs:
+            idx = np.asarray(ids)
+            cooc[np.ix_(idx, idx)] += 1.0
+        # Diagonal keeps the term frequency so singletons still get a direction of their own
+        total = cooc.sum()
+        row = cooc.sum(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pmi = np.log((cooc * total) / (row * row.T))
+        ppmi = np.where(np.isfinite(pmi) & (pmi > 0), pmi, 0.0)
+
+        u, s, _ = np.linalg.svd(ppmi, full_matrices=False)
+        k = min(dim, len(s))
+        vectors = np.zeros((size, dim), dtype=np.float32)
+        vectors[:, :k] = u[:, :k] * np.sqrt(s[:k])
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+        terms = [None] * size
+        for term, i in vocabulary.items():
+            terms[i] = term
+        return cls(terms, vectors.astype(np.float16))
+
+    def embed_terms(self, terms: Sequence[str]) -> np.ndarray:
+        """Mean of the known term vectors, L2-normalized (zero vector if nothing is known)"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        rows = [self.term_index[t] for t in terms if t in self.term_index]
+        if rows:
+            vector = self.vectors[rows].astype(np.float32).sum(axis=0)
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector /= norm
+        return vector
+
+    def embed_text(self, text: str) -> np.ndarray:
+        return self.embed_terms(text_terms(text))
+
+    def save(self, path: str):
+        """Store vectors as a float16 .npy (memory-mappable) next to a JSON vocabulary"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        matrix = np.lib.format.open_memmap(f"{path}.npy", mode='w+', dtype=np.float16, shape=self.vectors.shape)
+        matrix[:] = self.vectors
+        matrix.flush()
+        del matrix
+        with open(f"{path}.vocab.json", 'w') as fh:
+            json.dump(self.vocabulary, fh)
+
+    @classmethod
+    def load(cls, path: str) -> 'SkillEmbeddings':
+        with open(f"{path}.vocab.json") as fh:
+            vocabulary = json.load(fh)
+        vectors = np.load(f"{path}.npy", mmap_mode='r')
+        return cls(vocabulary, vectors)
+
+
+class IVFIndex:
+    """Inverted-file ANN index: k-means coarse quantizer with one posting list per centroid"""
+
+    def __init__(self, nlist: Optional[int] = None, nprobe: int = 4, iterations: int = 10, seed: int = 0):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.seed = seed
+        self.centroids = None
+        self.lists: List[np.ndarray] = []
+        self.vectors = None
+        self.ids = None
+
+    def __len__(self) -> int:
+        return 0 if self.ids is None else len(self.ids)
+
+    def build(self, ids: Sequence[int], vectors: np.ndarray) -> 'IVFIndex':
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.ids = np.asarray(ids)
+        self.vectors = vectors
+        n = len(vectors)
+        if n == 0:
+            self.centroids = np.zeros((0, vectors.shape[1] if vectors.ndim == 2 else 0), dtype=np.float32)
+            self.lists = []
+            return self
+
+        nlist = min(self.nlist or max(1, int(np.sqrt(n))), n)
+        rng = np.random.default_rng(self.seed)
+        centroids = vectors[rng.choice(n, size=nlist, replace=False)].copy()
+        assign = np.zeros(n, dtype=np.int64)
+        for _ in range(self.iterations):
+            assign = np.argmax(vectors @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = vectors[assign == c]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    centroids[c] = centroid / norm if norm > 0 else centroid
+
+        self.centroids = centroids
+        self.lists = [np.flatnonzero(assign == c) for c in range(nlist)]
+        return self
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Return up to k (id, cosine) pairs with positive similarity, scanning only the nprobe closest lists"""
+        query = np.asarray(query, dtype=np.float32)
+        # a query with no known terms is similar to nothing; probing would return arbitrary helpers
+        if not len(self) or not np.any(query):
+            return []
+        probe = min(nprobe or self.nprobe, len(self.lists))
+        nearest = np.argsort(-(self.centroids @ query))[:probe]
+        rows = np.concatenate([self.lists[c] for c in nearest])
+        if not len(rows):
+            return []
+        scores = self.vectors[rows] @ query
+        top = min(k, len(rows))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+        return [(self.ids[rows[i]].item(), float(scores[i])) for i in best if scores[i] > 0]
+
+
+class SemanticSkillEngine:
+    """Offline semantic skill scorer: skill embeddings plus an IVF index over helper vectors"""
+
+    def __init__(self, dim: int = 32, nprobe: int = 4):
+        self.logger = logging.getLogger(__name__)
+        self.dim = dim
+        self.embeddings: Optional[SkillEmbeddings] = None
+        self.index = IVFIndex(nprobe=nprobe)
+        self.user_rows: Dict[int, int] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.embeddings is not None and self.embeddings.dim > 0
+
+    def fit(self, user_skills: Dict[int, List[str]], keyword_groups: Optional[Dict[str, List[str]]] = None):
+        """Fit embeddings from per-user skill lists (plus keyword groups as extra documents) and index the users"""
+        documents = [skills for skills in user_skills.values()]
+        for category, keywords in (keyword_groups or {}).items():
+            documents.append([category] + list(keywords))
+        self.embeddings = SkillEmbeddings.fit(documents, dim=self.dim)
+        self.index_users(user_skills)
+        self.logger.info(
+            "Semantic skill engine fitted: %d terms, %d users", len(self.embeddings.vocabulary), len(self.user_rows)
+        )
+        return self
+
+    def index_users(self, user_skills: Dict[int, List[str]]):
+        ids = list(user_skills.keys())
+        vectors = np.zeros((len(ids), self.embeddings.dim), dtype=np.float32)
+        for row, user_id in enumerate(ids):
+            vectors[row] = self.embeddings.embed_terms([normalize_term(s) for s in user_skills[user_id]])
+        self.index.build(ids, vectors)
+        self.user_rows = {user_id: row for row, user_id in enumerate(ids)}
+
+    def save(self, path: str):
+        self.embeddings.save(path)
+
+    def load(self, path: str, user_skills: Optional[Dict[int, List[str]]] = None):
+        self.embeddings = SkillEmbeddings.load(path)
+        if user_skills:
+            self.index_users(user_skills)
+        return self
+
+    def _user_vector(self, user_id, skills: str) -> np.ndarray:
+        row = self.user_rows.get(user_id)
+        if row is not None:
+            return self.index.vectors[row]
+        return self.embeddings.embed_text(skills)
+
+    def similarities(self, query_text: str, ids: Sequence, skills: Sequence[str]) -> np.ndarray:
+        """Cosine similarity between the query and each candidate's skill vector"""
+        query = self.embeddings.embed_text(query_text)
+        if not len(ids):
+            return np.zeros(0, dtype=np.float32)
+        matrix = np.vstack([self._user_vector(user_id, text) for user_id, text in zip(ids, skills)])
+        return np.clip(matrix @ query, 0.0, 1.0)
+
+    def search(self, query_text: str, k: int = 50, nprobe: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Approximate top-k helpers for a request text"""
+        if not self.ready:
+            return []
+        return self.index.search(self.embeddings.embed_text(query_text), k=k, nprobe=nprobe)
+
+
+semantic_skill_engine = SemanticSkillEngine()
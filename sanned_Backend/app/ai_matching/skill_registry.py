@@ -0,0 +1,188 @@
+import math
+import re
+import threading
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+
+# Categories auto_extract_skills detects in request text, with the keywords that imply them
+SKILL_CATEGORIES = {
+    'medical': ['doctor', 'medicine', 'health', 'sick', 'injury', 'hospital', 'treatment'],
+    'food': ['hungry', 'eat', 'meal', 'cooking', 'nutrition', 'bread'],
+    'transport': ['ride', 'car', 'transport', 'move', 'delivery', 'vehicle'],
+    'shelter': ['house', 'home', 'shelter', 'roof', 'building'],
+    'education': ['school', 'teach', 'learn', 'student', 'book'],
+    'tech': ['computer', 'internet', 'phone', 'repair', 'technical'],
+    'legal': ['law', 'legal', 'document', 'paperwork', 'rights'],
+    'childcare': ['baby', 'child', 'kid', 'childcare', 'children']
+}
+# what auto_extract_skills returns when no category matched
+GENERAL_HELP = 'general_help'
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_EMPTY = np.zeros(0, dtype=np.int32)
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_skill(name: str) -> str:
+    """'First Aid' -> 'first_aid'"""
+    return '_'.join(_TOKEN.findall((name or '').lower()))
+
+
+class SkillRegistry:
+    """
+    Canonical skill dictionary: every skill name, Skill.id and category keyword maps to dense
+    integer codes, so candidates carry small sorted code vectors and skill overlap is a
+    sparse dot product instead of re-tokenizing skill text for every request.
+
+    Each skill gets its own code plus the codes of the categories its name implies
+    ('pediatric doctor' -> itself and 'medical'). Codes are only ever appended, so vectors
+    built earlier stay valid when skills are added; the table is loaded from the database
+    once and kept current by ORM events on Skill, and names it has not seen yet (written by
+    another process) are registered the first time a candidate carries them.
+    """
+
+    def __init__(self, categories: Optional[Dict[str, Iterable[str]]] = None):
+        self.categories = {name: list(keywords) for name, keywords in (categories or SKILL_CATEGORIES).items()}
+        self.terms = []
+        self._codes = {}
+        self._aliases = {}
+        self._name_vectors = {}
+        self._skill_codes = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+        self._watching = False
+        for category, keywords in self.categories.items():
+            code = self._add_term(category)
+            for keyword in keywords:
+                self._aliases.setdefault(keyword, code)
+        self._add_term(GENERAL_HELP)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _add_term(self, key: str) -> int:
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self.terms)
+            self.terms.append(key)
+        return code
+
+    def _category_codes(self, text: str):
+        # same substring rule as auto_extract_skills
+        return [self._codes[category] for category, keywords in self.categories.items()
+                if category in text or any(keyword in text for keyword in keywords)]
+
+    def _vector_for_name(self, name: str) -> Tuple[int, ...]:
+        key = normalize_skill(name)
+        vector = self._name_vectors.get(key)
+        if vector is None and key:
+            with self._lock:
+                vector = self._name_vectors.get(key)
+                if vector is None:
+                    vector = tuple(sorted({self._add_term(key), *self._category_codes(key.replace('_', ' '))}))
+                    self._name_vectors[key] = vector
+        return vector or ()
+
+    def register_skill(self, skill_id, name: str) -> Tuple[int, ...]:
+        vector = self._vector_for_name(name)
+        if skill_id is not None and vector:
+            self._skill_codes[str(skill_id)] = self._codes[normalize_skill(name)]
+        return vector
+
+    def forget_skill(self, skill_id) -> None:
+        self._skill_codes.pop(str(skill_id), None)
+
+    def lookup(self, term) -> Optional[int]:
+        """Code of a Skill.id, skill name, category or category keyword; None if unknown"""
+        code = self._skill_codes.get(str(term))
+        if code is not None:
+            return code
+        key = normalize_skill(str(term))
+        code = self._codes.get(key)
+        return code if code is not None else self._aliases.get(key)
+
+    def encode_names(self, names: Iterable[str]) -> np.ndarray:
+        """Sorted code vector of a candidate's skill names"""
+        codes = set()
+        for name in names:
+            codes.update(self._vector_for_name(name))
+        return np.fromiter(sorted(codes), dtype=np.int32, count=len(codes)) if codes else _EMPTY
+
+    def encode_text(self, text: str) -> np.ndarray:
+        """Codes of a space-separated skill string, as legacy user dicts carry them"""
+        return self.encode_names((text or '').split())
+
+    def encode_query(self, needed_skills: str, text: str = '') -> np.ndarray:
+        """
+        Codes for a request: the categories auto_extract_skills found, plus any known skill
+        named in the text (single words and two-word names). Unknown words are ignored.
+        """
+        codes = {self._codes[c] for c in (needed_skills or '').split() if c in self._codes}
+        tokens = _TOKEN.findall((text or '').lower())
+        for key in tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]:
+            vector = self._name_vectors.get(key)
+            if vector:
+                codes.update(vector)
+        return np.fromiter(sorted(codes), dtype=np.int32, count=len(codes)) if codes else _EMPTY
+
+    def similarities(self, query_codes: np.ndarray, matrix) -> np.ndarray:
+        """Binary cosine of the query against each row of a pool's skill matrix"""
+        if not len(query_codes) or matrix.shape[0] == 0:
+            return np.zeros(matrix.shape[0])
+        query = np.zeros(matrix.shape[1], dtype=np.float32)
+        query[query_codes[query_codes < matrix.shape[1]]] = 1.0
+        return np.asarray(matrix @ query, dtype=np.float64) / math.sqrt(len(query_codes))
+
+    def load(self, session) -> int:
+        """Register every Skill row; returns the number of codes"""
+        from app.models.skills import Skill
+
+        for skill_id, name in session.query(Skill.id, Skill.name):
+            self.register_skill(skill_id, name)
+        self.loaded = True
+        self.watch()
+        return len(self.terms)
+
+    def ensure_loaded(self) -> None:
+        if self.loaded:
+            return
+        try:
+            from app.utils.db_routing import read_session
+
+            with read_session() as session:
+                self.load(session)
+            logger.info("Skill registry loaded with %d codes", len(self.terms))
+        except Exception as e:
+            logger.warning("Skill registry load failed, registering skills as they are seen: %s", e)
+
+    def watch(self) -> None:
+        """Keep the registry current with Skill inserts, renames and deletes in this process"""
+        if self._watching:
+            return
+        from sqlalchemy import event
+        from app.models.skills import Skill
+
+        def saved(mapper, connection, target):
+            self.register_skill(target.id, target.name)
+
+        def deleted(mapper, connection, target):
+            self.forget_skill(target.id)
+
+        event.listen(Skill, 'after_insert', saved)
+        event.listen(Skill, 'after_update', saved)
+        event.listen(Skill, 'after_delete', deleted)
+        self._watching = True
+
+    def stats(self) -> Dict:
+        return {
+            'codes': len(self.terms),
+            'categories': len(self.categories),
+            'skills': len(self._skill_codes),
+            'names': len(self._name_vectors),
+            'loaded': self.loaded,
+        }
+
+
+skill_registry = SkillRegistry()
@@ -1,6 +1,7 @@
 import os
 from dotenv import load_dotenv
 from datetime import timedelta
+from app.utils.db_routing import build_engine_options, build_binds
 load_dotenv()
 
 class Config:
@@ -14,6 +15,12 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Pool tuning (DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_PRE_PING, DB_POOL_RECYCLE)
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(SQLALCHEMY_DATABASE_URI)
+    # Optional read replica; read-only matching queries go there, writes stay on the primary
+    REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+    SQLALCHEMY_BINDS = build_binds(REPLICA_DATABASE_URL)
+
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     if not JWT_SECRET_KEY:
         raise ValueError("JWT_SECRET_KEY must be set in environment variables")
@@ -21,3 +28,79 @@ class Config:
     ABSTRACT_API_KEY = os.getenv("ABSTRACT_API_KEY")  
     # ABSTRACT_API_KEY is optional for development
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=30)
+
+    # Password hashing: bcrypt cost and the bounded pool it runs on
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    PASSWORD_HASH_WAIT_TIMEOUT = float(os.getenv("PASSWORD_HASH_WAIT_TIMEOUT", "10"))
+
+    # current_user identity cache (per process); entries also drop when the user row is committed
+    USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+    USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+
+    # Background consumer applying stored Checkout webhook events
+    WEBHOOK_CONSUMER_ENABLED = os.getenv("WEBHOOK_CONSUMER_ENABLED", "true").lower() == "true"
+    WEBHOOK_CONSUMER_INTERVAL = float(os.getenv("WEBHOOK_CONSUMER_INTERVAL", "2"))
+    WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "100"))
+
+    # Logging: one QueueHandler on the root logger; output is written by a listener thread
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # text or json
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # Comma-separated logger=rate pairs applied to records below WARNING
+    LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "app.ai_matching.outcomes=0.1")
+
+    # Batch helper assignment (min-cost assignment over top-k candidates per pending request)
+    ASSIGNMENT_SCHEDULER_ENABLED = os.getenv("ASSIGNMENT_SCHEDULER_ENABLED", "false").lower() == "true"
+    ASSIGNMENT_INTERVAL = float(os.getenv("ASSIGNMENT_INTERVAL", "300"))
+    ASSIGNMENT_TOP_K = int(os.getenv("ASSIGNMENT_TOP_K", "10"))
+    ASSIGNMENT_HELPER_CAPACITY = int(os.getenv("ASSIGNMENT_HELPER_CAPACITY", "3"))
+
+    # Matching work runs on an urgency-ordered worker pool (deadlines in seconds per level)
+    MATCHING_WORKERS = int(os.getenv("MATCHING_WORKERS", "4"))
+    MATCHING_RESERVED_WORKERS = int(os.getenv("MATCHING_RESERVED_WORKERS", "1"))  # critical-only
+    MATCHING_QUEUE_SIZE = int(os.getenv("MATCHING_QUEUE_SIZE", "500"))  # per urgency level
+    MATCHING_DEADLINES = os.getenv("MATCHING_DEADLINES", "critical=2,high=10,medium=30,low=120")
+    MATCHING_WAIT_TIMEOUT = float(os.getenv("MATCHING_WAIT_TIMEOUT", "150"))  # longest deadline plus run time
+
+    # Match event streams (GET /api/matching/stream); in-process, per worker
+    MATCH_STREAM_BUFFER = int(os.getenv("MATCH_STREAM_BUFFER", "100"))  # events buffered per connection
+    MATCH_STREAM_HEARTBEAT = float(os.getenv("MATCH_STREAM_HEARTBEAT", "15"))
+    # a stream holds a worker thread while open; clients reconnect after this many seconds
+    MATCH_STREAM_MAX_DURATION = float(os.getenv("MATCH_STREAM_MAX_DURATION", "300"))
+
+    # Delta sync: pull checkpoints trail the server clock so rows committed mid-pull are re-sent
+    SYNC_CLOCK_SKEW = float(os.getenv("SYNC_CLOCK_SKEW", "10"))
+    SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))  # requests per pull page
+
+    # Helper reliability, recomputed from match_outcomes with time decay into users.reliability_score
+    RELIABILITY_RECOMPUTE_ENABLED = os.getenv("RELIABILITY_RECOMPUTE_ENABLED", "false").lower() == "true"
+    RELIABILITY_RECOMPUTE_INTERVAL = float(os.getenv("RELIABILITY_RECOMPUTE_INTERVAL", "86400"))  # nightly
+    RELIABILITY_HALF_LIFE_DAYS = float(os.getenv("RELIABILITY_HALF_LIFE_DAYS", "30"))
+    RELIABILITY_PRIOR_WEIGHT = float(os.getenv("RELIABILITY_PRIOR_WEIGHT", "2"))
+
+    # Circuit breaker around the matcher's database reads; while open the last good pool is served
+    MATCHER_BREAKER_FAILURE_RATE = float(os.getenv("MATCHER_BREAKER_FAILURE_RATE", "0.5"))
+    MATCHER_BREAKER_SLOW_SECONDS = float(os.getenv("MATCHER_BREAKER_SLOW_SECONDS", "2"))
+    MATCHER_BREAKER_SLOW_RATE = float(os.getenv("MATCHER_BREAKER_SLOW_RATE", "0.5"))
+    MATCHER_BREAKER_WINDOW = int(os.getenv("MATCHER_BREAKER_WINDOW", "20"))  # last N calls
+    MATCHER_BREAKER_MIN_CALLS = int(os.getenv("MATCHER_BREAKER_MIN_CALLS", "10"))
+    MATCHER_BREAKER_OPEN_SECONDS = float(os.getenv("MATCHER_BREAKER_OPEN_SECONDS", "30"))
+    MATCHER_BREAKER_HALF_OPEN_CALLS = int(os.getenv("MATCHER_BREAKER_HALF_OPEN_CALLS", "3"))
+
+    # Admission control for matching endpoints: token buckets (tokens/second, burst) per user and overall
+    MATCHING_USER_RATE = float(os.getenv("MATCHING_USER_RATE", "1"))
+    MATCHING_USER_BURST = float(os.getenv("MATCHING_USER_BURST", "10"))
+    MATCHING_GLOBAL_RATE = float(os.getenv("MATCHING_GLOBAL_RATE", "20"))
+    MATCHING_GLOBAL_BURST = float(os.getenv("MATCHING_GLOBAL_BURST", "100"))
+    MATCHING_MAX_IN_FLIGHT = int(os.getenv("MATCHING_MAX_IN_FLIGHT", "16"))  # queued + running
+    MATCHING_COST_UNIT = int(os.getenv("MATCHING_COST_UNIT", "5000"))  # candidates per extra token
+
+    # Near-duplicate requests (MinHash over description shingles) and reuse of their match results
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.7"))  # estimated Jaccard similarity
+    DEDUP_WINDOW_DAYS = float(os.getenv("DEDUP_WINDOW_DAYS", "7"))
+    DEDUP_SYNC_INTERVAL = float(os.getenv("DEDUP_SYNC_INTERVAL", "2"))  # seconds between reads of other workers' requests
+    DEDUP_SYNC_OVERLAP = float(os.getenv("DEDUP_SYNC_OVERLAP", "120"))  # seconds re-read for late commits
+    MATCH_RESULT_TTL = float(os.getenv("MATCH_RESULT_TTL", "600"))
+    MATCH_RESULT_CACHE_SIZE = int(os.getenv("MATCH_RESULT_CACHE_SIZE", "1000"))
@@ -1,31 +1,58 @@
-from ipaddress import ip_address
-from flask import request ,jsonify,g
+from flask import request ,jsonify
+from flask_login import current_user
 from app.services.RequestService import RequestService
 import logging 
 
 class Request_controller:
+    @staticmethod
+    def serialize(req):
+        return {
+            "id": req.id,
+            "type": req.type,
+            "description": req.description,
+            "status": req.status,
+            "location": req.location,
+            "created_at": req.created_at.isoformat(),
+            "user_id": req.user_id,
+            "duplicate_of_id": req.duplicate_of_id
+        }
+
     @staticmethod
     def create_request():
         data=request.json
         ip_address=request.remote_addr
         manual_city=data.get("city")
 
-        logging.info(f"creat request attemp from IP={ip_address},city={manual_city}")
+        logging.info("creat request attemp from IP=%s,city=%s", ip_address, manual_city)
 
         req = RequestService.create_request(
-            user=g.current_user,
+            user=current_user,
             type=data.get("type"),
             description=data.get("description"),
             ip_address=ip_address,
             manual_city=manual_city
         )
 
-        response = {
-            "id": req.id,
-            "type": req.type,
-            "description": req.description,
-            "status": req.status,
-            "created_at": req.created_at.isoformat(),
-            "user_id": req.user_id
-        }
-        return jsonify(response), 201
\ No newline at end of file
+        return jsonify(Request_controller.serialize(req)), 201
+
+    @staticmethod
+    def list_requests():
+        args = request.args
+        try:
+            rows, next_cursor = RequestService.list_requests(
+                status=args.get("status"),
+                type=args.get("type"),
+                location=args.get("location"),
+                cursor=args.get("cursor"),
+                limit=args.get("limit"),
+                include_duplicates=args.get("duplicates") == "include"
+            )
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+
+        return jsonify({
+            "success": True,
+            "requests": [Request_controller.serialize(req) for req in rows],
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None
+        }), 200
@@ -1,5 +1,6 @@
 # app/controllers/auth_controller.py
 from flask import jsonify
+from flask_login import login_user
 from app.models import User
 from app.services.location_service import LocationService
 from app.services.username_services import UsernameService
@@ -8,8 +9,6 @@ from app.utils.schema_validator import SchemaValidator
 from app import db
 import logging
 
-logging.basicConfig(level=logging.INFO)
-
 class AuthController:
     @staticmethod
     def sign_up(data, ip_address=None):
@@ -55,7 +54,7 @@ class AuthController:
             'is_in_gaza': user.is_in_gaza,
             'token': token
         }
-        logging.info(f"User registered: {response}")
+        logging.info("User registered: id=%s username=%s", user.id, user.username)
         return response, 201
 
     @staticmethod
@@ -66,20 +65,33 @@ class AuthController:
         user = User.query.filter_by(email=email).first()
         
         if not user or not SecurityService.check_password(user.password_hash, password):
-            logging.warning(f"Login failed for email {email}")
+            logging.warning("Login failed for email %s", email)
             return {"error": "Invalid credentials"}, 401
         
+        # Move the stored hash to the configured cost factor (up or down) now that we know the password;
+        # best effort, a busy pool or failed write must not fail a valid login
+        if SecurityService.needs_rehash(user.password_hash):
+            try:
+                user.password_hash = SecurityService.hash_password(password)
+                db.session.commit()
+                logging.info("Password hash rehashed for user_id %s", user.id)
+            except Exception as e:
+                db.session.rollback()
+                logging.warning("Password rehash skipped for user_id %s: %s", user.id, e)
+        
+        # session cookie for the login_required routes, token for the JWT ones
+        login_user(user)
         token = SecurityService.generate_token(user.id)
         response = {
             "id": user.id,
             "username": user.username,
             "email": user.email,
-            "role": user.role,
-            "location": user.location,
+            "role": user.roles,
+            "location": user.localization,
             "is_in_gaza": user.is_in_gaza,
             "token": token
         }
-        logging.info(f"User logged in: {response}")
+        logging.info("User logged in: id=%s", user.id)
         return response, 200
 
     @staticmethod
@@ -87,5 +99,5 @@ class AuthController:
         validated_data = SchemaValidator.validate_username_update(data)
         new_username = UsernameService.update_username(user_id, validated_data['username'])
         response = {'username': new_username}
-        logging.info(f"Username updated for user_id {user_id}: {response}")
+        logging.info("Username updated for user_id %s: %s", user_id, new_username)
         return response, 200
@@ -1,5 +1,6 @@
 
 from flask import request, jsonify, url_for, current_app
+from sqlalchemy import case
 from app import db
 from app.models.sponsorship import Sponsorship
 from app.services.payment_service import PaymentService
@@ -17,7 +18,8 @@ class SponsorshipController:
         if not amount:
             return {"error": "amount is required"}, 400
 
-        # create sponsorship row
+        # commit the pending row before calling Checkout so no transaction stays open during the HTTP call;
+        # its id is the reference the webhook resolves
         sponsorship = Sponsorship(
             sponsor_id=user_id,
             request_id=request_id,
@@ -27,6 +29,8 @@ class SponsorshipController:
             status="pending"
         )
         db.session.add(sponsorship)
+        db.session.flush()
+        sponsorship_id = sponsorship.id
         db.session.commit()
 
         # prepare return/cancel URLs (frontend will handle final redirect)
@@ -37,21 +41,24 @@ class SponsorshipController:
         # call Checkout
         try:
             res = PaymentService.create_payment_link(
-                sponsorship_id=sponsorship.id,
+                sponsorship_id=sponsorship_id,
                 amount=float(amount),
                 currency=currency,
                 return_url=return_url,
                 cancel_url=cancel_url,
-                metadata={"sponsorship_id": str(sponsorship.id), "request_id": str(request_id)}
+                metadata={"sponsorship_id": str(sponsorship_id), "request_id": str(request_id)}
             )
-            sponsorship.checkout_id = res["checkout_id"]
-            sponsorship.checkout_url = res["checkout_url"]
-            sponsorship.status = "reserved"  # reserved until webhook confirms
-            db.session.commit()
         except Exception as e:
             logger.exception("Payment link creation failed")
-            sponsorship.status = "failed"
+            Sponsorship.query.filter_by(id=sponsorship_id, status="pending").update({"status": "failed"}, synchronize_session=False)
             db.session.commit()
             return {"error": "failed to init payment"}, 500
 
-        return {"sponsorship_id": sponsorship.id, "checkout_url": sponsorship.checkout_url}, 201
+        # reserved until the webhook confirms; a webhook that already arrived keeps its status
+        Sponsorship.query.filter_by(id=sponsorship_id).update({
+            "checkout_id": res["checkout_id"],
+            "checkout_url": res["checkout_url"],
+            "status": case((Sponsorship.status == "pending", "reserved"), else_=Sponsorship.status),
+        }, synchronize_session=False)
+        db.session.commit()
+        return {"sponsorship_id": sponsorship_id, "checkout_url": res["checkout_url"]}, 201
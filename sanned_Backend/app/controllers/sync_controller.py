@@ -0,0 +1,52 @@
+from flask import current_app
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.services.sync_service import SyncService, SyncConflict
+from app.services.user_cache import user_identity_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SyncController:
+    @staticmethod
+    def _last_pulled_at(args, data=None):
+        value = (data or {}).get("lastPulledAt", args.get("last_pulled_at") or args.get("lastPulledAt"))
+        if value in (None, "", "null", 0, "0"):
+            return None
+        return int(value)
+
+    @staticmethod
+    def pull(user_id, args):
+        try:
+            last_pulled_at = SyncController._last_pulled_at(args)
+        except ValueError:
+            return {"success": False, "message": "last_pulled_at must be a millisecond timestamp"}, 400
+
+        try:
+            result = SyncService.pull(user_id, last_pulled_at, clock_skew=current_app.config['SYNC_CLOCK_SKEW'],
+                                      cursor=args.get("cursor"), page_size=current_app.config['SYNC_PAGE_SIZE'])
+        except ValueError as e:
+            return {"success": False, "message": str(e)}, 400
+        return {"success": True, **result}, 200
+
+    @staticmethod
+    def push(user_id, data, args):
+        user = user_identity_cache.load(user_id)
+        if user is None:
+            return {"success": False, "message": "user not found"}, 404
+        try:
+            last_pulled_at = SyncController._last_pulled_at(args, data)
+            id_map = SyncService.push(user, (data or {}).get("changes"), last_pulled_at)
+        except SyncConflict as e:
+            return {"success": False, "message": str(e)}, 409
+        except PermissionError as e:
+            return {"success": False, "message": str(e)}, 403
+        except (ValueError, KeyError, TypeError) as e:
+            return {"success": False, "message": f"invalid push: {e}"}, 400
+        except IntegrityError as e:
+            logger.warning("Sync push from user %s conflicts with server data: %s", user_id, e.orig)
+            return {"success": False, "message": "push conflicts with server data; pull first"}, 409
+        except SQLAlchemyError as e:
+            logger.error("Sync push from user %s failed: %s", user_id, e)
+            return {"success": False, "message": "sync is temporarily unavailable"}, 503
+
+        return {"success": True, "id_map": id_map}, 200
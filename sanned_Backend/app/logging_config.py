@@ -0,0 +1,173 @@
+# app/logging_config.py
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from app.utils.metrics import register_metrics_source
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` and is emitted as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, plus any `extra=` fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of sub-WARNING records for the configured logger prefixes"""
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = dict(rates)
+        self._cache = {}
+        self.sampled_out = 0
+
+    def _rate(self, name):
+        rate = self._cache.get(name)
+        if rate is None:
+            rate, best = 1.0, -1
+            for prefix, value in self.rates.items():
+                if (name == prefix or name.startswith(prefix + '.')) and len(prefix) > best:
+                    rate, best = value, len(prefix)
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+# log arguments that are safe to format later on another thread
+_PRIMITIVES = (str, int, float, bool, bytes, type(None))
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Enqueues unformatted records; drops (and counts) instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+        self.enqueue_seconds = 0.0
+
+    def prepare(self, record):
+        # Formatting (msg % args) happens on the listener thread, not the request thread, unless an
+        # argument could change or lazy-load before then: those are rendered now
+        args = record.args
+        values = args.values() if isinstance(args, dict) else args or ()
+        if not all(isinstance(value, _PRIMITIVES) for value in values):
+            try:
+                record.msg, record.args = record.getMessage(), None
+            except Exception:
+                # a bad format string is reported by the output handler, as usual
+                pass
+        return record
+
+    def emit(self, record):
+        start = time.perf_counter()
+        try:
+            self.queue.put_nowait(self.prepare(record))
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+        self.enqueue_seconds += time.perf_counter() - start
+
+
+class LoggingSetup:
+    def __init__(self):
+        self.listener = None
+        self.handler = None
+        self.sampler = None
+        self._lock = threading.Lock()
+
+    def configure(self, level='INFO', fmt='text', sample_rates=None, queue_size=10000, stream=None):
+        with self._lock:
+            self.shutdown()
+            log_queue = queue.Queue(maxsize=queue_size)
+            output = logging.StreamHandler(stream or sys.stderr)
+            output.setFormatter(
+                JsonFormatter() if fmt == 'json'
+                else logging.Formatter('%(asctime)s %(levelname)s [%(name)s] %(message)s')
+            )
+            # replace our own handler on reconfigure; handlers the host or tests installed stay
+            root = logging.getLogger()
+            if self.handler is not None:
+                root.removeHandler(self.handler)
+            self.handler = BoundedQueueHandler(log_queue)
+            self.sampler = SamplingFilter(sample_rates or {})
+            self.handler.addFilter(self.sampler)
+            root.addHandler(self.handler)
+            root.setLevel(level)
+
+            self.listener = QueueListener(log_queue, output, respect_handler_level=True)
+            self.listener.start()
+        return self
+
+    def shutdown(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def stats(self):
+        handler = self.handler
+        if handler is None:
+            return {'configured': False}
+        return {
+            'configured': True,
+            'enqueued': handler.enqueued,
+            'dropped_queue_full': handler.dropped,
+            'sampled_out': self.sampler.sampled_out,
+            'queue_depth': handler.queue.qsize(),
+            'avg_enqueue_us': round(handler.enqueue_seconds / handler.enqueued * 1e6, 2) if handler.enqueued else 0.0,
+        }
+
+
+logging_setup = LoggingSetup()
+atexit.register(logging_setup.shutdown)
+register_metrics_source('logging', logging_setup.stats)
+
+
+def parse_sample_rates(spec):
+    """'app.ai_matching.outcomes=0.1,app.services.location_service=0.5' -> {name: rate}"""
+    rates = {}
+    for item in (spec or '').split(','):
+        if '=' in item:
+            name, rate = item.split('=', 1)
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+def configure_logging(config):
+    """Install the single queue-backed root handler described by the app config"""
+    return logging_setup.configure(
+        level=config.get('LOG_LEVEL', 'INFO'),
+        fmt=config.get('LOG_FORMAT', 'text'),
+        sample_rates=parse_sample_rates(config.get('LOG_SAMPLE_RATES')),
+        queue_size=config.get('LOG_QUEUE_SIZE', 10000)
+    )
@@ -3,13 +3,28 @@ from . import db
 from datetime import datetime
 class Request(db.Model):
     __tablename__='requests'
+    # Feed queries filter on one of these and page by (created_at, id)
+    __table_args__ = (
+        db.Index('ix_requests_created_at_id', 'created_at', 'id'),
+        db.Index('ix_requests_status_created_at', 'status', 'created_at', 'id'),
+        db.Index('ix_requests_type_status_created_at', 'type', 'status', 'created_at', 'id'),
+        db.Index('ix_requests_location_status_created_at', 'location', 'status', 'created_at', 'id'),
+        db.Index('ix_requests_type_created_at', 'type', 'created_at', 'id'),
+        db.Index('ix_requests_location_created_at', 'location', 'created_at', 'id'),
+        db.Index('ix_requests_user_id_status', 'user_id', 'status'),
+        db.Index('ix_requests_updated_at_id', 'updated_at', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     type = db.Column(db.Enum("donation", "exchange", "service", name="request_types"), nullable=False)
     description = db.Column(db.Text, nullable=False)
     status = db.Column(db.Enum("pending", "approved", "rejected", "completed", name="request_statuses"), default="pending")
+    location = db.Column(db.String(100), nullable=True)
+    # set on insert when the description near-duplicates an open request (app.services.request_dedup)
+    duplicate_of_id = db.Column(db.Integer, db.ForeignKey("requests.id", ondelete="SET NULL"), nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # bumped on every write; delta sync pulls by it
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
    
-    user = db.relationship("User", back_populates="requests")
-    matches = db.relationship("Match", back_populates="request", cascade="all, delete-orphan")
\ No newline at end of file
+    user = db.relationship("User", back_populates="requests")
\ No newline at end of file
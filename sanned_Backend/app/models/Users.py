@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Enum, BigInteger
+from sqlalchemy import Column, Integer, String, Boolean, Enum, BigInteger, Float
 from flask_login import UserMixin
 from sqlalchemy.orm import relationship
 from . import db
@@ -16,5 +16,9 @@ class User(UserMixin, db.Model):
     longitude = db.Column(String(50), nullable=True)
     is_in_gaza = db.Column(Boolean, default=False)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    # materialized by the reliability recompute from match_outcomes; NULL until the first outcome
+    reliability_score = db.Column(Float, nullable=True)
+    reliability_updated_at = db.Column(db.DateTime, nullable=True)
   
-skills= db.relationship('UserSkills', back_populates='user',cascade="all, delete-orphan",lazy='dynamic')
\ No newline at end of file
+    skills= db.relationship('UserSkills', back_populates='user',cascade="all, delete-orphan",lazy='dynamic')
+    requests = db.relationship('Request', back_populates='user')
\ No newline at end of file
@@ -0,0 +1,12 @@
+from app import db
+from .Users import User
+from .skills import Skill
+from .userSkills import UserSkills
+from .Requests import Request
+from .matches import Match
+from .sponsorship import Sponsorship
+from .webhook_events import WebhookEvent
+from .helper_assignments import HelperAssignment
+from .sync_tombstones import SyncTombstone
+from .match_outcomes import MatchOutcome
+from .match_candidates import MatchCandidate
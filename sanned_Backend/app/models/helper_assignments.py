@@ -0,0 +1,26 @@
+from app import db
+from datetime import datetime
+
+class HelperAssignment(db.Model):
+    """Helper proposed for a pending request by the batch assignment scheduler"""
+    __tablename__ = 'helper_assignments'
+    __table_args__ = (
+        # capacity is counted per helper, open assignments are looked up per request
+        db.Index('ix_helper_assignments_helper_id_status', 'helper_id', 'status'),
+        db.Index('ix_helper_assignments_request_id_status', 'request_id', 'status'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    request_id = db.Column(db.Integer, db.ForeignKey("requests.id"), nullable=False)
+    helper_id = db.Column(db.BigInteger, db.ForeignKey("users.id"), nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    urgency = db.Column(db.String(20), nullable=True)
+    status = db.Column(db.Enum("proposed", "accepted", "declined", "cancelled", name="assignment_statuses"), nullable=False, default="proposed")
+    run_id = db.Column(db.String(32), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    request = db.relationship("Request", foreign_keys=[request_id])
+    helper = db.relationship("User", foreign_keys=[helper_id])
+
+    def __repr__(self):
+        return f"<HelperAssignment request {self.request_id} -> helper {self.helper_id} | {self.status}>"
@@ -0,0 +1,29 @@
+from app import db
+from datetime import datetime
+
+class MatchCandidate(db.Model):
+    """
+    Materialized matching pool: one narrow row per eligible helper (role sponsor, seeker_doer
+    or both, in Gaza) with skills pre-joined, so the matcher reads the pool in one scan.
+    Kept current by app.services.candidate_view in the transaction that changes the source rows.
+    """
+    __tablename__ = 'match_candidates'
+
+    # no foreign key: the row is removed in the same flush that deletes the user
+    user_id = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(150), nullable=False)
+    email = db.Column(db.String(150), nullable=False)
+    phone = db.Column(db.String(20), nullable=True)
+    role = db.Column(db.String(20), nullable=False)
+    location = db.Column(db.String(100), nullable=False)
+    # the shard sharded matching reads by
+    location_id = db.Column(db.SmallInteger, nullable=False, index=True)
+    latitude = db.Column(db.Float, nullable=False)
+    longitude = db.Column(db.Float, nullable=False)
+    # skill names, in the order they were added
+    skills = db.Column(db.JSON, nullable=False, default=list)
+    reliability = db.Column(db.Float, nullable=True)
+    refreshed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<MatchCandidate {self.user_id} {self.location}>"
@@ -0,0 +1,26 @@
+from app import db
+from datetime import datetime
+
+class MatchOutcome(db.Model):
+    """One recorded result of a helper taking on a match; the input of the reliability recompute"""
+    __tablename__ = 'match_outcomes'
+    __table_args__ = (
+        # the recompute reads the log in time order; per-helper history is looked up by helper
+        db.Index('ix_match_outcomes_created_at', 'created_at'),
+        db.Index('ix_match_outcomes_helper_id_created_at', 'helper_id', 'created_at'),
+        # one outcome per helper on a request
+        db.UniqueConstraint('request_id', 'helper_id', name='uq_match_outcomes_request_id_helper_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    helper_id = db.Column(db.BigInteger, db.ForeignKey("users.id"), nullable=False)
+    request_id = db.Column(db.Integer, db.ForeignKey("requests.id"), nullable=True)
+    recorded_by = db.Column(db.BigInteger, db.ForeignKey("users.id"), nullable=True)
+    successful = db.Column(db.Boolean, nullable=False, default=False)
+    response_time_hours = db.Column(db.Float, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    helper = db.relationship("User", foreign_keys=[helper_id])
+
+    def __repr__(self):
+        return f"<MatchOutcome helper {self.helper_id} | {'success' if self.successful else 'failure'}>"
@@ -4,12 +4,16 @@ from datetime import datetime
 from sqlalchemy.orm import relationship
 class Match(db.Model):
     __tablename__ = "matches"
+    __table_args__ = (
+        db.Index('ix_matches_updated_at_id', 'updated_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     request_a_id = db.Column(db.Integer, db.ForeignKey("requests.id"), nullable=False)
     request_b_id = db.Column(db.Integer, db.ForeignKey("requests.id"), nullable=False)
     status = db.Column(db.Enum("pending", "confirmed", "cancelled", name="match_statuses"), default="pending")
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
   
     request_a = db.relationship("Request", foreign_keys=[request_a_id], backref="matches_as_a")
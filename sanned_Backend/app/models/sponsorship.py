@@ -0,0 +1,23 @@
+from app import db
+from datetime import datetime
+
+class Sponsorship(db.Model):
+    __tablename__ = 'sponsorships'
+
+    id = db.Column(db.Integer, primary_key=True)
+    sponsor_id = db.Column(db.BigInteger, db.ForeignKey("users.id"), nullable=False)
+    request_id = db.Column(db.Integer, db.ForeignKey("requests.id"), nullable=False)
+    amount = db.Column(db.Numeric(12, 2), nullable=False)
+    currency = db.Column(db.String(3), default="USD")
+    pay_doer = db.Column(db.Boolean, default=False)
+    status = db.Column(db.Enum("pending", "reserved", "paid", "failed", name="sponsorship_statuses"), default="pending")
+    checkout_id = db.Column(db.String(100), nullable=True, index=True)
+    checkout_url = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    sponsor = db.relationship("User")
+    request = db.relationship("Request")
+
+    def __repr__(self):
+        return f"<Sponsorship {self.id} request={self.request_id} | {self.status}>"
@@ -0,0 +1,46 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import event
+from .Requests import Request
+from .matches import Match
+from .userSkills import UserSkills
+
+class SyncTombstone(db.Model):
+    """Deleted row, kept so delta sync can tell clients to drop it"""
+    __tablename__ = 'sync_tombstones'
+    __table_args__ = (
+        db.Index('ix_sync_tombstones_deleted_at_id', 'deleted_at', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.String(64), nullable=False)
+    # only this user receives the deletion; NULL means every client does
+    user_id = db.Column(db.BigInteger, nullable=True)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SyncTombstone {self.table_name}:{self.row_id}>"
+
+
+# (model, scope) - scope gives the user a deletion is private to, or None for everyone
+SYNCED_MODELS = (
+    (Request, lambda row: None),
+    (Match, lambda row: None),
+    (UserSkills, lambda row: row.user_id),
+)
+
+
+def _tombstone_listener(scope):
+    def record_deletion(mapper, connection, target):
+        connection.execute(SyncTombstone.__table__.insert().values(
+            table_name=mapper.local_table.name,
+            row_id=str(target.id),
+            user_id=scope(target),
+            deleted_at=datetime.utcnow()
+        ))
+    return record_deletion
+
+
+for _model, _scope in SYNCED_MODELS:
+    event.listen(_model, 'after_delete', _tombstone_listener(_scope))
@@ -0,0 +1,25 @@
+from app import db
+from datetime import datetime
+
+class WebhookEvent(db.Model):
+    """Inbound provider event, stored verbatim and applied later by the webhook consumer"""
+    __tablename__ = 'webhook_events'
+    __table_args__ = (
+        # Redeliveries hit this index and nothing else
+        db.UniqueConstraint('provider', 'event_id', name='uq_webhook_events_provider_event_id'),
+        db.Index('ix_webhook_events_status_id', 'status', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    provider = db.Column(db.String(30), nullable=False, default="checkout")
+    event_id = db.Column(db.String(100), nullable=False)
+    event_type = db.Column(db.String(100), nullable=True)
+    payload = db.Column(db.Text, nullable=False)
+    status = db.Column(db.Enum("received", "processed", "ignored", "failed", name="webhook_event_statuses"), nullable=False, default="received")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    received_at = db.Column(db.DateTime, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<WebhookEvent {self.provider}:{self.event_id} {self.event_type} | {self.status}>"
@@ -1,4 +1,5 @@
 from flask import Blueprint 
+from flask_login import login_required
 from app.controllers.Request_controller import Request_controller
 
 reques_bp=Blueprint("reques_bp",__name__)
@@ -6,6 +7,12 @@ reques_bp=Blueprint("reques_bp",__name__)
 class RequestRouter :
     @reques_bp.route("/requests", 
     methods=["POST"])
+    @login_required
     def create_request():
-        return 
-    Request_controller.create_request()
\ No newline at end of file
+        return Request_controller.create_request()
+
+    @reques_bp.route("/requests",
+    methods=["GET"])
+    @login_required
+    def list_requests():
+        return Request_controller.list_requests()
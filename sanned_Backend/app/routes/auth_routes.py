@@ -1,11 +1,12 @@
 # app/routes/auth_routes.py
 from flask import Blueprint, request, jsonify
+from flask_login import login_required, current_user
 from app.controllers.auth_controller import AuthController
+from app.services.user_service import UserService
+from app.services.security_service import PasswordHashingBusy
 
 import logging
 
-logging.basicConfig(level=logging.INFO)
-
 auth_bp = Blueprint('auth', __name__, url_prefix='/api')
 
 @auth_bp.route('/register', methods=['POST'])
@@ -13,7 +14,10 @@ def register():
  
     data = request.get_json()
     ip_address = request.remote_addr if hasattr(request, 'remote_addr') else None
-    response, status = AuthController.sign_up(data, ip_address)
+    try:
+        response, status = AuthController.sign_up(data, ip_address)
+    except PasswordHashingBusy:
+        return jsonify({"error": "Server busy, try again"}), 503, {"Retry-After": "1"}
     return jsonify(response), status
 
 @auth_bp.route('/users/<int:user_id>/username', methods=['PUT'])
@@ -37,10 +41,21 @@ def login():
         return jsonify(response), status
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
+    except PasswordHashingBusy:
+        return jsonify({"error": "Server busy, try again"}), 503, {"Retry-After": "1"}
     except Exception as e:
-        logging.error(f"Login error: {e}")
+        logging.error("Login error: %s", e)
         return jsonify({"error": "Internal server error"}), 500
-    @auth_bp.route('/users/<int:user_id>/location', methods=['PUT'])
-    def update_location(user_id):
-      data = request.json
-    return UserController.update_location(user_id, data)
\ No newline at end of file
+
+@auth_bp.route('/users/<int:user_id>/location', methods=['PUT'])
+@login_required
+def update_location(user_id):
+    if user_id != current_user.id:
+        return jsonify({"error": "You can only update your own location"}), 403
+    data = request.get_json() or {}
+    try:
+        lat, lon = float(data['latitude']), float(data['longitude'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "latitude and longitude are required"}), 400
+    response, status = UserService.update_location(user_id, lat, lon)
+    return jsonify(response), status
@@ -0,0 +1,18 @@
+# app/routes/metrics_routes.py
+from flask import Blueprint, jsonify
+from flask_login import login_required
+from app.utils.metrics import collect_metrics
+
+metrics_bp = Blueprint('metrics', __name__, url_prefix='/api')
+
+@metrics_bp.route('/metrics', methods=['GET'])
+@login_required
+def get_metrics():
+    """
+    Runtime metrics from every registered source
+    GET /api/metrics
+    """
+    return jsonify({
+        'success': True,
+        'metrics': collect_metrics()
+    })
@@ -9,4 +9,5 @@ sponsorship_bp = Blueprint("sponsorship_bp", __name__)
 @jwt_required()
 def sponsor_request(request_id):
     user_id = get_jwt_identity()
-    return jsonify(*SponsorshipController.init_sponsorship(user_id, request_id, request.json))
+    response, status = SponsorshipController.init_sponsorship(user_id, request_id, request.json)
+    return jsonify(response), status
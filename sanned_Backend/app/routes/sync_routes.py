@@ -0,0 +1,20 @@
+# app/routes/sync_routes.py
+from flask import Blueprint, request, jsonify
+from app.controllers.sync_controller import SyncController
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+sync_bp = Blueprint("sync_bp", __name__, url_prefix="/api/sync")
+
+@sync_bp.route("/pull", methods=["GET"])
+@jwt_required()
+def pull():
+    user_id = int(get_jwt_identity())
+    response, status = SyncController.pull(user_id, request.args)
+    return jsonify(response), status
+
+@sync_bp.route("/push", methods=["POST"])
+@jwt_required()
+def push():
+    user_id = int(get_jwt_identity())
+    response, status = SyncController.push(user_id, request.get_json(silent=True), request.args)
+    return jsonify(response), status
@@ -1,10 +1,24 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import tuple_, or_, exists
+from sqlalchemy.orm import aliased
 from app.models.Requests import Request
+from app.services.request_dedup import OPEN_STATUSES, request_deduplicator
 from app.services.location_service import LocationService
 from flask import abort
-from . import db
+from app import db
 
 
 class RequestService:
+    FEED_DEFAULT_LIMIT = 20
+    FEED_MAX_LIMIT = 100
+
+    @staticmethod
+    def normalize_location(value):
+        """'Khan Yunis' -> 'khan_yunis', the form the matcher uses for locations"""
+        return '_'.join(value.strip().lower().split()) if value else None
+
     @staticmethod
     def create_request(user, type, description, ip_address=None, manual_city=None):
         location_data = None
@@ -23,8 +37,72 @@ class RequestService:
             user_id=user.id,
             type=type,
             description=description,
+            location=RequestService.normalize_location(location_data.get("city")),
         )
 
         db.session.add(new_request)
         db.session.commit()
-        return new_request
\ No newline at end of file
+        return new_request
+
+    @staticmethod
+    def encode_cursor(req):
+        raw = json.dumps([req.created_at.isoformat(), req.id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, request_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), int(request_id)
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def list_requests(status=None, type=None, location=None, cursor=None, limit=None, include_duplicates=False):
+        """
+        Newest-first page of requests. Keyset pagination on (created_at, id): a page filtered by any one of
+        status, type or location, or by status with type or location, is one ordered index range scan.
+        Raises ValueError on an unknown status or type, or a limit that is not an integer.
+        Near-duplicates are left out unless include_duplicates, but only while the request they
+        duplicate is still open and inside the dedup window; after that they show up again.
+        """
+        if limit in (None, ''):
+            limit = RequestService.FEED_DEFAULT_LIMIT
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid limit: {limit}")
+        limit = min(max(1, limit), RequestService.FEED_MAX_LIMIT)
+
+        query = Request.query
+        if not include_duplicates:
+            root = aliased(Request)
+            cutoff = datetime.utcnow() - timedelta(days=request_deduplicator.window_days)
+            query = query.filter(or_(
+                Request.duplicate_of_id.is_(None),
+                ~exists().where(
+                    root.id == Request.duplicate_of_id,
+                    root.status.in_(OPEN_STATUSES),
+                    root.created_at >= cutoff
+                )
+            ))
+        if status:
+            if status not in Request.__table__.c.status.type.enums:
+                raise ValueError(f"Invalid status: {status}")
+            query = query.filter(Request.status == status)
+        if type:
+            if type not in Request.__table__.c.type.type.enums:
+                raise ValueError(f"Invalid type: {type}")
+            query = query.filter(Request.type == type)
+        if location:
+            query = query.filter(Request.location == RequestService.normalize_location(location))
+        if cursor:
+            created_at, request_id = RequestService.decode_cursor(cursor)
+            query = query.filter(tuple_(Request.created_at, Request.id) < tuple_(created_at, request_id))
+
+        rows = query.order_by(Request.created_at.desc(), Request.id.desc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = RequestService.encode_cursor(rows[-1]) if has_more else None
+        return rows, next_cursor
@@ -0,0 +1,161 @@
+# app/services/candidate_view.py
+from datetime import datetime
+from sqlalchemy import delete, event, insert, inspect, select, update
+from sqlalchemy.orm import Session, object_session
+from app.models import User, Skill, UserSkills, MatchCandidate
+from app.ai_matching.candidates import GAZA_LOCATIONS, LOCATION_IDS, DEFAULT_LOCATION
+from app.services.RequestService import RequestService
+import logging
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_ROLES = ('sponsor', 'seeker_doer', 'both')
+# user columns the candidate row is derived from; changes to others do not refresh it
+SOURCE_COLUMNS = ('username', 'email', 'phone_number', 'roles', 'localization', 'latitude', 'longitude',
+                  'is_in_gaza', 'reliability_score')
+BATCH_SIZE = 500
+
+
+def _coordinate(value, fallback):
+    try:
+        return float(value) if value not in (None, '') else fallback
+    except (TypeError, ValueError):
+        return fallback
+
+
+class CandidateView:
+    """Maintains the match_candidates table from users, user_skills and skills"""
+
+    @staticmethod
+    def build_rows(connection, user_ids):
+        """Candidate rows for the eligible users among user_ids"""
+        users = connection.execute(select(
+            User.id, User.username, User.email, User.phone_number, User.roles,
+            User.localization, User.latitude, User.longitude, User.reliability_score
+        ).where(
+            User.id.in_(user_ids),
+            User.roles.in_(CANDIDATE_ROLES),
+            User.is_in_gaza == True
+        )).all()
+        if not users:
+            return []
+
+        skills = {}
+        for user_id, name in connection.execute(
+            select(UserSkills.user_id, Skill.name).join(Skill, UserSkills.skill_id == Skill.id)
+            .where(UserSkills.user_id.in_([u.id for u in users]))
+            .order_by(UserSkills.created_at, UserSkills.id)
+        ):
+            skills.setdefault(user_id, []).append(name)
+
+        now = datetime.utcnow()
+        rows = []
+        for u in users:
+            location = RequestService.normalize_location(u.localization) or DEFAULT_LOCATION
+            known = location if location in LOCATION_IDS else DEFAULT_LOCATION
+            lat, lon = GAZA_LOCATIONS[known]
+            rows.append({
+                'user_id': u.id,
+                'name': u.username,
+                'email': u.email,
+                'phone': u.phone_number,
+                'role': u.roles,
+                'location': location,
+                'location_id': LOCATION_IDS[known],
+                'latitude': _coordinate(u.latitude, lat),
+                'longitude': _coordinate(u.longitude, lon),
+                'skills': skills.get(u.id, []),
+                'reliability': u.reliability_score,
+                'refreshed_at': now,
+            })
+        return rows
+
+    @staticmethod
+    def refresh(connection, user_ids):
+        """Re-derive the rows of the given users: ineligible or deleted users drop out"""
+        user_ids = sorted(set(user_ids))
+        table = MatchCandidate.__table__
+        for start in range(0, len(user_ids), BATCH_SIZE):
+            batch = user_ids[start:start + BATCH_SIZE]
+            rows = CandidateView.build_rows(connection, batch)
+            connection.execute(delete(table).where(table.c.user_id.in_(batch)))
+            if rows:
+                connection.execute(insert(table), rows)
+        return len(user_ids)
+
+    @staticmethod
+    def rebuild(connection):
+        """Full rebuild; returns the number of candidates"""
+        connection.execute(delete(MatchCandidate.__table__))
+        user_ids = connection.execute(select(User.id).where(
+            User.roles.in_(CANDIDATE_ROLES), User.is_in_gaza == True
+        )).scalars().all()
+        CandidateView.refresh(connection, user_ids)
+        logger.info("Rebuilt match_candidates with %d helpers", len(user_ids))
+        return len(user_ids)
+
+    @staticmethod
+    def refresh_reliability(connection):
+        """Copy users.reliability_score after a bulk update, which skips the ORM events below"""
+        table = MatchCandidate.__table__
+        connection.execute(update(table).values(reliability=(
+            select(User.reliability_score).where(User.id == table.c.user_id).scalar_subquery()
+        )))
+
+
+# Changes are collected per session during the flush and applied right after it, on the
+# same connection, so the candidate rows commit or roll back with the change itself.
+def _mark(session, key, value):
+    if session is not None and value is not None:
+        session.info.setdefault(key, set()).add(value)
+
+
+@event.listens_for(User, 'after_insert')
+@event.listens_for(User, 'after_delete')
+def _user_added_or_removed(mapper, connection, target):
+    _mark(object_session(target), 'candidate_user_ids', target.id)
+
+
+@event.listens_for(User, 'after_update')
+def _user_changed(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in SOURCE_COLUMNS):
+        _mark(object_session(target), 'candidate_user_ids', target.id)
+
+
+@event.listens_for(UserSkills, 'after_insert')
+@event.listens_for(UserSkills, 'after_update')
+@event.listens_for(UserSkills, 'after_delete')
+def _user_skills_changed(mapper, connection, target):
+    session = object_session(target)
+    _mark(session, 'candidate_user_ids', target.user_id)
+    # a user_skill moved to another user changes the old owner too
+    history = inspect(target).attrs.user_id.history
+    for user_id in history.deleted or ():
+        _mark(session, 'candidate_user_ids', user_id)
+
+
+@event.listens_for(Skill, 'after_update')
+def _skill_renamed(mapper, connection, target):
+    if inspect(target).attrs.name.history.has_changes():
+        _mark(object_session(target), 'candidate_skill_ids', target.id)
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _refresh_candidates(session, flush_context):
+    user_ids = session.info.pop('candidate_user_ids', set())
+    skill_ids = session.info.pop('candidate_skill_ids', set())
+    if not user_ids and not skill_ids:
+        return
+    connection = session.connection()
+    if skill_ids:
+        user_ids.update(connection.execute(
+            select(UserSkills.user_id).where(UserSkills.skill_id.in_(skill_ids))
+        ).scalars())
+    CandidateView.refresh(connection, user_ids)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_candidate_changes(session, previous_transaction):
+    session.info.pop('candidate_user_ids', None)
+    session.info.pop('candidate_skill_ids', None)
@@ -8,8 +8,6 @@ from shapely.geometry import Point, Polygon
 
 load_dotenv()
 
-logging.basicConfig(level=logging.INFO)
-
 class LocationService:
     # Polygon of Gaza (approximate bounding box)
     GAZA_POLYGON = Polygon([
@@ -29,7 +27,7 @@ class LocationService:
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
     def get_ip_location(self, ip_address):
         if not ip_address or not self.api_key:
-            logging.warning(f"IP location lookup skipped: IP={ip_address}, API_KEY={'set' if self.api_key else 'not set'}")
+            logging.debug("IP location lookup skipped: IP=%s, API_KEY=%s", ip_address, 'set' if self.api_key else 'not set')
             return None
         params = {
             "api_key": self.api_key,
@@ -39,12 +37,12 @@ class LocationService:
             response = requests.get(self.base_url, params=params)
             response.raise_for_status()
             data = response.json()
-            logging.info(f"Location lookup for IP {ip_address}: {data}")
-
             lat, lon = data.get('latitude'), data.get('longitude')
             in_gaza = False
             if lat and lon:
                 in_gaza = self.is_in_gaza(float(lat), float(lon))
+            logging.debug("Location lookup for IP %s: city=%s country=%s in_gaza=%s",
+                          ip_address, data.get('city'), data.get('country'), in_gaza)
 
             return {
                 'country': data.get('country'),
@@ -54,7 +52,7 @@ class LocationService:
                 'is_in_gaza': in_gaza
             }
         except requests.RequestException as e:
-            logging.error(f"Error fetching location for IP {ip_address}: {e}")
+            logging.error("Error fetching location for IP %s: %s", ip_address, e)
             return None
 
     @staticmethod
@@ -69,7 +67,7 @@ class LocationService:
             'longitude': None,
             'is_in_gaza': city.strip().lower() == 'gaza'
         }
-        logging.info(f"Manual location lookup for city '{city}': {result}")
+        logging.debug("Manual location lookup for city '%s': in_gaza=%s", city, result['is_in_gaza'])
         return result
 
     @staticmethod
@@ -1,6 +1,9 @@
 # app/services/payment_service.py
-import os, requests, logging
+import os, requests, logging, asyncio, threading, time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from app.utils.metrics import register_metrics_source
 
 logger = logging.getLogger(__name__)
 CHECKOUT_SECRET = os.getenv("CHECKOUT_SECRET_KEY")
@@ -8,16 +11,89 @@ CHECKOUT_ENV = os.getenv("CHECKOUT_ENVIRONMENT", "sandbox")  # sandbox or produc
 
 
 BASE = "https://api.sandbox.checkout.com/" if CHECKOUT_ENV == "sandbox" else "https://api.checkout.com/"
+# Point at a local stand-in (benchmarks/checkout_stub.py) for offline load tests
+BASE = os.getenv("CHECKOUT_API_BASE", BASE)
 
-class PaymentService:
-    @staticmethod
-    def create_payment_link(sponsorship_id: int, amount: float, currency: str, return_url: str, cancel_url: str, metadata: dict = None):
-       
-        if not CHECKOUT_SECRET:
+
+class PaymentClient:
+    """Keep-alive HTTP client for the payments API with a bounded connection pool"""
+
+    def __init__(self, base_url, secret, pool_size=10, timeout=15):
+        self.base_url = base_url
+        self.secret = secret
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+
+    def post(self, path, payload):
+        if not self.secret:
             raise RuntimeError("CHECKOUT_SECRET_KEY not configured")
+        headers = {
+            "Authorization": f"Bearer {self.secret}",
+            "Content-Type": "application/json"
+        }
+        start = time.perf_counter()
+        try:
+            resp = self.session.post(urljoin(self.base_url, path), json=payload, headers=headers, timeout=self.timeout)
+            resp.raise_for_status()
+            return resp.json()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.requests_sent += 1
+                self.total_seconds += time.perf_counter() - start
+
+    async def post_async(self, path, payload):
+        """Awaitable variant; runs on a pool sized like the connection pool so sockets are still reused"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="payments")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.post, path, payload)
+
+    def metrics(self):
+        connections = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+        sent = self.requests_sent
+        return {
+            "requests": sent,
+            "errors": self.errors,
+            "connections_opened": connections,
+            "connection_reuse_ratio": round(1 - connections / sent, 4) if sent else 0.0,
+            "avg_latency_ms": round(self.total_seconds / sent * 1000, 2) if sent else 0.0,
+            "pool_size": self.pool_size
+        }
+
+
+payment_client = PaymentClient(
+    BASE,
+    CHECKOUT_SECRET,
+    pool_size=int(os.getenv("CHECKOUT_POOL_SIZE", "10")),
+    timeout=float(os.getenv("CHECKOUT_TIMEOUT", "15"))
+)
+register_metrics_source("payments", payment_client.metrics)
 
-        url = urljoin(BASE, "payment-links")
-        payload = {
+
+class PaymentService:
+    @staticmethod
+    def _payment_link_payload(sponsorship_id, amount, currency, return_url, cancel_url, metadata):
+        return {
             "amount": int(round(amount * 100)),  # amount in minor units (cents)
             "currency": currency,
             "reference": f"sponsorship_{sponsorship_id}",
@@ -26,15 +102,25 @@ class PaymentService:
             "cancel_url": cancel_url,
             "metadata": metadata or {}
         }
-        headers = {
-            "Authorization": f"Bearer {CHECKOUT_SECRET}",
-            "Content-Type": "application/json"
-        }
-        resp = requests.post(url, json=payload, headers=headers, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
+
+    @staticmethod
+    def _payment_link_result(data):
         # data keys vary — typically includes id and url fields; adapt if your account returns different shape
         checkout_id = data.get("id") or data.get("payment_link", {}).get("id")
-        checkout_url = data.get("url") or data.get("payment_link", {}).get("url")
+        checkout_url = (
+            data.get("url")
+            or data.get("payment_link", {}).get("url")
+            or data.get("_links", {}).get("redirect", {}).get("href")
+        )
         logger.info("Created payment link %s", checkout_id)
         return {"checkout_id": checkout_id, "checkout_url": checkout_url, "raw": data}
+
+    @staticmethod
+    def create_payment_link(sponsorship_id: int, amount: float, currency: str, return_url: str, cancel_url: str, metadata: dict = None):
+        payload = PaymentService._payment_link_payload(sponsorship_id, amount, currency, return_url, cancel_url, metadata)
+        return PaymentService._payment_link_result(payment_client.post("payment-links", payload))
+
+    @staticmethod
+    async def create_payment_link_async(sponsorship_id: int, amount: float, currency: str, return_url: str, cancel_url: str, metadata: dict = None):
+        payload = PaymentService._payment_link_payload(sponsorship_id, amount, currency, return_url, cancel_url, metadata)
+        return PaymentService._payment_link_result(await payment_client.post_async("payment-links", payload))
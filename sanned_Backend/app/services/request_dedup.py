@@ -0,0 +1,230 @@
+# app/services/request_dedup.py
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from sqlalchemy import event, inspect, or_, select
+from sqlalchemy.orm import Session, object_session
+from app.models import Request
+from app.utils.minhash import MinHashLSH
+import logging
+
+logger = logging.getLogger(__name__)
+
+# requests that still show up in feeds and get matched
+OPEN_STATUSES = ('pending', 'approved')
+SHINGLE_SIZE = 2
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def shingles(text):
+    """Word bigrams of the lowercased text; shorter texts are one shingle"""
+    tokens = _TOKEN.findall((text or '').lower())
+    if len(tokens) <= SHINGLE_SIZE:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+
+class RequestDeduplicator:
+    """
+    MinHash/LSH index over the descriptions of open requests from the last `window_days`.
+
+    A new request whose estimated shingle similarity to an indexed one of the same type
+    reaches `threshold` is a near-duplicate; it points at the original (the root of the
+    chain) through requests.duplicate_of_id. Across accounts a request needs at least
+    `min_cross_user_shingles` shingles, so two people both asking for "bread for my family"
+    are not collapsed into one. Requests are indexed as they are inserted in this process.
+    Rows other processes inserted are read at most every `sync_interval` seconds; each read
+    also re-scans the last `sync_overlap` seconds, so a row whose transaction committed after
+    one with a higher id is still picked up.
+    """
+
+    def __init__(self, threshold=0.7, window_days=7, min_cross_user_shingles=5, num_perm=128, bands=32,
+                 sync_interval=2.0, sync_overlap=120.0):
+        self.threshold = threshold
+        self.window_days = window_days
+        self.min_cross_user_shingles = min_cross_user_shingles
+        self.lsh = MinHashLSH(num_perm=num_perm, bands=bands)
+        # request id -> (user_id, type, root id, shingle count)
+        self._entries = {}
+        # (created_at, id) in insertion order, for expiry
+        self._expiry = deque()
+        self.sync_interval = sync_interval
+        self.sync_overlap = sync_overlap
+        self._last_id = 0
+        self._synced_at = None
+        self._next_sync = 0.0
+        self._lock = threading.RLock()
+        self.checks = 0
+        self.candidates_compared = 0
+        self.duplicates_found = 0
+
+    def configure(self, threshold=None, window_days=None, sync_interval=None, sync_overlap=None):
+        if threshold is not None:
+            self.threshold = threshold
+        if window_days is not None:
+            self.window_days = window_days
+        if sync_interval is not None:
+            self.sync_interval = sync_interval
+        if sync_overlap is not None:
+            self.sync_overlap = sync_overlap
+
+    def add(self, request_id, description, type=None, user_id=None, duplicate_of=None, created_at=None):
+        words = shingles(description)
+        if not words:
+            return
+        with self._lock:
+            if request_id in self._entries:
+                return
+            root = self._entries[duplicate_of][2] if duplicate_of in self._entries else duplicate_of
+            self._entries[request_id] = (user_id, type, root or request_id, len(words))
+            self._expiry.append((created_at or datetime.utcnow(), request_id))
+            self.lsh.insert(request_id, self.lsh.signature(words))
+
+    def remove(self, request_id):
+        with self._lock:
+            if self._entries.pop(request_id, None) is not None:
+                self.lsh.remove(request_id)
+
+    def root_of(self, request_id):
+        """The original a request duplicates, itself if it is one; None if not indexed"""
+        entry = self._entries.get(request_id)
+        return entry[2] if entry else None
+
+    def root_for(self, request_id, user_id, description):
+        """
+        root_of for a request id a client sent: only when the indexed request belongs to
+        `user_id` and `description` is still near its indexed text; None otherwise
+        """
+        entry = self._entries.get(request_id)
+        if entry is None or user_id is None or str(entry[0]) != str(user_id):
+            return None
+        words = shingles(description)
+        signature = self.lsh.signatures.get(request_id)
+        if not words or signature is None:
+            return None
+        if self.lsh.similarity(self.lsh.signature(words), signature) < self.threshold:
+            return None
+        return entry[2]
+
+    def find_duplicate(self, description, type=None, user_id=None, exclude_id=None):
+        """Root id of the most similar indexed request at or above the threshold, or None"""
+        words = shingles(description)
+        if not words:
+            return None
+        signature = self.lsh.signature(words)
+        self.checks += 1
+        best, best_similarity = None, self.threshold
+        with self._lock:
+            for request_id in self.lsh.query(signature):
+                entry = self._entries.get(request_id)
+                if entry is None or request_id == exclude_id:
+                    continue
+                other_user, other_type, root, count = entry
+                if type is not None and other_type is not None and other_type != type:
+                    continue
+                if (user_id is None or other_user != user_id) and min(count, len(words)) < self.min_cross_user_shingles:
+                    continue
+                self.candidates_compared += 1
+                similarity = self.lsh.similarity(signature, self.lsh.signatures[request_id])
+                if similarity >= best_similarity:
+                    best, best_similarity = root, similarity
+        return best
+
+    def sync(self, connection, force=False):
+        """
+        Index open requests other processes committed and drop those past the window. Reads new ids
+        plus everything created in the last `sync_overlap` seconds, at most once per `sync_interval`
+        unless forced; returns the number of rows read.
+        """
+        now = datetime.utcnow()
+        cutoff = now - timedelta(days=self.window_days)
+        with self._lock:
+            while self._expiry and self._expiry[0][0] < cutoff:
+                self.remove(self._expiry.popleft()[1])
+            if not force and time.monotonic() < self._next_sync:
+                return 0
+            self._next_sync = time.monotonic() + self.sync_interval
+            last_id, synced_at = self._last_id, self._synced_at
+        recent = cutoff if synced_at is None else max(cutoff, synced_at - timedelta(seconds=self.sync_overlap))
+        # the read runs outside the lock; rows already indexed are skipped by add
+        rows = connection.execute(select(
+            Request.id, Request.description, Request.type, Request.user_id,
+            Request.duplicate_of_id, Request.created_at
+        ).where(
+            or_(Request.id > last_id, Request.created_at >= recent),
+            Request.created_at >= cutoff,
+            Request.status.in_(OPEN_STATUSES)
+        ).order_by(Request.id)).all()
+        for row in rows:
+            self.add(row.id, row.description, row.type, row.user_id, row.duplicate_of_id, row.created_at)
+        with self._lock:
+            if rows:
+                self._last_id = max(self._last_id, rows[-1].id)
+            self._synced_at = max(self._synced_at or now, now)
+        return len(rows)
+
+    def stats(self):
+        return {
+            'indexed': len(self.lsh),
+            'checks': self.checks,
+            'candidates_compared': self.candidates_compared,
+            'duplicates_found': self.duplicates_found,
+            'threshold': self.threshold,
+            'window_days': self.window_days,
+        }
+
+
+request_deduplicator = RequestDeduplicator()
+
+
+# Every insert path (create_request, sync push) goes through these. The new request is indexed
+# at once so copies in the same flush are caught, and dropped again if the transaction rolls back.
+@event.listens_for(Request, 'before_insert')
+def _flag_duplicate(mapper, connection, target):
+    if target.duplicate_of_id is not None:
+        return
+    try:
+        request_deduplicator.sync(connection)
+        target.duplicate_of_id = request_deduplicator.find_duplicate(target.description, target.type, target.user_id)
+        if target.duplicate_of_id is not None:
+            request_deduplicator.duplicates_found += 1
+    except Exception as e:
+        logger.warning("Duplicate check skipped: %s", e)
+
+
+@event.listens_for(Request, 'after_insert')
+def _index_request(mapper, connection, target):
+    request_deduplicator.add(target.id, target.description, target.type, target.user_id,
+                             target.duplicate_of_id, target.created_at)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('dedup_indexed', set()).add(target.id)
+
+
+@event.listens_for(Request, 'after_update')
+def _reindex_request(mapper, connection, target):
+    state = inspect(target)
+    if not (state.attrs.description.history.has_changes() or state.attrs.status.history.has_changes()):
+        return
+    request_deduplicator.remove(target.id)
+    if target.status in OPEN_STATUSES or target.status is None:
+        request_deduplicator.add(target.id, target.description, target.type, target.user_id,
+                                 target.duplicate_of_id, target.created_at)
+
+
+@event.listens_for(Request, 'after_delete')
+def _unindex_request(mapper, connection, target):
+    request_deduplicator.remove(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _keep_indexed(session):
+    session.info.pop('dedup_indexed', None)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_indexed(session, previous_transaction):
+    for request_id in session.info.pop('dedup_indexed', ()):
+        request_deduplicator.remove(request_id)
@@ -1,30 +1,82 @@
 # app/services/security_service.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import create_access_token
-from app.config import JWT_ACCESS_TOKEN_EXPIRES
+from app.config import Config
 import logging
 
-logging.basicConfig(level=logging.INFO)
 bcrypt = Bcrypt()
 
+
+class PasswordHashingBusy(RuntimeError):
+    """Raised when the password hashing pool is saturated"""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded worker pool so request threads never queue unboundedly on CPU work"""
+
+    def __init__(self, rounds, workers, max_pending, wait_timeout):
+        self.rounds = rounds
+        self.wait_timeout = wait_timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.wait_timeout):
+            raise PasswordHashingBusy("password hashing pool is saturated")
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def hash(self, password, rounds=None):
+        return self._run(bcrypt.generate_password_hash, password, rounds or self.rounds).decode('utf-8')
+
+    def check(self, hashed_password, password):
+        return self._run(bcrypt.check_password_hash, hashed_password, password)
+
+
+password_hasher = PasswordHasher(
+    rounds=Config.BCRYPT_LOG_ROUNDS,
+    workers=Config.PASSWORD_HASH_WORKERS,
+    max_pending=Config.PASSWORD_HASH_MAX_PENDING,
+    wait_timeout=Config.PASSWORD_HASH_WAIT_TIMEOUT
+)
+
+
 class SecurityService:
     @staticmethod
-    def hash_password(password):
-        hashed = bcrypt.generate_password_hash(password).decode('utf-8')
-        logging.info("Password hashed successfully")
+    def hash_password(password, rounds=None):
+        hashed = password_hasher.hash(password, rounds)
+        logging.debug("Password hashed successfully")
         return hashed
 
     @staticmethod
     def check_password(hashed_password, password):
-        result = bcrypt.check_password_hash(hashed_password, password)
-        logging.info(f"Password check: {'successful' if result else 'failed'}")
+        result = password_hasher.check(hashed_password, password)
+        logging.debug("Password check: %s", 'successful' if result else 'failed')
         return result
 
+    @staticmethod
+    def hash_rounds(hashed_password):
+        """Cost factor stored in a bcrypt hash ($2b$<rounds>$...), or None if unparseable"""
+        try:
+            return int(hashed_password.split('$')[2])
+        except (AttributeError, IndexError, ValueError):
+            return None
+
+    @staticmethod
+    def needs_rehash(hashed_password):
+        return SecurityService.hash_rounds(hashed_password) != password_hasher.rounds
+
     @staticmethod
     def generate_token(user_id, expires_delta=None):
         if expires_delta is None:
-            expires_delta = JWT_ACCESS_TOKEN_EXPIRES
-            logging.info(f"Using default JWT access token expiry: {expires_delta}")
+            expires_delta = Config.JWT_ACCESS_TOKEN_EXPIRES
         token = create_access_token(identity=user_id, expires_delta=expires_delta)
-        logging.info(f"JWT token generated for user_id: {user_id}")
-        return token
\ No newline at end of file
+        logging.debug("JWT token generated for user_id: %s", user_id)
+        return token
@@ -0,0 +1,307 @@
+import base64
+import calendar
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import or_, select, tuple_
+from app import db
+from app.models import Request, Match, Skill, UserSkills, SyncTombstone, Sponsorship, HelperAssignment, MatchOutcome
+from app.services.RequestService import RequestService
+from app.services.request_dedup import OPEN_STATUSES
+import logging
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TYPES = ('donation', 'exchange', 'service')
+# statuses a request owner may set from the client
+CLIENT_REQUEST_STATUSES = ('pending', 'completed')
+CLIENT_MATCH_STATUSES = ('confirmed', 'cancelled')
+
+
+class SyncConflict(Exception):
+    """A pushed row changed on the server after the client's last pull"""
+
+
+def to_ms(value):
+    return calendar.timegm(value.utctimetuple()) * 1000 + value.microsecond // 1000 if value else None
+
+
+def from_ms(value):
+    return datetime(1970, 1, 1) + timedelta(milliseconds=int(value))
+
+
+class SyncService:
+    """WatermelonDB-style delta sync of requests, matches and the user's skills"""
+
+    @staticmethod
+    def _split(rows, since, serialize, created_of=lambda row: row.created_at):
+        changes = {'created': [], 'updated': [], 'deleted': []}
+        for row in rows:
+            created_at = created_of(row)
+            created = since is None or created_at is None or created_at > since
+            changes['created' if created else 'updated'].append(serialize(row))
+        return changes
+
+    @staticmethod
+    def _serialize_request(req):
+        return {
+            'id': str(req.id),
+            'user_id': str(req.user_id),
+            'type': req.type,
+            'description': req.description,
+            'location': req.location,
+            'status': req.status,
+            'duplicate_of_id': str(req.duplicate_of_id) if req.duplicate_of_id else None,
+            'created_at': to_ms(req.created_at),
+            'updated_at': to_ms(req.updated_at),
+        }
+
+    @staticmethod
+    def _serialize_match(match):
+        return {
+            'id': str(match.id),
+            'request_id': str(match.request_a_id),
+            'matched_with_id': str(match.request_b_id),
+            'status': match.status,
+            'created_at': to_ms(match.created_at),
+            'updated_at': to_ms(match.updated_at),
+        }
+
+    @staticmethod
+    def _serialize_user_skill(row):
+        user_skill, skill_name = row
+        return {
+            'id': user_skill.id,
+            'user_id': str(user_skill.user_id),
+            'skill': skill_name,
+            'created_at': to_ms(user_skill.created_at),
+            'updated_at': to_ms(user_skill.updated_at),
+        }
+
+    @staticmethod
+    def encode_cursor(req, timestamp):
+        raw = json.dumps([req.updated_at.isoformat(), req.id, timestamp]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            updated_at, request_id, timestamp = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(updated_at), int(request_id), int(timestamp)
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def pull(user_id, last_pulled_at=None, clock_skew=10, cursor=None, page_size=500):
+        """
+        Rows changed since last_pulled_at (ms), as {table: {created, updated, deleted}}.
+
+        Without a checkpoint only the caller's own requests and the open feed are sent, not every
+        closed request. Requests come in pages of page_size keyed on (updated_at, id): pass the
+        returned next_cursor back until has_more is false. Matches, skills and deletions come with
+        the first page, and every page carries the first page's timestamp.
+
+        The returned timestamp trails the server clock by clock_skew seconds so rows written
+        by transactions still in flight during this pull are sent again next time.
+        """
+        since = from_ms(last_pulled_at) if last_pulled_at else None
+        if cursor:
+            after_updated_at, after_id, timestamp = SyncService.decode_cursor(cursor)
+        else:
+            timestamp = to_ms(datetime.utcnow() - timedelta(seconds=clock_skew))
+
+        requests = Request.query
+        if since is None:
+            requests = requests.filter(or_(Request.user_id == user_id, Request.status.in_(OPEN_STATUSES)))
+        else:
+            requests = requests.filter(Request.updated_at > since)
+        if cursor:
+            requests = requests.filter(tuple_(Request.updated_at, Request.id) > tuple_(after_updated_at, after_id))
+        rows = requests.order_by(Request.updated_at, Request.id).limit(page_size + 1).all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        changes = {
+            'requests': SyncService._split(rows, since, SyncService._serialize_request),
+            'matches': {'created': [], 'updated': [], 'deleted': []},
+            'user_skills': {'created': [], 'updated': [], 'deleted': []},
+        }
+        if not cursor:
+            own_requests = select(Request.id).where(Request.user_id == user_id)
+            matches = Match.query.filter(or_(Match.request_a_id.in_(own_requests), Match.request_b_id.in_(own_requests)))
+            user_skills = db.session.query(UserSkills, Skill.name).join(
+                Skill, UserSkills.skill_id == Skill.id
+            ).filter(UserSkills.user_id == user_id)
+            if since is not None:
+                matches = matches.filter(Match.updated_at > since)
+                user_skills = user_skills.filter(UserSkills.updated_at > since)
+            changes['matches'] = SyncService._split(matches.order_by(Match.updated_at, Match.id), since,
+                                                    SyncService._serialize_match)
+            changes['user_skills'] = SyncService._split(user_skills.all(), since, SyncService._serialize_user_skill,
+                                                        created_of=lambda row: row[0].created_at)
+            if since is not None:
+                for table_name, row_id in db.session.query(SyncTombstone.table_name, SyncTombstone.row_id).filter(
+                    SyncTombstone.deleted_at > since,
+                    or_(SyncTombstone.user_id.is_(None), SyncTombstone.user_id == user_id)
+                ):
+                    if table_name in changes:
+                        changes[table_name]['deleted'].append(row_id)
+
+        return {
+            'changes': changes,
+            'timestamp': timestamp,
+            'next_cursor': SyncService.encode_cursor(rows[-1], timestamp) if has_more else None,
+            'has_more': has_more,
+        }
+
+    @staticmethod
+    def _check_unchanged(rows, since):
+        for row in rows:
+            if since is None or (row.updated_at and row.updated_at > since):
+                raise SyncConflict(f"{row.__tablename__} {row.id} changed on the server; pull first")
+
+    @staticmethod
+    def _owned(rows, user_id, owner_of):
+        for row in rows:
+            if owner_of(row) != user_id:
+                raise PermissionError(f"{row.__tablename__} {row.id} does not belong to this user")
+        return rows
+
+    @staticmethod
+    def push(user, changes, last_pulled_at):
+        """
+        Apply a batch of client changes in one transaction.
+        Returns {table: {client_id: server_id}} for rows the server created.
+        """
+        since = from_ms(last_pulled_at) if last_pulled_at else None
+        changes = changes or {}
+        id_map = {'requests': {}, 'user_skills': {}}
+        try:
+            SyncService._push_requests(user, changes.get('requests') or {}, since, id_map['requests'])
+            SyncService._push_user_skills(user, changes.get('user_skills') or {}, id_map['user_skills'])
+            SyncService._push_matches(user, changes.get('matches') or {}, since)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        logger.info("Sync push from user %s applied", user.id)
+        return id_map
+
+    @staticmethod
+    def _by_id(model, ids, strict=True):
+        """Rows for the given ids in one query; deletes of rows already gone are not an error"""
+        ids = [int(i) if model is not UserSkills else str(i) for i in ids]
+        rows = model.query.filter(model.id.in_(ids)).all() if ids else []
+        if strict and len(rows) != len(set(ids)):
+            raise ValueError(f"Unknown {model.__tablename__} ids in push")
+        return rows
+
+    @staticmethod
+    def _push_requests(user, changes, since, id_map):
+        created = changes.get('created') or []
+        if created and not user.is_in_gaza:
+            raise PermissionError("only users in gaza can make requests")
+        new_rows = []
+        for record in created:
+            if record.get('type') not in REQUEST_TYPES or not record.get('description'):
+                raise ValueError("requests need a valid type and a description")
+            new_rows.append((record.get('id'), Request(
+                user_id=user.id,
+                type=record['type'],
+                description=record['description'],
+                location=RequestService.normalize_location(record.get('location')),
+            )))
+        db.session.add_all(row for _, row in new_rows)
+
+        updated = {str(r['id']): r for r in changes.get('updated') or []}
+        rows = SyncService._owned(SyncService._by_id(Request, updated), user.id, lambda r: r.user_id)
+        SyncService._check_unchanged(rows, since)
+        for row in rows:
+            record = updated[str(row.id)]
+            if 'type' in record:
+                if record['type'] not in REQUEST_TYPES:
+                    raise ValueError(f"invalid request type {record['type']}")
+                row.type = record['type']
+            if record.get('description'):
+                row.description = record['description']
+            if 'location' in record:
+                row.location = RequestService.normalize_location(record['location'])
+            if 'status' in record and record['status'] != row.status:
+                if record['status'] not in CLIENT_REQUEST_STATUSES:
+                    raise ValueError(f"clients cannot set request status {record['status']}")
+                row.status = record['status']
+
+        deleted = SyncService._owned(SyncService._by_id(Request, changes.get('deleted') or [], strict=False), user.id, lambda r: r.user_id)
+        SyncService._check_unchanged(deleted, since)
+        if deleted:
+            SyncService._detach_requests([row.id for row in deleted])
+        for row in deleted:
+            db.session.delete(row)
+
+        db.session.flush()
+        id_map.update({client_id: str(row.id) for client_id, row in new_rows if client_id})
+
+    @staticmethod
+    def _detach_requests(request_ids):
+        """
+        Clear what references requests about to be deleted, in the same transaction: their
+        matches are deleted (and tombstoned for both sides), proposed assignments dropped,
+        outcomes kept without the request and copies no longer point at them. A sponsored
+        request cannot be deleted.
+        """
+        sponsored = db.session.query(Sponsorship.request_id).filter(Sponsorship.request_id.in_(request_ids)).first()
+        if sponsored:
+            raise SyncConflict(f"request {sponsored[0]} has a sponsorship; complete it instead of deleting it")
+        for match in Match.query.filter(or_(Match.request_a_id.in_(request_ids), Match.request_b_id.in_(request_ids))):
+            db.session.delete(match)
+        HelperAssignment.query.filter(HelperAssignment.request_id.in_(request_ids)).delete(synchronize_session=False)
+        MatchOutcome.query.filter(MatchOutcome.request_id.in_(request_ids)).update(
+            {MatchOutcome.request_id: None}, synchronize_session=False)
+        Request.query.filter(Request.duplicate_of_id.in_(request_ids)).update(
+            {Request.duplicate_of_id: None, Request.updated_at: datetime.utcnow()}, synchronize_session=False)
+
+    @staticmethod
+    def _push_user_skills(user, changes, id_map):
+        created = changes.get('created') or []
+        if any(not isinstance(r.get('skill'), str) or not r['skill'].strip() for r in created):
+            raise ValueError("user_skills need a skill name")
+        names = {r['skill'].strip().lower() for r in created}
+        skills = {s.name.lower(): s for s in Skill.query.filter(db.func.lower(Skill.name).in_(names))} if names else {}
+        for name in names - skills.keys():
+            skills[name] = Skill(name=name)
+            db.session.add(skills[name])
+        db.session.flush()
+        # the same skill twice in one push is one row; both client ids map to it
+        rows_by_name, new_rows = {}, []
+        for record in created:
+            name = record['skill'].strip().lower()
+            if name not in rows_by_name:
+                rows_by_name[name] = UserSkills(user_id=user.id, skill_id=skills[name].id)
+            new_rows.append((record.get('id'), rows_by_name[name]))
+        db.session.add_all(rows_by_name.values())
+
+        deleted = SyncService._owned(SyncService._by_id(UserSkills, changes.get('deleted') or [], strict=False), user.id, lambda r: r.user_id)
+        for row in deleted:
+            db.session.delete(row)
+
+        db.session.flush()
+        id_map.update({client_id: row.id for client_id, row in new_rows if client_id})
+
+    @staticmethod
+    def _push_matches(user, changes, since):
+        updated = {str(r['id']): r for r in changes.get('updated') or []}
+        rows = SyncService._by_id(Match, updated)
+        if rows:
+            owners = dict(db.session.query(Request.id, Request.user_id).filter(
+                Request.id.in_([r.request_a_id for r in rows] + [r.request_b_id for r in rows])
+            ))
+            for row in rows:
+                if user.id not in (owners.get(row.request_a_id), owners.get(row.request_b_id)):
+                    raise PermissionError(f"match {row.id} does not involve this user")
+        SyncService._check_unchanged(rows, since)
+        for row in rows:
+            status = updated[str(row.id)].get('status')
+            if status and status != row.status:
+                if status not in CLIENT_MATCH_STATUSES:
+                    raise ValueError(f"clients cannot set match status {status}")
+                row.status = status
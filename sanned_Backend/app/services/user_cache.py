@@ -0,0 +1,113 @@
+# app/services/user_cache.py
+import threading
+import time
+from collections import OrderedDict
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.models import User
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Only what authentication and matching read from current_user
+IDENTITY_COLUMNS = ('id', 'username', 'email', 'roles', 'localization', 'latitude', 'longitude', 'is_in_gaza')
+
+
+class CachedUser(UserMixin):
+    """Detached, read-only snapshot of a user's identity columns"""
+
+    def __init__(self, **columns):
+        for name in IDENTITY_COLUMNS:
+            setattr(self, name, columns.get(name))
+
+    def __repr__(self):
+        return f"<CachedUser {self.id} {self.username}>"
+
+
+class UserIdentityCache:
+    """Per-process TTL + LRU cache behind login_manager.user_loader"""
+
+    def __init__(self, ttl=60.0, max_size=10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, ttl=None, max_size=None):
+        if ttl is not None:
+            self.ttl = ttl
+        if max_size is not None:
+            self.max_size = max_size
+        self.clear()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def put(self, user):
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def load(self, user_id):
+        user = self.get(user_id)
+        if user is not None:
+            self.hits += 1
+            return user
+
+        self.misses += 1
+        columns = [getattr(User, name) for name in IDENTITY_COLUMNS]
+        row = db.session.query(*columns).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        user = CachedUser(**row._asdict())
+        self.put(user)
+        return user
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses, 'ttl': self.ttl}
+
+
+user_identity_cache = UserIdentityCache()
+
+
+# Invalidate only once the change is committed; a rollback leaves the cached identity valid
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _mark_user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('changed_user_ids', set()).add(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_users(session):
+    for user_id in session.info.pop('changed_user_ids', ()):
+        user_identity_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_rolled_back_users(session, previous_transaction):
+    session.info.pop('changed_user_ids', None)
@@ -1,21 +1,25 @@
 import logging
-from app.models.user import User
+from app.models.Users import User
 from app import db
 from app.services.location_service import LocationService
+from app.ai_matching.candidates import nearest_location
 
 class UserService:
     @staticmethod
     def update_location(user_id, lat, lon):
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
-            logging.warning(f"User not found with id {user_id}")
+            logging.warning("User not found with id %s", user_id)
             return {"error": "User not found"}, 404
 
         user.latitude = str(lat)
         user.longitude = str(lon)
         user.is_in_gaza = LocationService.is_in_gaza(lat, lon)
+        if user.is_in_gaza:
+            # the area moves with the user; its match_candidates row (and shard) follows in this commit
+            user.localization = nearest_location(lat, lon)
 
         db.session.commit()
-        logging.info(f"Updated location for user {user_id}, is_in_gaza={user.is_in_gaza}")
+        logging.info("Updated location for user %s, is_in_gaza=%s, area=%s", user_id, user.is_in_gaza, user.localization)
 
-        return {"message": "Location updated", "is_in_gaza": user.is_in_gaza}, 200
+        return {"message": "Location updated", "is_in_gaza": user.is_in_gaza, "localization": user.localization}, 200
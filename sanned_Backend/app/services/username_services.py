@@ -1,21 +1,66 @@
 # app/services/username_service.py
 import random
+from sqlalchemy import event, inspect
 from app.models import User
+from app.utils.bloom_filter import BloomFilter
 from app import db
 import logging
 
-logging.basicConfig(level=logging.INFO)
-
 class UsernameService:
+    # In-memory pre-filter of usernames known to exist; warmed at startup, updated on insert
+    _known_usernames = None
+    BATCH_SIZE = 16
+    SUFFIX_DIGITS = 4
+
+    @classmethod
+    def warm_username_filter(cls, error_rate=0.01):
+        count = db.session.query(db.func.count(User.id)).scalar() or 0
+        known = BloomFilter(capacity=max(10000, count * 2), error_rate=error_rate)
+        for (username,) in db.session.query(User.username).yield_per(10000):
+            known.add(username)
+        cls._known_usernames = known
+        logging.info("Username filter warmed with %d usernames", count)
+        return known
+
+    @classmethod
+    def remember_username(cls, username):
+        known = cls._known_usernames
+        if known is not None and username:
+            known.add(username)
+            if known.saturated:
+                logging.warning("Username filter over capacity, false positives will rise until it is re-warmed")
+
+    @classmethod
+    def _is_known(cls, username):
+        known = cls._known_usernames
+        return known is not None and username in known
+
     @staticmethod
-    def generate_unique_username(email):
+    def generate_unique_username(email, batch_size=None):
         base = email.lower().split('@')[0][:20]
+        batch_size = batch_size or UsernameService.BATCH_SIZE
+        digits = UsernameService.SUFFIX_DIGITS
         while True:
-            username = f"{base}{random.randint(1000, 9999)}"
-            if not User.query.filter_by(username=username).first():
-                logging.info(f"Generated unique username: {username}")
-                return username
-            logging.debug(f"Username {username} already exists, trying another")
+            low, high = 10 ** (digits - 1), 10 ** digits - 1
+            suffixes = random.sample(range(low, high + 1), min(batch_size, high - low + 1))
+            candidates = [f"{base}{suffix}" for suffix in suffixes]
+            candidates = [c for c in candidates if not UsernameService._is_known(c)]
+
+            if candidates:
+                # One round-trip checks the whole batch
+                taken = {
+                    username for (username,) in
+                    db.session.query(User.username).filter(User.username.in_(candidates))
+                }
+                for username in candidates:
+                    if username not in taken:
+                        logging.debug("Generated unique username: %s", username)
+                        return username
+                for username in taken:
+                    UsernameService.remember_username(username)
+
+            logging.debug("No free username in batch for %s with %d-digit suffixes, widening", base, digits)
+            digits += 1
 
     @staticmethod
     def update_username(user_id, new_username):
@@ -26,5 +71,17 @@ class UsernameService:
         user = User.query.get_or_404(user_id)
         user.username = new_username
         db.session.commit()
-        logging.info(f"Username updated for user_id {user_id}: {new_username}")
-        return user.username
\ No newline at end of file
+        logging.info("Username updated for user_id %s: %s", user_id, new_username)
+        return user.username
+
+
+@event.listens_for(User, 'after_insert')
+def _remember_username(mapper, connection, target):
+    UsernameService.remember_username(target.username)
+
+
+@event.listens_for(User, 'after_update')
+def _remember_renamed_username(mapper, connection, target):
+    # location and reliability writes also update users; only a rename adds a name
+    if inspect(target).attrs.username.history.has_changes():
+        UsernameService.remember_username(target.username)
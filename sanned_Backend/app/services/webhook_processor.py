@@ -0,0 +1,123 @@
+# app/services/webhook_processor.py
+import json
+import logging
+import threading
+from datetime import datetime
+from app import db
+from app.models.sponsorship import Sponsorship
+from app.models.webhook_events import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+PAID_EVENTS = ("payment.captured", "payment_approved", "payment.succeeded", "payment_captured")
+FAILED_EVENTS = ("payment_declined", "payment.declined", "payment_expired", "payment.expired")
+
+
+class WebhookEventProcessor:
+    MAX_ATTEMPTS = 5
+
+    @staticmethod
+    def _sponsorship_id(data):
+        metadata = data.get("metadata")
+        if not isinstance(metadata, dict):
+            return None
+        try:
+            return int(metadata.get("sponsorship_id"))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def process_pending(batch_size=100):
+        """Apply one batch of received events; returns how many events were handled"""
+        events = (
+            WebhookEvent.query
+            .filter(WebhookEvent.status == "received")
+            .order_by(WebhookEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not events:
+            return 0
+
+        parsed = {}
+        for event in events:
+            try:
+                payload = json.loads(event.payload)
+                data = (payload.get("data") or payload) if isinstance(payload, dict) else payload
+                if not isinstance(data, dict):
+                    raise ValueError(f"expected an object, got {type(data).__name__}")
+                parsed[event.id] = data
+            except ValueError as e:
+                # a bad payload never gets better: fail it instead of blocking the queue
+                event.attempts += 1
+                event.status = "failed"
+                event.last_error = f"invalid payload: {e}"
+
+        # One query for every sponsorship the batch touches
+        sponsorship_ids = {WebhookEventProcessor._sponsorship_id(data) for data in parsed.values()}
+        sponsorship_ids.discard(None)
+        sponsorships = {
+            s.id: s for s in Sponsorship.query.filter(Sponsorship.id.in_(sponsorship_ids))
+        } if sponsorship_ids else {}
+
+        now = datetime.utcnow()
+        for event in events:
+            if event.id not in parsed:
+                continue
+            data = parsed[event.id]
+            event.attempts += 1
+            try:
+                sponsorship = sponsorships.get(WebhookEventProcessor._sponsorship_id(data))
+                if event.event_type in PAID_EVENTS and sponsorship:
+                    if sponsorship.status != "paid":
+                        sponsorship.status = "paid"
+                        sponsorship.checkout_id = data.get("id") or sponsorship.checkout_id
+                        logger.info("Sponsorship %s marked as paid", sponsorship.id)
+                        # TODO: release escrow / notify doer / match request
+                    event.status = "processed"
+                elif event.event_type in FAILED_EVENTS and sponsorship:
+                    if sponsorship.status not in ("paid", "failed"):
+                        sponsorship.status = "failed"
+                        logger.info("Sponsorship %s marked as failed", sponsorship.id)
+                    event.status = "processed"
+                else:
+                    event.status = "ignored"
+                event.processed_at = now
+            except Exception as e:
+                logger.exception("Webhook event %s failed", event.event_id)
+                event.last_error = str(e)
+                if event.attempts >= WebhookEventProcessor.MAX_ATTEMPTS:
+                    event.status = "failed"
+
+        db.session.commit()
+        return len(events)
+
+    @staticmethod
+    def drain(batch_size=100):
+        total = 0
+        while True:
+            handled = WebhookEventProcessor.process_pending(batch_size)
+            total += handled
+            if handled < batch_size:
+                return total
+
+
+def start_webhook_consumer(app, interval=2.0, batch_size=100):
+    """Run the processor in a daemon thread; returns the stop event"""
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            with app.app_context():
+                try:
+                    WebhookEventProcessor.drain(batch_size)
+                except Exception as e:
+                    db.session.rollback()
+                    logger.warning("Webhook consumer pass failed: %s", e)
+                finally:
+                    db.session.remove()
+            stop.wait(interval)
+
+    threading.Thread(target=run, name="webhook-consumer", daemon=True).start()
+    return stop
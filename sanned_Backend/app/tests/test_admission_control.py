@@ -0,0 +1,62 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import pytest
+from app.ai_matching.admission_control import MatchingAdmission, AdmissionRejected
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def admit(admission, user_id, cost=1.0):
+    with admission.admit(user_id, cost):
+        pass
+
+
+def test_user_bucket_sheds_one_client_without_starving_others():
+    clock = FakeClock()
+    admission = MatchingAdmission(user_rate=1, user_burst=3, global_rate=100, global_burst=100, clock=clock)
+    for _ in range(3):
+        admit(admission, 'looping')
+    with pytest.raises(AdmissionRejected) as error:
+        admit(admission, 'looping')
+    assert error.value.reason == 'user_rate' and error.value.retry_after == 1.0
+    admit(admission, 'someone else')
+
+    clock.now = 1.0
+    admit(admission, 'looping')
+    assert admission.stats()['rejected']['user_rate'] == 1
+
+
+def test_global_bucket_and_cost_by_pool_size():
+    clock = FakeClock()
+    admission = MatchingAdmission(user_rate=10, user_burst=10, global_rate=2, global_burst=4, cost_unit=1000,
+                                  clock=clock)
+    assert admission.cost(None) == 1.0
+    assert admission.cost(2000) == 3.0
+    # capped so a big pool never becomes inadmissible
+    assert admission.cost(10 ** 6) == 10
+    admit(admission, 1, admission.cost(2000))
+    with pytest.raises(AdmissionRejected) as error:
+        admit(admission, 2, admission.cost(2000))
+    assert error.value.reason == 'global_rate' and error.value.retry_after == 1.0
+    # the shed request was not charged to its user
+    assert admission._users[2].tokens == 10
+
+
+def test_concurrency_limit_counts_in_flight_jobs():
+    admission = MatchingAdmission(max_in_flight=1)
+    with admission.admit(1):
+        with pytest.raises(AdmissionRejected) as error:
+            admit(admission, 2)
+        assert error.value.reason == 'concurrency'
+        assert admission.stats()['in_flight'] == 1
+    admit(admission, 2)
+    assert admission.stats()['in_flight'] == 0 and admission.stats()['peak_in_flight'] == 1
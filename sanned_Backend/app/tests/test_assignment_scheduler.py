@@ -0,0 +1,55 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from app.ai_matching.assignment_scheduler import AssignmentScheduler
+from app.ai_matching.candidates import CandidatePool
+
+
+def test_helper_capacity_is_respected_and_urgent_requests_win():
+    scheduler = AssignmentScheduler(matcher=object())
+    # three requests all prefer helper 0, which has a single slot
+    rows = np.array([0, 0, 1, 1, 2])
+    cols = np.array([0, 1, 0, 1, 0])
+    scores = np.array([0.9, 0.5, 0.9, 0.4, 0.9])
+    urgency = np.array([1.0, 2.0, 0.7])
+    pairs = scheduler.solve(rows, cols, scores * urgency[rows], 3, np.array([1, 1]))
+
+    helpers = [h for _, h in pairs]
+    assert helpers.count(0) == 1 and helpers.count(1) == 1
+    assert (1, 0) in pairs  # the critical request gets the best helper
+    assert (0, 1) in pairs
+
+
+def test_scores_edges_sparsely_and_never_assigns_own_request():
+    from app.ai_matching.db_integrated_matcher import db_matcher
+    scheduler = AssignmentScheduler(matcher=db_matcher, top_k=2, min_score=0)
+    pool = CandidatePool.from_dicts([
+        {'id': 1, 'name': 'a', 'location': 'gaza_city', 'skills': 'medical doctor'},
+        {'id': 2, 'name': 'b', 'location': 'rafah', 'skills': 'food cooking'},
+        {'id': 3, 'name': 'c', 'location': 'gaza_city', 'skills': 'transport car'},
+    ])
+    requests = [
+        {'id': 10, 'user_id': 1, 'description': 'need a doctor', 'location': 'gaza_city'},
+        {'id': 11, 'user_id': 9, 'description': 'hungry family needs a meal', 'location': 'rafah'},
+    ]
+    rows, cols, scores, urgencies = scheduler.score_edges(requests, pool)
+    assert len(rows) == 4
+    assert not any(r == 0 and pool.ids[c] == 1 for r, c in zip(rows, cols))
+    best = {r: c for r, c, _ in sorted(zip(rows, cols, scores), key=lambda e: e[2])}
+    assert pool.ids[best[1]] == 2
+
+
+def test_ties_are_spread_without_perturbing_the_scores():
+    from app.ai_matching.db_integrated_matcher import db_matcher
+    scheduler = AssignmentScheduler(matcher=db_matcher, top_k=2, min_score=0)
+    pool = CandidatePool.from_dicts([
+        {'id': i, 'name': 'h', 'location': 'gaza_city', 'skills': 'medical doctor'} for i in range(1, 7)
+    ])
+    requests = [{'id': 10 + i, 'user_id': 99, 'description': 'need a doctor', 'location': 'gaza_city'} for i in range(3)]
+    rows, cols, scores, _ = scheduler.score_edges(requests, pool)
+    assert len(set(scores.tolist())) == 1
+    tops = [tuple(sorted(cols[rows == r])) for r in range(3)]
+    assert len(set(tops)) == 3
@@ -0,0 +1,37 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.ai_matching.automated_ai_matcher import AutomatedAIMatcher
+from app.ai_matching.candidates import CandidatePool
+
+USERS = [
+    {'id': i, 'name': f'user{i}', 'location': loc, 'skills': skills}
+    for i, (loc, skills) in enumerate([
+        ('gaza_city', 'medical doctor'), ('rafah', 'food cooking'), ('gaza_city', 'transport car'),
+        ('khan_yunis', 'medical nurse'), ('gaza_city', 'education teacher'), ('rafah', 'medical doctor'),
+        ('jabalya', 'shelter building'),
+    ], start=1)
+]
+REQUEST = {'description': 'my child is sick and needs a doctor', 'location': 'gaza_city'}
+
+
+def test_explanations_only_when_asked():
+    matcher = AutomatedAIMatcher()
+    pool = CandidatePool.from_dicts(USERS, matcher.auto_get_user_reliability)
+    plain = matcher.auto_match(REQUEST, pool)
+    explained = matcher.auto_match(REQUEST, pool, explain=True)
+
+    assert len(plain) == 5 and all(explanation is None for _, _, explanation in plain)
+    assert [m[:2] for m in plain] == [m[:2] for m in explained]
+    assert isinstance(explained[0][2]['skill_match'], float)
+    assert explained[0][2]['total_score'] == round(explained[0][1], 3)
+
+
+def test_top_k_is_the_head_of_the_full_ranking():
+    matcher = AutomatedAIMatcher()
+    pool = CandidatePool.from_dicts(USERS, matcher.auto_get_user_reliability)
+    everyone = matcher.auto_match(REQUEST, pool, top_k=len(USERS))
+    assert [s for _, s, _ in everyone] == sorted((s for _, s, _ in everyone), reverse=True)
+    assert matcher.auto_match(REQUEST, pool, top_k=3) == everyone[:3]
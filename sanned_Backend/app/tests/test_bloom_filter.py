@@ -0,0 +1,21 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.utils.bloom_filter import BloomFilter
+
+
+def test_added_items_are_always_found():
+    bloom = BloomFilter(capacity=1000)
+    names = [f"user{i}" for i in range(1000)]
+    bloom.update(names)
+    assert all(name in bloom for name in names)
+    assert len(bloom) == 1000
+
+
+def test_false_positive_rate_stays_near_target():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    bloom.update(f"taken{i}" for i in range(5000))
+    false_positives = sum(f"free{i}" in bloom for i in range(10000))
+    assert false_positives < 300
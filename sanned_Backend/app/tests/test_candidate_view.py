@@ -0,0 +1,90 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import pytest
+from flask import Flask
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import User, Skill, UserSkills, MatchCandidate, Request
+from app.services import request_dedup
+from app.services.request_dedup import RequestDeduplicator
+from app.services.candidate_view import CandidateView
+from app.ai_matching.candidates import LOCATION_IDS
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(request_dedup, 'request_deduplicator', RequestDeduplicator())
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://')
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            User(id=1, username='amal', email='amal@x', password_hash='x', roles='sponsor', is_in_gaza=True,
+                 localization='Khan Yunis'),
+            User(id=2, username='bilal', email='bilal@x', password_hash='x', roles='both', is_in_gaza=True),
+            User(id=3, username='admin', email='admin@x', password_hash='x', roles='admin', is_in_gaza=True),
+            Skill(id='nurse', name='nurse'),
+            Skill(id='cook', name='cooking'),
+        ])
+        db.session.flush()
+        db.session.add(UserSkills(id='us1', user_id=1, skill_id='nurse'))
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+
+def candidate(user_id):
+    db.session.expire_all()
+    return db.session.get(MatchCandidate, user_id)
+
+
+def test_inserts_are_materialized_for_eligible_users_only(app):
+    row = candidate(1)
+    assert row.skills == ['nurse'] and row.location == 'khan_yunis'
+    assert row.location_id == LOCATION_IDS['khan_yunis']
+    assert candidate(2).skills == [] and candidate(3) is None
+
+
+def test_only_source_columns_refresh_the_row(app):
+    refreshed_at = candidate(1).refreshed_at
+    user = db.session.get(User, 1)
+    user.password_hash = 'y'
+    db.session.commit()
+    assert candidate(1).refreshed_at == refreshed_at
+
+    user.localization = 'Rafah'
+    db.session.commit()
+    assert candidate(1).location == 'rafah'
+
+    user.roles = 'admin'
+    db.session.commit()
+    assert candidate(1) is None
+
+
+def test_moving_a_skill_and_renaming_one_update_every_owner(app):
+    db.session.get(UserSkills, 'us1').user_id = 2
+    db.session.commit()
+    assert candidate(1).skills == [] and candidate(2).skills == ['nurse']
+
+    db.session.get(Skill, 'nurse').name = 'nursing'
+    db.session.commit()
+    assert candidate(2).skills == ['nursing']
+
+
+def test_rolled_back_changes_leave_no_trace(app):
+    db.session.get(User, 1).localization = 'Rafah'
+    # requests flush after users, so the user update is seen before the insert fails
+    db.session.add(Request(user_id=1, type='service', description=None))
+    with pytest.raises(IntegrityError):
+        db.session.flush()
+    db.session.rollback()
+    assert 'candidate_user_ids' not in db.session.info
+    assert candidate(1).location == 'khan_yunis'
+
+    CandidateView.rebuild(db.session.connection())
+    db.session.commit()
+    assert sorted(r.user_id for r in MatchCandidate.query) == [1, 2]
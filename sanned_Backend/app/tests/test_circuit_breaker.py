@@ -0,0 +1,110 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import contextlib
+import pytest
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.ai_matching import db_integrated_matcher
+from app.ai_matching.db_integrated_matcher import DatabaseIntegratedMatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fail():
+    raise RuntimeError('database down')
+
+
+def test_opens_on_failure_rate_and_recovers_through_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker('db', failure_rate=0.5, window_size=4, min_calls=4, open_seconds=10,
+                             half_open_calls=2, clock=clock)
+    breaker.call(lambda: 1)
+    breaker.call(lambda: 1)
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == CircuitBreaker.CLOSED
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # fast fail, the call is never made
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.call(fail)
+    assert error.value.retry_after == 10
+
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.call(lambda: 1)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.call(lambda: 1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()['rejected'] == 1
+
+
+def test_slow_calls_open_it_and_a_failed_probe_reopens_it():
+    clock = FakeClock()
+    breaker = CircuitBreaker('db', slow_call_seconds=1, slow_call_rate=0.5, window_size=2, min_calls=2,
+                             open_seconds=5, clock=clock)
+
+    def slow():
+        clock.now += 3
+        return 1
+
+    breaker.call(slow)
+    breaker.call(slow)
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 5
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_matcher_serves_the_last_good_pool_while_the_database_is_down(monkeypatch):
+    monkeypatch.setattr('app.utils.db_routing.read_session', contextlib.nullcontext)
+    matcher = DatabaseIntegratedMatcher()
+    matcher.db_breaker = CircuitBreaker('db', window_size=2, min_calls=2)
+    # the pool class the matcher module itself imported
+    pool = db_integrated_matcher.CandidatePool.from_dicts([
+        {'id': 1, 'location': 'gaza_city', 'skills': 'doctor'},
+        {'id': 2, 'location': 'khan_yunis', 'skills': 'cooking'},
+        {'id': 3, 'location': 'gaza_city', 'skills': 'teacher'},
+    ])
+    matcher._load_candidate_pool = lambda session, *args: pool
+    loaded, stale = matcher._read_pool(exclude_user_id=3)
+    assert loaded.ids == [1, 2] and not stale
+
+    def down(session, *args):
+        raise RuntimeError('database down')
+
+    matcher._load_candidate_pool = down
+    for _ in range(3):
+        loaded, stale = matcher._read_pool(exclude_user_id=1, location='gaza city')
+        assert stale and loaded.ids == [3]
+    assert matcher.db_breaker.state == CircuitBreaker.OPEN
+    assert matcher.db_health()['stale_pool_served'] == 3
+
+    result = matcher.find_matches_for_request_from_db({'description': 'my son is sick', 'location': 'gaza_city'}, 2)
+    assert result['stale'] and result['matches'][0]['user_id'] == 1
+
+
+def test_cold_matcher_reports_the_outage_instead_of_made_up_helpers(monkeypatch):
+    monkeypatch.setattr('app.utils.db_routing.read_session', contextlib.nullcontext)
+    matcher = DatabaseIntegratedMatcher()
+    matcher.sharded = False
+
+    def down(session, *args, **kwargs):
+        raise RuntimeError('database down')
+
+    matcher._load_candidate_pool = down
+    result = matcher.find_matches_for_request_from_db({'description': 'my son is sick', 'location': 'gaza_city'})
+    assert not result['success'] and result['matches'] == []
+    assert 'temporarily unavailable' in result['message']
+    assert matcher.search_helpers_by_skill('doctor') == []
@@ -0,0 +1,54 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import threading
+import time
+from app.ai_matching.match_events import MatchEventHub, stream_events
+
+
+def test_publish_reaches_every_stream_of_that_user_only():
+    hub = MatchEventHub()
+    phone, tablet, other = hub.subscribe(1), hub.subscribe(1), hub.subscribe(2)
+    assert hub.publish(1, 'matches', {'count': 3}) == 2
+    assert [e['data'] for e in phone.drain(0)] == [{'count': 3}]
+    assert [e['data'] for e in tablet.drain(0)] == [{'count': 3}]
+    assert other.drain(0) == []
+
+
+def test_slow_stream_keeps_newest_events_and_counts_drops():
+    hub = MatchEventHub(buffer_size=3)
+    slow = hub.subscribe(1)
+    for i in range(5):
+        hub.publish(1, 'status', i)
+    assert [e['data'] for e in slow.drain(0)] == [2, 3, 4]
+    assert hub.stats()['dropped'] == 2
+
+
+def test_reconnect_replays_latest_snapshot():
+    hub = MatchEventHub()
+    hub.publish(1, 'matches', ['old'], snapshot=True)
+    hub.publish(1, 'matches', ['new'], snapshot=True)
+    assert [e['data'] for e in hub.subscribe(1).drain(0)] == [['new']]
+
+
+def test_stream_yields_sse_frames_and_unsubscribes():
+    hub = MatchEventHub()
+    stream = stream_events(hub, 7, heartbeat=0.05)
+    assert next(stream).startswith('retry:')
+    threading.Timer(0.01, hub.publish, args=(7, 'matches', {'ids': [1, 2]})).start()
+    frame = next(stream)
+    while frame.startswith(':'):
+        frame = next(stream)
+    assert frame.startswith('id: ') and 'event: matches\n' in frame and 'data: {"ids": [1, 2]}' in frame
+    stream.close()
+    assert hub.stats()['streams'] == 0
+
+
+def test_stream_ends_at_its_max_duration():
+    hub = MatchEventHub()
+    start = time.monotonic()
+    frames = list(stream_events(hub, 7, heartbeat=10, max_duration=0.1))
+    assert frames[0].startswith('retry:') and time.monotonic() - start < 1
+    assert hub.stats()['streams'] == 0
@@ -0,0 +1,37 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import json
+import pytest
+from app.ai_matching.match_serializer import serialize_matches, parse_fields, dumps
+
+RESULT = {
+    'success': True,
+    'request_id': 'r1',
+    'urgency_detected': 'high',
+    'matches': [{
+        'user_id': 1, 'user_name': 'Dr. Ahmed', 'match_score': 0.912, 'location': 'gaza_city',
+        'skills': 'medical doctor', 'reliability': '70%', 'reliability_score': 0.7,
+        'contact_email': 'a@test.com', 'contact_phone': None,
+        'explanation': {'skill_match': '0.80', 'total_score': '0.912'},
+    }],
+}
+
+
+def test_explanation_only_when_requested():
+    assert 'explanation' not in serialize_matches(RESULT)['matches'][0]
+    assert serialize_matches(RESULT, explain=True)['matches'][0]['explanation']['skill_match'] == '0.80'
+
+
+def test_compact_rows_are_numeric_and_follow_fields():
+    payload = serialize_matches(RESULT, fields=parse_fields('user_id,reliability,explanation'), compact=True)
+    assert payload['fields'] == ['user_id', 'reliability', 'explanation']
+    assert payload['matches'] == [[1, 0.7, {'skill_match': 0.8, 'total_score': 0.912}]]
+    assert json.loads(dumps(payload))['urgency_detected'] == 'high'
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError):
+        parse_fields('user_id,db_user')
@@ -0,0 +1,100 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from app.ai_matching.priority_scheduler import UrgencyPriorityScheduler, MatchingQueueFull
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_blocked(scheduler, submissions):
+    """Hold the only worker busy, queue `submissions`, then release and record run order"""
+    gate = threading.Event()
+    order = []
+    scheduler.submit('low', gate.wait)
+    futures = [scheduler.submit(urgency, order.append, label) for urgency, label in submissions]
+    gate.set()
+    for future in futures:
+        future.result(timeout=5)
+    scheduler.shutdown()
+    return order
+
+
+def test_critical_jumps_the_queue():
+    scheduler = UrgencyPriorityScheduler(workers=1, reserved_workers=0)
+    order = run_blocked(scheduler, [('low', 'low'), ('medium', 'medium'), ('critical', 'critical')])
+    assert order == ['critical', 'medium', 'low']
+
+
+def test_old_low_job_overtakes_new_critical():
+    clock = FakeClock()
+    scheduler = UrgencyPriorityScheduler(workers=1, reserved_workers=0, clock=clock,
+                                         deadlines={'critical': 2, 'low': 120})
+    gate = threading.Event()
+    started = threading.Event()
+    order = []
+    scheduler.submit('low', lambda: started.set() or gate.wait())
+    started.wait(5)
+    old = scheduler.submit('low', order.append, 'old low')
+    clock.now = 500.0
+    new = scheduler.submit('critical', order.append, 'new critical')
+    gate.set()
+    old.result(timeout=5)
+    new.result(timeout=5)
+    scheduler.shutdown()
+    assert order == ['old low', 'new critical']
+    assert scheduler.stats()['levels']['low']['deadline_misses'] == 1
+
+
+def test_reserved_worker_serves_critical_while_others_are_busy():
+    scheduler = UrgencyPriorityScheduler(workers=2, reserved_workers=1)
+    gate = threading.Event()
+    scheduler.submit('low', gate.wait)
+    assert scheduler.run('critical', lambda: 'done', timeout=5) == 'done'
+    gate.set()
+    scheduler.shutdown()
+
+
+def test_full_level_rejects():
+    scheduler = UrgencyPriorityScheduler(workers=1, reserved_workers=0, max_queue=1)
+    gate = threading.Event()
+    started = threading.Event()
+    scheduler.submit('low', lambda: started.set() or gate.wait())
+    started.wait(5)
+    scheduler.submit('low', lambda: None)
+    try:
+        scheduler.submit('low', lambda: None)
+        assert False, "expected MatchingQueueFull"
+    except MatchingQueueFull:
+        pass
+    critical = scheduler.submit('critical', lambda: 1)
+    gate.set()
+    assert critical.result(timeout=5) == 1
+    scheduler.shutdown()
+    assert scheduler.stats()['levels']['low']['rejected'] == 1
+
+
+def test_timed_out_wait_drops_the_queued_job():
+    scheduler = UrgencyPriorityScheduler(workers=1, reserved_workers=0)
+    gate = threading.Event()
+    started = threading.Event()
+    ran = []
+    scheduler.submit('low', lambda: started.set() or gate.wait())
+    started.wait(5)
+    try:
+        scheduler.run('low', ran.append, 'late', timeout=0.05)
+        assert False, "expected a timeout"
+    except FutureTimeout:
+        pass
+    gate.set()
+    scheduler.shutdown()
+    assert ran == []
@@ -0,0 +1,61 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from app.ai_matching.reliability_recompute import ReliabilityRecomputer
+
+
+def test_recent_outcomes_outweigh_old_ones():
+    recomputer = ReliabilityRecomputer(half_life_days=30, prior_weight=1)
+    # helper 1 failed long ago and succeeds now; helper 2 the other way round
+    helpers, reliability = recomputer.compute(
+        np.array([1, 1, 2, 2]),
+        np.array([False, True, True, False]),
+        np.full(4, np.nan),
+        np.array([180.0, 1.0, 180.0, 1.0]),
+    )
+    score = dict(zip(helpers.tolist(), reliability.tolist()))
+    assert score[1] > 0.8 > 0.4 > score[2]
+
+
+def test_slow_responses_and_the_prior():
+    recomputer = ReliabilityRecomputer(prior=0.7, prior_weight=2)
+    helpers, reliability = recomputer.compute(
+        np.array([1, 2, 3, 3, 3]),
+        np.array([True, True, True, True, True]),
+        np.array([1.0, 48.0, 1.0, 1.0, 1.0]),
+        np.zeros(5),
+    )
+    score = dict(zip(helpers.tolist(), reliability.tolist()))
+    assert np.isclose(score[1], (1.4 + 1.0) / 3)
+    assert np.isclose(score[2], (1.4 + 0.8) / 3)
+    # more evidence moves further from the prior
+    assert score[3] > score[1]
+    assert recomputer.compute(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool), np.zeros(0), np.zeros(0))[0].size == 0
+
+
+def test_reliability_by_id_reads_the_recomputed_column(monkeypatch):
+    from flask import Flask
+    from app import db
+    from app.models import User
+    from app.services import request_dedup
+    from app.services.request_dedup import RequestDeduplicator
+    from app.ai_matching.db_integrated_matcher import DatabaseIntegratedMatcher
+
+    monkeypatch.setattr(request_dedup, 'request_deduplicator', RequestDeduplicator())
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://')
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            User(id=1, username='amal', email='amal@x', password_hash='x', reliability_score=0.93),
+            User(id=2, username='bilal', email='bilal@x', password_hash='x'),
+        ])
+        db.session.commit()
+        matcher = DatabaseIntegratedMatcher()
+        assert matcher.reliability_for_user(1) == 0.93
+        assert matcher.reliability_for_user(2) == 0.7
+        db.session.remove()
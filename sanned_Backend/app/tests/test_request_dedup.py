@@ -0,0 +1,90 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import random
+from app.utils.minhash import MinHashLSH
+from app.services.request_dedup import RequestDeduplicator, shingles
+
+INSULIN = ("My father is diabetic and we ran out of insulin three days ago, "
+           "we need someone with medicine near the hospital in Khan Yunis")
+WORDS = ['water', 'tent', 'blanket', 'flour', 'school', 'roof', 'generator', 'baby', 'milk', 'doctor', 'ride',
+         'phone', 'charger', 'clothes', 'shoes', 'cooking', 'gas', 'rice', 'books', 'wheelchair']
+
+
+def test_signature_agreement_tracks_jaccard():
+    lsh = MinHashLSH(num_perm=128, bands=32)
+    a = shingles(INSULIN)
+    b = shingles(INSULIN.replace('three', '3'))
+    exact = len(a & b) / len(a | b)
+    assert abs(lsh.similarity(lsh.signature(a), lsh.signature(b)) - exact) < 0.15
+    assert lsh.similarity(lsh.signature(a), lsh.signature(shingles('need a tent for five people'))) < 0.2
+
+
+def test_lsh_query_only_returns_colliding_keys():
+    rng = random.Random(3)
+    lsh = MinHashLSH(num_perm=64, bands=16)
+    for i in range(2000):
+        lsh.insert(i, lsh.signature(shingles(' '.join(rng.choice(WORDS) for _ in range(15)))))
+    lsh.insert('insulin', lsh.signature(shingles(INSULIN)))
+    found = lsh.query(lsh.signature(shingles(INSULIN + ' please')))
+    assert 'insulin' in found and len(found) < 50
+    lsh.remove('insulin')
+    assert 'insulin' not in lsh.query(lsh.signature(shingles(INSULIN)))
+
+
+def test_near_duplicates_point_at_the_original():
+    dedup = RequestDeduplicator()
+    dedup.add(1, INSULIN, 'service', user_id=10)
+    copy = INSULIN.replace('three', '3') + '!!'
+    assert dedup.find_duplicate(copy, 'service', user_id=20) == 1
+    # a duplicate of a duplicate points at the root
+    dedup.add(2, copy, 'service', user_id=20, duplicate_of=1)
+    assert dedup.root_of(2) == 1
+    assert dedup.find_duplicate(copy, 'service', user_id=30) == 1
+    # different type, or unrelated text
+    assert dedup.find_duplicate(copy, 'donation', user_id=20) is None
+    assert dedup.find_duplicate('we need a tent for five people near the school', 'service') is None
+
+
+def test_short_texts_only_collapse_for_the_same_user():
+    dedup = RequestDeduplicator()
+    dedup.add(1, 'bread for my family', 'donation', user_id=10)
+    assert dedup.find_duplicate('Bread for my family', 'donation', user_id=11) is None
+    assert dedup.find_duplicate('Bread for my family', 'donation', user_id=10) == 1
+    dedup.remove(1)
+    assert dedup.find_duplicate('Bread for my family', 'donation', user_id=10) is None
+
+
+def test_client_sent_ids_only_key_the_owners_own_text():
+    dedup = RequestDeduplicator()
+    dedup.add(1, INSULIN, 'service', user_id=10)
+    assert dedup.root_for(1, 10, INSULIN.replace('three', '3')) == 1
+    assert dedup.root_for(1, 11, INSULIN) is None
+    assert dedup.root_for(1, 10, 'we need a tent for five people near the school') is None
+    assert dedup.root_for(2, 10, INSULIN) is None
+
+
+def test_sync_picks_up_late_commits_and_is_throttled():
+    from datetime import datetime
+    from sqlalchemy import create_engine
+    from app.models import Request
+
+    engine = create_engine('sqlite://')
+    Request.__table__.create(engine)
+    dedup = RequestDeduplicator(sync_interval=60)
+
+    def insert(connection, request_id, description):
+        connection.execute(Request.__table__.insert().values(
+            id=request_id, user_id=10, type='service', description=description,
+            status='pending', created_at=datetime.utcnow()))
+
+    with engine.begin() as connection:
+        insert(connection, 5, 'we need a tent for five people near the school')
+        assert dedup.sync(connection) == 1
+        # id 3 committed after id 5 was read
+        insert(connection, 3, INSULIN)
+        assert dedup.sync(connection) == 0
+        dedup.sync(connection, force=True)
+    assert dedup.root_of(3) == 3 and dedup.root_of(5) == 5
@@ -0,0 +1,49 @@
+import sys
+import os
+import calendar
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from datetime import datetime, timedelta
+from app.ai_matching.request_pairing import RequestPairingEngine
+
+NOW = datetime(2026, 1, 10)
+
+
+def make_requests(engine, rows):
+    return [
+        engine.to_pending(i, user_id, type, description, location, NOW - timedelta(hours=i))
+        for i, (user_id, type, description, location) in enumerate(rows)
+    ]
+
+
+def pair(engine, requests):
+    a, b, scores = engine.candidate_pairs(requests, now=calendar.timegm(NOW.utctimetuple()))
+    return engine.select(a, b, scores, len(requests))
+
+
+def test_only_compatible_types_from_other_users_are_paired():
+    engine = RequestPairingEngine()
+    requests = make_requests(engine, [
+        (1, 'donation', 'medicine for a sick child', 'gaza_city'),
+        (2, 'service', 'need a doctor for treatment', 'gaza_city'),
+        (3, 'donation', 'spare medicine', 'gaza_city'),
+        (3, 'exchange', 'trade bread for a meal', 'rafah'),
+        (4, 'exchange', 'bread to exchange', 'rafah'),
+        (4, 'service', 'doctor needed', 'gaza_city'),
+    ])
+    selected = pair(engine, requests)
+    pairs = {frozenset((requests[i].type, requests[j].type)) for i, j, _ in selected}
+    assert pairs <= {frozenset(('donation', 'service')), frozenset(('exchange',))}
+    assert all(requests[i].user_id != requests[j].user_id for i, j, _ in selected)
+    assert {frozenset((i, j)) for i, j, _ in selected} >= {frozenset((3, 4))}
+
+
+def test_selection_never_reuses_a_request():
+    engine = RequestPairingEngine(window=10)
+    rows = [(i, 'donation' if i % 2 else 'service', 'medicine and food', 'khan_yunis') for i in range(400)]
+    requests = make_requests(engine, rows)
+    selected = pair(engine, requests)
+    used = [i for i, j, _ in selected] + [j for i, j, _ in selected]
+    assert len(used) == len(set(used))
+    assert len(selected) >= 190
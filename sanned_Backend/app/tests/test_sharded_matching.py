@@ -0,0 +1,78 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import contextlib
+import random
+from app.ai_matching import db_integrated_matcher
+from app.ai_matching.db_integrated_matcher import DatabaseIntegratedMatcher
+from app.ai_matching.candidates import GAZA_LOCATIONS, LOCATION_IDS, nearest_location
+
+SKILLS = ['doctor', 'nurse first aid', 'cooking bread', 'driver car', 'teacher', 'plumbing roof', '']
+
+
+def matcher_over(pool, monkeypatch, **settings):
+    """Matcher whose pool reads filter `pool` in memory like the SQL would, counting rows read"""
+    monkeypatch.setattr('app.utils.db_routing.read_session', contextlib.nullcontext)
+    matcher = DatabaseIntegratedMatcher()
+    for name, value in settings.items():
+        setattr(matcher, name, value)
+
+    def load(session, exclude_user_id=None, user_ids=None, location=None, shards=None):
+        return matcher._filter_pool(pool, exclude_user_id, user_ids, location, shards)
+
+    matcher._load_candidate_pool = load
+    return matcher
+
+
+def make_pool(size=400, seed=7):
+    rng = random.Random(seed)
+    return db_integrated_matcher.CandidatePool.from_dicts([
+        {'id': i, 'location': rng.choice(list(GAZA_LOCATIONS)), 'skills': rng.choice(SKILLS),
+         'reliability_score': round(rng.uniform(0.3, 1.0), 3), 'avg_response_time': rng.uniform(1, 24)}
+        for i in range(1, size + 1)
+    ])
+
+
+def test_shard_rings_start_with_the_neighbourhood():
+    matcher = DatabaseIntegratedMatcher()
+    rings, similarity = matcher.shard_rings('rafah')
+    assert rings[0] == [LOCATION_IDS['rafah'], LOCATION_IDS['khan_yunis']]
+    assert sorted(sum(rings, [])) == sorted(LOCATION_IDS.values())
+    assert [similarity[ring[0]] for ring in rings] == sorted((similarity[ring[0]] for ring in rings), reverse=True)
+    assert nearest_location(31.29, 34.24) == 'rafah'
+
+
+def test_bound_stop_returns_the_full_scan_top_k(monkeypatch):
+    pool = make_pool()
+    request = {'description': 'my son is sick, we need a doctor', 'location': 'rafah'}
+    full = matcher_over(pool, monkeypatch, sharded=False).find_matches_for_request_from_db(dict(request), 5)
+    sharded = matcher_over(pool, monkeypatch, shard_good_score=float('inf'))
+    result = sharded.find_matches_for_request_from_db(dict(request), 5)
+
+    assert [m['user_id'] for m in result['matches']] == [m['user_id'] for m in full['matches']]
+    assert [m['match_score'] for m in result['matches']] == [m['match_score'] for m in full['matches']]
+    assert 5 not in [m['user_id'] for m in result['matches']]
+
+
+def test_good_matches_nearby_stop_the_expansion(monkeypatch):
+    pool = make_pool()
+    matcher = matcher_over(pool, monkeypatch, shard_good_score=0.6)
+    result = matcher.find_matches_for_request_from_db({'description': 'need a doctor', 'location': 'gaza_city'})
+    assert result['success'] and len(result['matches']) == 5
+    stats = matcher.shard_stats
+    assert stats['quality_stops'] + stats['bound_stops'] == 1
+    assert stats['candidates_scanned'] < len(pool)
+    assert matcher.pool_size_estimate() == stats['candidates_scanned']
+
+
+def test_semantic_query_with_no_known_terms_scans_the_full_pool(monkeypatch):
+    from app.ai_matching.skill_embeddings import SemanticSkillEngine
+    pool = make_pool()
+    engine = SemanticSkillEngine(dim=8).fit({i: [pool.skills[i - 1]] for i in range(1, 6)})
+    assert engine.search('zxqv plorb', k=50) == []
+    matcher = matcher_over(pool, monkeypatch, sharded=False, semantic_engine=engine, _semantic_indexed=True)
+    result = matcher.find_matches_for_request_from_db(
+        {'description': 'zxqv plorb', 'location': 'rafah', 'skill_scorer': 'semantic'}, 5)
+    assert result['success'] and matcher.last_scanned == len(pool) - 1
@@ -0,0 +1,80 @@
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.ai_matching.skill_embeddings import IVFIndex, SemanticSkillEngine, SkillEmbeddings
+
+
+USER_SKILLS = {
+    1: ['doctor', 'nursing', 'first aid'],
+    2: ['nursing', 'first aid', 'pharmacy'],
+    3: ['teaching', 'tutoring'],
+    4: ['tutoring', 'childcare'],
+    5: ['car', 'delivery'],
+}
+
+KEYWORD_GROUPS = {
+    'medical': ['doctor', 'medicine', 'nursing'],
+    'education': ['teaching', 'school'],
+}
+
+
+def test_related_skills_are_closer_than_unrelated():
+    embeddings = SkillEmbeddings.fit(list(USER_SKILLS.values()) + [[k] + v for k, v in KEYWORD_GROUPS.items()])
+    medical = embeddings.embed_text('medical')
+    assert embeddings.embed_text('doctor') @ medical > embeddings.embed_text('tutoring') @ medical
+
+
+def test_embeddings_round_trip_as_float16_memmap(tmp_path):
+    embeddings = SkillEmbeddings.fit(USER_SKILLS.values(), dim=4)
+    embeddings.save(str(tmp_path / 'skills'))
+    loaded = SkillEmbeddings.load(str(tmp_path / 'skills'))
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.vectors.dtype == np.float16
+    assert loaded.vocabulary == embeddings.vocabulary
+
+
+def test_ivf_search_matches_brute_force_when_probing_all_lists():
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(500, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = IVFIndex(nlist=20).build(list(range(500)), vectors)
+    query = vectors[42]
+    result = index.search(query, k=5, nprobe=20)
+    expected = np.argsort(-(vectors @ query))[:5]
+    assert [user_id for user_id, _ in result] == expected.tolist()
+
+
+def test_engine_ranks_medical_helpers_first():
+    engine = SemanticSkillEngine(dim=8).fit(USER_SKILLS, keyword_groups=KEYWORD_GROUPS)
+    top_ids = [user_id for user_id, _ in engine.search('medical doctor needed', k=2, nprobe=10)]
+    assert set(top_ids) == {1, 2}
+
+
+def test_matcher_indexes_helpers_with_saved_embeddings_instead_of_refitting(tmp_path, monkeypatch):
+    import contextlib
+    from app.utils import db_routing
+    from app.ai_matching.db_integrated_matcher import DatabaseIntegratedMatcher
+
+    class Rows:
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: self
+
+        def all(self):
+            return [(user_id, skill) for user_id, skills in USER_SKILLS.items() for skill in skills]
+
+    path = str(tmp_path / 'skills')
+    SemanticSkillEngine(dim=8).fit(USER_SKILLS, KEYWORD_GROUPS).save(path)
+    monkeypatch.setenv('SKILL_EMBEDDINGS_PATH', path)
+    monkeypatch.setattr(db_routing, 'read_session', lambda: contextlib.nullcontext(Rows()))
+    monkeypatch.setattr(SemanticSkillEngine, 'fit', lambda *args, **kwargs: pytest.fail('refitted'))
+    matcher = DatabaseIntegratedMatcher()
+    matcher.semantic_engine = SemanticSkillEngine(dim=8)
+    matcher._load_saved_embeddings()
+    assert isinstance(matcher.semantic_engine.embeddings.vectors, np.memmap)
+    assert matcher.build_semantic_index() and matcher.build_semantic_index()
+    assert matcher.semantic_engine.search('nursing', k=2)[0][0] in (1, 2)
@@ -0,0 +1,52 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from app.ai_matching.skill_registry import SkillRegistry
+from app.ai_matching.automated_ai_matcher import AutomatedAIMatcher
+from app.ai_matching.candidates import CandidatePool
+
+
+def test_skills_share_codes_with_their_categories_and_ids():
+    registry = SkillRegistry()
+    doctor = registry.register_skill('skill-1', 'Pediatric Doctor')
+    first_aid = registry.register_skill('skill-2', 'First Aid')
+
+    assert registry.lookup('medical') in doctor
+    assert registry.lookup('skill-1') == registry.lookup('pediatric doctor')
+    assert registry.lookup('first_aid') in first_aid
+    assert registry.lookup('bread') == registry.lookup('food')
+    assert registry.lookup('unheard of') is None
+    # codes are stable once handed out
+    registry.register_skill('skill-3', 'Plumbing')
+    assert registry.register_skill('skill-1', 'Pediatric Doctor') == doctor
+
+
+def test_query_codes_and_cosine_against_a_pool():
+    registry = SkillRegistry()
+    registry.register_skill('skill-1', 'first aid')
+    pool = CandidatePool.from_dicts([
+        {'id': 1, 'skills': 'medical doctor'},
+        {'id': 2, 'skills': 'cooking'},
+        {'id': 3, 'skills': ''},
+    ])
+    query = registry.encode_query('medical', 'someone who knows first aid')
+    assert set(query.tolist()) == {registry.lookup('medical'), registry.lookup('first_aid')}
+
+    sims = registry.similarities(query, pool.skill_matrix(registry))
+    assert sims[0] > 0 and sims[1] == 0 and sims[2] == 0
+    # 'cooking' is its own code plus food
+    assert np.isclose(registry.similarities(registry.encode_query('food'), pool.skill_matrix(registry))[1], 0.5 ** 0.5)
+
+
+def test_registry_scorer_ranks_the_skill_match_first():
+    matcher = AutomatedAIMatcher()
+    pool = CandidatePool.from_dicts([
+        {'id': 1, 'location': 'gaza_city', 'skills': 'cooking'},
+        {'id': 2, 'location': 'gaza_city', 'skills': 'doctor'},
+    ], matcher.auto_get_user_reliability)
+    matches = matcher.auto_match({'description': 'my son is sick', 'location': 'gaza_city'}, pool, explain=True)
+    assert matches[0][0] == 2
+    assert matches[0][2]['skill_scorer'] == 'registry'
@@ -0,0 +1,57 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import pytest
+from flask import Flask
+from app import db
+from app.models import User, Request
+from app.models.sponsorship import Sponsorship
+from app.services import request_dedup
+from app.services.request_dedup import RequestDeduplicator
+from app.services.payment_service import PaymentService
+from app.controllers.sponsorship_controller import SponsorshipController
+
+URLS = {'return_url': 'https://app/ok', 'cancel_url': 'https://app/cancel'}
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(request_dedup, 'request_deduplicator', RequestDeduplicator())
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://')
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, username='amal', email='amal@x', password_hash='x'))
+        db.session.flush()
+        db.session.add(Request(id=1, user_id=1, type='service', description='need a ride'))
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+
+def test_checkout_is_called_with_the_pending_row_committed_and_no_transaction_open(app, monkeypatch):
+    def create_payment_link(sponsorship_id, **kwargs):
+        assert not db.session().in_transaction()
+        assert db.session.get(Sponsorship, sponsorship_id).status == 'pending'
+        db.session.rollback()
+        return {'checkout_id': 'chk_1', 'checkout_url': 'https://pay/chk_1'}
+
+    monkeypatch.setattr(PaymentService, 'create_payment_link', staticmethod(create_payment_link))
+    body, status = SponsorshipController.init_sponsorship(1, 1, {'amount': 25, **URLS})
+    assert status == 201 and body['checkout_url'] == 'https://pay/chk_1'
+    db.session.expire_all()
+    sponsorship = db.session.get(Sponsorship, body['sponsorship_id'])
+    assert (sponsorship.status, sponsorship.checkout_id) == ('reserved', 'chk_1')
+
+
+def test_failed_checkout_marks_the_row_failed(app, monkeypatch):
+    def create_payment_link(**kwargs):
+        raise ConnectionError('checkout down')
+
+    monkeypatch.setattr(PaymentService, 'create_payment_link', staticmethod(create_payment_link))
+    body, status = SponsorshipController.init_sponsorship(1, 1, {'amount': 25, **URLS})
+    assert status == 500
+    assert Sponsorship.query.one().status == 'failed'
@@ -0,0 +1,135 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from app import db
+from app.models import User, Request, Match, Skill, UserSkills, SyncTombstone, HelperAssignment
+from app.services import request_dedup
+from app.services.request_dedup import RequestDeduplicator
+from app.services.sync_service import SyncService, SyncConflict, to_ms
+from app.services.user_cache import user_identity_cache
+from app.controllers.sync_controller import SyncController
+
+T0 = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(request_dedup, 'request_deduplicator', RequestDeduplicator())
+    user_identity_cache.clear()
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://', SYNC_CLOCK_SKEW=10)
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            User(id=1, username='amal', email='amal@x', password_hash='x', is_in_gaza=True),
+            User(id=2, username='bilal', email='bilal@x', password_hash='x', is_in_gaza=True),
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+
+def add_request(user_id, description, created_at=T0, updated_at=None):
+    row = Request(user_id=user_id, type='service', description=description, location='rafah',
+                  created_at=created_at, updated_at=updated_at or created_at)
+    db.session.add(row)
+    db.session.commit()
+    return row
+
+
+def test_pull_splits_created_updated_and_deleted(app):
+    old = add_request(1, 'need water for the family', T0, T0 + timedelta(hours=2))
+    new = add_request(2, 'looking for a teacher', T0 + timedelta(hours=2))
+    add_request(2, 'roof repair', T0, T0)
+    gone = add_request(1, 'tent needed', T0)
+    db.session.delete(gone)
+    db.session.add_all([
+        SyncTombstone(table_name='user_skills', row_id='mine', user_id=1, deleted_at=T0 + timedelta(hours=2)),
+        SyncTombstone(table_name='user_skills', row_id='theirs', user_id=2, deleted_at=T0 + timedelta(hours=2)),
+        SyncTombstone(table_name='requests', row_id='before', deleted_at=T0),
+    ])
+    db.session.commit()
+
+    changes = SyncService.pull(1, to_ms(T0 + timedelta(hours=1)))['changes']
+    assert [r['id'] for r in changes['requests']['created']] == [str(new.id)]
+    assert [r['id'] for r in changes['requests']['updated']] == [str(old.id)]
+    assert changes['requests']['deleted'] == [str(gone.id)]
+    assert changes['user_skills']['deleted'] == ['mine']
+
+    first = SyncService.pull(1)['changes']
+    assert len(first['requests']['created']) == 3 and first['requests']['deleted'] == []
+
+
+def test_push_maps_client_ids_and_collapses_repeated_skills(app):
+    user = db.session.get(User, 1)
+    id_map = SyncService.push(user, {
+        'requests': {'created': [{'id': 'local-1', 'type': 'donation', 'description': 'spare blankets'}]},
+        'user_skills': {'created': [{'id': 'a', 'skill': 'Nurse'}, {'id': 'b', 'skill': ' nurse'}]},
+    }, None)
+    created = Request.query.one()
+    assert id_map['requests'] == {'local-1': str(created.id)}
+    assert id_map['user_skills']['a'] == id_map['user_skills']['b'] == UserSkills.query.one().id
+    assert Skill.query.one().name == 'nurse'
+
+    with pytest.raises(ValueError, match='need a skill name'):
+        SyncService.push(user, {'user_skills': {'created': [{'id': 'c', 'skill': '  '}]}}, None)
+
+
+def test_push_rejects_stale_and_foreign_rows(app):
+    mine = add_request(1, 'need insulin', T0, T0 + timedelta(hours=2))
+    theirs = add_request(2, 'need a ride', T0)
+    last_pulled = to_ms(T0 + timedelta(hours=1))
+
+    body, status = SyncController.push(1, {'changes': {'requests': {'updated': [{'id': str(mine.id), 'status': 'completed'}]}},
+                                           'lastPulledAt': last_pulled}, {})
+    assert status == 409 and not body['success']
+    body, status = SyncController.push(1, {'changes': {'requests': {'deleted': [str(theirs.id)]}},
+                                           'lastPulledAt': last_pulled}, {})
+    assert status == 403
+    assert db.session.get(Request, mine.id).status == 'pending'
+    assert db.session.get(Request, theirs.id) is not None
+
+
+def test_deleting_a_matched_request_removes_its_matches(app):
+    mine = add_request(1, 'spare flour to give', T0)
+    theirs = add_request(2, 'family needs flour', T0)
+    match = Match(request_a_id=mine.id, request_b_id=theirs.id, created_at=T0, updated_at=T0)
+    db.session.add_all([match, HelperAssignment(request_id=mine.id, helper_id=2, score=0.9)])
+    db.session.commit()
+    match_id = match.id
+
+    body, status = SyncController.push(1, {'changes': {'requests': {'deleted': [str(mine.id)]}},
+                                           'lastPulledAt': to_ms(T0 + timedelta(hours=1))}, {})
+    assert status == 200, body
+    assert Match.query.count() == 0 and HelperAssignment.query.count() == 0
+    deleted = SyncService.pull(2, to_ms(T0 + timedelta(hours=1)))['changes']
+    assert deleted['matches']['deleted'] == [str(match_id)]
+    assert deleted['requests']['deleted'] == [str(mine.id)]
+
+
+def test_first_pull_sends_own_and_open_requests_in_pages(app):
+    mine_done = add_request(1, 'blankets delivered', T0)
+    mine_done.status = 'completed'
+    theirs_done = add_request(2, 'roof fixed', T0)
+    theirs_done.status = 'rejected'
+    db.session.commit()
+    open_ids = [str(add_request(2, f'need help number {i}', T0 + timedelta(minutes=i)).id) for i in range(5)]
+
+    pages, cursor = [], None
+    while True:
+        page = SyncService.pull(1, cursor=cursor, page_size=2)
+        pages.append(page)
+        cursor = page['next_cursor']
+        if not page['has_more']:
+            break
+    sent = [r['id'] for page in pages for r in page['changes']['requests']['created']]
+    assert sorted(sent) == sorted(open_ids + [str(mine_done.id)])
+    assert len(pages) == 3 and len({page['timestamp'] for page in pages}) == 1
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        SyncService.pull(1, cursor='nope')
@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import deque
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling through while the breaker is open"""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Count-based circuit breaker with failure-rate and slow-call-rate thresholds.
+
+    The outcomes of the last `window_size` calls are kept. Once at least `min_calls` have been
+    seen, the breaker opens when the share of failures reaches `failure_rate` or the share of
+    calls slower than `slow_call_seconds` reaches `slow_call_rate`. While open every call fails
+    at once with CircuitOpenError; after `open_seconds` up to `half_open_calls` probes are let
+    through. Any failed or slow probe reopens the breaker, all of them succeeding closes it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, name, failure_rate=0.5, slow_call_rate=0.5, slow_call_seconds=2.0, window_size=20,
+                 min_calls=10, open_seconds=30.0, half_open_calls=3, clock=time.monotonic):
+        self.name = name
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.configure(failure_rate, slow_call_rate, slow_call_seconds, window_size, min_calls,
+                       open_seconds, half_open_calls)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def configure(self, failure_rate=None, slow_call_rate=None, slow_call_seconds=None, window_size=None,
+                  min_calls=None, open_seconds=None, half_open_calls=None):
+        with self._lock:
+            if failure_rate is not None:
+                self.failure_rate = failure_rate
+            if slow_call_rate is not None:
+                self.slow_call_rate = slow_call_rate
+            if slow_call_seconds is not None:
+                self.slow_call_seconds = slow_call_seconds
+            if window_size is not None:
+                self._window = deque(getattr(self, '_window', ()), maxlen=max(1, int(window_size)))
+            if min_calls is not None:
+                self.min_calls = max(1, int(min_calls))
+            if open_seconds is not None:
+                self.open_seconds = open_seconds
+            if half_open_calls is not None:
+                self.half_open_calls = max(1, int(half_open_calls))
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._state, self._probes, self._probe_successes = self.HALF_OPEN, 0, 0
+        return self._state
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = self.clock()
+        self._window.clear()
+        self.times_opened += 1
+
+    def allow(self):
+        """Reserve a call; raises CircuitOpenError when the call must not go through"""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return
+            self.rejected += 1
+            retry_after = max(0.0, self.open_seconds - (self.clock() - self._opened_at)) if state == self.OPEN else 1.0
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record(self, duration, ok):
+        """Outcome of a call that allow() let through"""
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            self.calls += 1
+            self.failures += not ok
+            self.slow_calls += slow
+            if self._state == self.HALF_OPEN:
+                if not ok or slow:
+                    self._open()
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_calls:
+                        self._state = self.CLOSED
+                return
+            if self._state != self.CLOSED:
+                return
+            self._window.append((ok, slow))
+            if len(self._window) < self.min_calls:
+                return
+            failed = sum(1 for call_ok, _ in self._window if not call_ok) / len(self._window)
+            slowed = sum(1 for _, call_slow in self._window if call_slow) / len(self._window)
+            if failed >= self.failure_rate or slowed >= self.slow_call_rate:
+                self._open()
+
+    def call(self, fn, *args, **kwargs):
+        self.allow()
+        start = self.clock()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record(self.clock() - start, False)
+            raise
+        self.record(self.clock() - start, True)
+        return result
+
+    def stats(self):
+        with self._lock:
+            state = self._current_state()
+            window = list(self._window)
+        return {
+            'state': state,
+            'calls': self.calls,
+            'failures': self.failures,
+            'slow_calls': self.slow_calls,
+            'rejected': self.rejected,
+            'times_opened': self.times_opened,
+            'window_calls': len(window),
+            'window_failure_rate': round(sum(1 for ok, _ in window if not ok) / len(window), 3) if window else 0.0,
+            'window_slow_rate': round(sum(1 for _, slow in window if slow) / len(window), 3) if window else 0.0,
+        }
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+REPLICA_BIND = 'replica'
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait to check a connection out"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait_lock = threading.Lock()
+        self._recent_waits = deque(maxlen=1000)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._wait_lock:
+                self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._wait_lock:
+                self.checkouts += 1
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+                self._recent_waits.append(waited)
+
+    def recreate(self):
+        # pre-ping / invalidation recreates the pool; keep the counters on the new one
+        new_pool = super().recreate()
+        new_pool.checkouts, new_pool.total_wait, new_pool.max_wait = self.checkouts, self.total_wait, self.max_wait
+        new_pool.checkout_timeouts = self.checkout_timeouts
+        return new_pool
+
+    def wait_stats(self):
+        with self._wait_lock:
+            recent = sorted(self._recent_waits)
+            checkouts, total, worst, timeouts = self.checkouts, self.total_wait, self.max_wait, self.checkout_timeouts
+
+        def percentile(p):
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))] * 1000, 3) if recent else 0.0
+
+        return {
+            'checkouts': checkouts,
+            'checkout_timeouts': timeouts,
+            'avg_wait_ms': round(total / checkouts * 1000, 3) if checkouts else 0.0,
+            'p95_wait_ms': percentile(0.95),
+            'p99_wait_ms': percentile(0.99),
+            'max_wait_ms': round(worst * 1000, 3),
+            'size': self.size(),
+            'checked_out': self.checkedout(),
+            'overflow': self.overflow(),
+        }
+
+
+def build_engine_options(uri):
+    """Engine/pool options from the DB_POOL_* environment; pool sizing only applies to server databases"""
+    options = {
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),
+    }
+    if uri and not uri.startswith('sqlite'):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=int(os.getenv('DB_POOL_SIZE', '10')),
+            max_overflow=int(os.getenv('DB_MAX_OVERFLOW', '20')),
+            pool_timeout=float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        )
+    return options
+
+
+def build_binds(replica_uri):
+    if not replica_uri:
+        return {}
+    return {REPLICA_BIND: {'url': replica_uri, **build_engine_options(replica_uri)}}
+
+
+@contextmanager
+def read_session():
+    """Session for read-only queries: the replica bind if configured, otherwise the primary session"""
+    from app import db
+    engine = db.engines.get(REPLICA_BIND)
+    if engine is None:
+        yield db.session
+        return
+    session = Session(bind=engine, autoflush=False)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def pool_metrics():
+    from app import db
+    metrics = {}
+    for name, engine in db.engines.items():
+        pool = engine.pool
+        label = name or 'primary'
+        if isinstance(pool, InstrumentedQueuePool):
+            metrics[label] = pool.wait_stats()
+        else:
+            metrics[label] = {'pool': type(pool).__name__, 'status': pool.status()}
+    return metrics
@@ -0,0 +1,26 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_sources = {}
+_lock = threading.Lock()
+
+
+def register_metrics_source(name, collect):
+    """Register a zero-argument callable returning a JSON-serializable dict of metrics"""
+    with _lock:
+        _sources[name] = collect
+
+
+def collect_metrics():
+    with _lock:
+        sources = dict(_sources)
+    snapshot = {}
+    for name, collect in sources.items():
+        try:
+            snapshot[name] = collect()
+        except Exception as e:
+            logger.warning("Metrics source %s failed: %s", name, e)
+            snapshot[name] = {'error': str(e)}
+    return snapshot
@@ -0,0 +1,82 @@
+import threading
+import zlib
+import numpy as np
+
+# hash values are taken mod this prime, so (a * x + b) never overflows uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+class MinHashLSH:
+    """
+    MinHash signatures of shingle sets with a banded locality-sensitive hash index.
+
+    A signature holds, per random permutation (a * x + b) mod p, the smallest permuted hash
+    of the set's shingles; the share of positions where two signatures agree estimates the
+    Jaccard similarity of the sets. Signatures are cut into `bands` bands and each band is a
+    bucket key, so a query only compares against keys sharing a bucket with it: pairs with
+    similarity s collide with probability 1 - (1 - s ** rows) ** bands, whatever the size
+    of the index.
+    """
+
+    def __init__(self, num_perm=64, bands=16, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_PRIME), size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, int(_PRIME), size=num_perm).astype(np.uint64)
+        self._buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+        self._lock = threading.Lock()
+
+    def signature(self, shingles):
+        """uint32 signature of a set of strings; all-max for the empty set"""
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64)
+        if not len(hashes):
+            return np.full(self.num_perm, int(_PRIME), dtype=np.uint32)
+        permuted = (np.outer(hashes % _PRIME, self._a) + self._b) % _PRIME
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def insert(self, key, signature):
+        with self._lock:
+            if key in self.signatures:
+                return
+            self.signatures[key] = signature
+            for bucket, band in zip(self._buckets, self._band_keys(signature)):
+                bucket.setdefault(band, set()).add(key)
+
+    def remove(self, key):
+        with self._lock:
+            signature = self.signatures.pop(key, None)
+            if signature is None:
+                return
+            for bucket, band in zip(self._buckets, self._band_keys(signature)):
+                keys = bucket.get(band)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del bucket[band]
+
+    def query(self, signature):
+        """Keys sharing at least one band with the signature"""
+        found = set()
+        with self._lock:
+            for bucket, band in zip(self._buckets, self._band_keys(signature)):
+                found.update(bucket.get(band, ()))
+        return found
+
+    @staticmethod
+    def similarity(a, b):
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.count_nonzero(a == b)) / len(a)
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def __contains__(self, key):
+        return key in self.signatures
@@ -0,0 +1,60 @@
+"""Per-call logging cost on the calling thread, direct handler vs queue mode.
+
+Usage:
+    python benchmarks/bench_logging.py --messages 50000 --threads 4
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.logging_config import logging_setup
+
+
+def hammer(logger, messages, threads):
+    payload = {'user_id': 42, 'successful': True, 'response_time': 1.5}
+
+    def work(_):
+        for i in range(messages // threads):
+            logger.info("Auto-learned from outcome %d: %s", i, payload)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(work, range(threads)))
+    return (time.perf_counter() - start) / messages * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    sink = open(os.devnull, 'w')
+    logger = logging.getLogger('app.ai_matching.outcomes')
+    root = logging.getLogger()
+
+    direct = logging.StreamHandler(sink)
+    direct.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(name)s] %(message)s'))
+    root.handlers[:] = [direct]
+    root.setLevel(logging.INFO)
+    print(f"{'mode':<22} {'us/call':>8}")
+    print(f"{'direct stream':<22} {hammer(logger, args.messages, args.threads):>8.2f}")
+
+    for label, fmt, rates in (
+        ('queue text', 'text', {}),
+        ('queue json', 'json', {}),
+        ('queue json, 10% sample', 'json', {'app.ai_matching.outcomes': 0.1}),
+    ):
+        logging_setup.configure(fmt=fmt, sample_rates=rates, queue_size=args.messages, stream=sink)
+        cost = hammer(logger, args.messages, args.threads)
+        logging_setup.shutdown()
+        print(f"{label:<22} {cost:>8.2f}   {logging_setup.stats()}")
+
+
+if __name__ == "__main__":
+    main()
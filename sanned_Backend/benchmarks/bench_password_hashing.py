@@ -0,0 +1,56 @@
+"""Logins/sec per core for different bcrypt cost factors.
+
+Usage:
+    python benchmarks/bench_password_hashing.py --rounds 10 11 12 --seconds 3
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+for name in ("SECRET_KEY", "JWT_SECRET_KEY"):
+    os.environ.setdefault(name, "bench")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.services.security_service import PasswordHasher
+
+
+def bench_rounds(rounds, workers, seconds):
+    hasher = PasswordHasher(rounds=rounds, workers=workers, max_pending=workers * 4, wait_timeout=60)
+    hashed = hasher.hash("correct horse battery staple")
+
+    def login_loop(deadline):
+        done = 0
+        while time.perf_counter() < deadline:
+            hasher.check(hashed, "correct horse battery staple")
+            done += 1
+        return done
+
+    start = time.perf_counter()
+    deadline = start + seconds
+    with ThreadPoolExecutor(max_workers=workers) as clients:
+        total = sum(clients.map(login_loop, [deadline] * workers))
+    elapsed = time.perf_counter() - start
+    return total / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"workers={args.workers} seconds/round={args.seconds}")
+    print(f"{'rounds':>6} {'logins/s':>10} {'logins/s/core':>14} {'ms/login':>9}")
+    for rounds in args.rounds:
+        rate = bench_rounds(rounds, args.workers, args.seconds)
+        per_core = rate / args.workers
+        print(f"{rounds:>6} {rate:>10.1f} {per_core:>14.1f} {1000 / per_core:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Payment-link throughput against the local Checkout stub.
+
+Compares the pooled PaymentClient with a bare requests.post per call
+(the previous behaviour), and reports how many TCP connections each
+opened.
+
+Usage:
+    python benchmarks/bench_sponsorship_payments.py --requests 2000 --concurrency 8 --latency-ms 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from checkout_stub import CheckoutStub
+
+
+def run(label, stub, call, total, concurrency):
+    before = stub.connections
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, range(total)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {total / elapsed:>9.1f} req/s  connections={stub.connections - before}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    stub = CheckoutStub(latency_ms=args.latency_ms).start_in_thread()
+    os.environ["CHECKOUT_API_BASE"] = stub.base_url
+    os.environ["CHECKOUT_SECRET_KEY"] = "sk_test_stub"
+    os.environ.setdefault("CHECKOUT_POOL_SIZE", str(args.concurrency))
+    from app.services.payment_service import PaymentService, payment_client
+
+    def pooled(i):
+        PaymentService.create_payment_link(i, 10.0, "USD", "https://x.test/ok", "https://x.test/cancel", {"request_id": str(i)})
+
+    def unpooled(i):
+        resp = requests.post(
+            stub.base_url + "payment-links",
+            json={"amount": 1000, "currency": "USD", "reference": f"sponsorship_{i}"},
+            headers={"Authorization": "Bearer sk_test_stub"},
+            timeout=15
+        )
+        resp.raise_for_status()
+
+    async def run_async():
+        before = stub.connections
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            PaymentService.create_payment_link_async(i, 10.0, "USD", "https://x.test/ok", "https://x.test/cancel")
+            for i in range(args.requests)
+        ))
+        elapsed = time.perf_counter() - start
+        print(f"{'pooled-async':<14} {args.requests / elapsed:>9.1f} req/s  connections={stub.connections - before}")
+
+    print(f"requests={args.requests} concurrency={args.concurrency} stub latency={args.latency_ms}ms")
+    run("bare-post", stub, unpooled, args.requests, args.concurrency)
+    run("pooled", stub, pooled, args.requests, args.concurrency)
+    asyncio.run(run_async())
+    print("client metrics:", payment_client.metrics())
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
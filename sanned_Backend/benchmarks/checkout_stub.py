@@ -0,0 +1,104 @@
+"""Local stand-in for the Checkout payment-links API.
+
+Answers POST /payment-links with the same shape as the real API, over
+HTTP/1.1 keep-alive, so sponsorship flows can be exercised offline.
+
+Usage:
+    python benchmarks/checkout_stub.py --port 8099 --latency-ms 40
+    CHECKOUT_API_BASE=http://127.0.0.1:8099/ CHECKOUT_SECRET_KEY=sk_test flask run
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class CheckoutStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body as one segment; otherwise Nagle + delayed ACK stalls keep-alive clients
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        with self.server.lock:
+            self.server.requests += 1
+
+        if self.path.rstrip("/") != "/payment-links":
+            return self._reply(404, {"error_type": "not_found"})
+        if not (self.headers.get("Authorization") or "").startswith("Bearer "):
+            return self._reply(401, {"error_type": "unauthorized"})
+        try:
+            payload = json.loads(raw or b"{}")
+        except ValueError:
+            return self._reply(422, {"error_type": "request_invalid"})
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        link_id = f"pl_{uuid.uuid4().hex[:24]}"
+        self._reply(201, {
+            "id": link_id,
+            "reference": payload.get("reference"),
+            "expires_on": "2099-01-01T00:00:00Z",
+            "_links": {
+                "self": {"href": f"http://{self.server.server_address[0]}:{self.server.server_address[1]}/payment-links/{link_id}"},
+                "redirect": {"href": f"https://pay.example.test/link/{link_id}"}
+            }
+        })
+
+
+class CheckoutStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0):
+        super().__init__((host, port), CheckoutStubHandler)
+        self.latency = latency_ms / 1000.0
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start_in_thread(self):
+        threading.Thread(target=self.serve_forever, name="checkout-stub", daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+    stub = CheckoutStub(args.host, args.port, args.latency_ms)
+    print(f"Checkout stub listening on {stub.base_url}")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
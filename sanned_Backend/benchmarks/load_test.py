@@ -0,0 +1,341 @@
+"""Offline HTTP load test of the API with per-endpoint latency percentiles.
+
+Starts the app from create_app on a local HTTP server, seeds a SQLite file
+(or the database in --database-url) with synthetic users, skills, requests
+and outcomes, and drives a weighted mix of login, request feed/create,
+find-matches, search-helpers and record-outcome from concurrent clients
+that each keep a logged-in session. Everything runs on 127.0.0.1.
+
+Usage:
+    python benchmarks/load_test.py --concurrency 8 --duration 30
+    python benchmarks/load_test.py --sweep 1 2 4 8 16 32 --duration 15
+    python benchmarks/load_test.py --mix find_matches=1 --users 20000 --json report.json
+    python benchmarks/load_test.py --database-url postgresql://localhost/sanned_load
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import numpy as np
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+PASSWORD = "load-test-password"
+DEFAULT_MIX = "login=3,list_requests=30,create_request=5,find_matches=20,search_helpers=27,record_outcome=15"
+LOCATIONS = ('gaza_city', 'khan_yunis', 'rafah', 'deir_al_balah', 'jabalya', 'beit_lahia', 'beit_hanoun')
+EXTRA_SKILLS = ('nurse', 'first aid', 'plumbing', 'electrician', 'carpentry', 'translation', 'driving',
+                'tutoring', 'baking', 'counseling', 'pharmacy', 'water delivery', 'solar repair', 'sewing')
+DESCRIPTIONS = (
+    'my child is sick and needs a doctor urgently',
+    'family needs bread and a hot meal today',
+    'need a ride to the hospital for treatment',
+    'roof of our house was damaged, need shelter',
+    'students need a teacher and school books',
+    'phone and internet repair needed when possible',
+    'help with documents and legal paperwork',
+    'baby needs childcare while parents work',
+)
+
+
+def configure_environment(args):
+    """Settings the app reads at import time; no outbound network, quiet logs"""
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SECRET_KEY", "load-test")
+    os.environ.setdefault("JWT_SECRET_KEY", "load-test-jwt-secret-key-0123456789abcdef")
+    os.environ["BCRYPT_LOG_ROUNDS"] = str(args.bcrypt_rounds)
+    os.environ["WEBHOOK_CONSUMER_ENABLED"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    os.environ.pop("ABSTRACT_API_KEY", None)
+    os.environ.pop("REPLICA_DATABASE_URL", None)
+
+
+def seed(app, args):
+    """Synthetic users (all in Gaza), skills, pending requests and outcomes; skipped if already seeded"""
+    from app import db
+    from app.models import User, Skill, UserSkills, Request, MatchOutcome
+    from app.services.security_service import SecurityService
+    from app.services.candidate_view import CandidateView
+    from app.ai_matching.skill_registry import SKILL_CATEGORIES
+    from app.ai_matching.reliability_recompute import reliability_recomputer
+
+    rng = random.Random(args.seed)
+    with app.app_context():
+        db.create_all()
+        if db.session.query(User.id).count() >= args.users:
+            print(f"database already seeded ({db.session.query(User.id).count()} users)")
+            return
+
+        start = time.perf_counter()
+        # one hash for everybody: seeding must not pay bcrypt per user
+        password_hash = SecurityService.hash_password(PASSWORD)
+        now = datetime.utcnow()
+
+        names = list(SKILL_CATEGORIES) + [k for keywords in SKILL_CATEGORIES.values() for k in keywords] + list(EXTRA_SKILLS)
+        skills = [{'id': f"skill-{i}", 'name': name} for i, name in enumerate(dict.fromkeys(names))]
+        db.session.execute(db.insert(Skill), skills)
+
+        db.session.execute(db.insert(User), [{
+            'id': i,
+            'username': f"user{i}",
+            'email': f"user{i}@load.test",
+            'password_hash': password_hash,
+            'roles': rng.choice(('seeker_doer', 'sponsor', 'both')),
+            'localization': rng.choice(LOCATIONS),
+            'is_in_gaza': True,
+            'created_at': now,
+        } for i in range(1, args.users + 1)])
+
+        db.session.execute(db.insert(UserSkills), [{
+            'id': f"us-{user_id}-{skill['id']}",
+            'user_id': user_id,
+            'skill_id': skill['id'],
+            'created_at': now,
+            'updated_at': now,
+        } for user_id in range(1, args.users + 1) for skill in rng.sample(skills, rng.randint(1, 4))])
+
+        db.session.execute(db.insert(Request), [{
+            'user_id': rng.randint(1, args.users),
+            'type': rng.choice(('donation', 'exchange', 'service')),
+            'description': rng.choice(DESCRIPTIONS),
+            'location': rng.choice(LOCATIONS),
+            'status': 'pending',
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now - timedelta(minutes=i),
+        } for i in range(args.seed_requests)])
+
+        db.session.execute(db.insert(MatchOutcome), [{
+            'helper_id': rng.randint(1, args.users),
+            'successful': rng.random() < 0.8,
+            'response_time_hours': rng.expovariate(1 / 6),
+            'created_at': now - timedelta(days=rng.random() * 180),
+        } for _ in range(args.seed_outcomes)])
+
+        # bulk inserts skip the ORM events that maintain the candidate table
+        CandidateView.rebuild(db.session.connection())
+        db.session.commit()
+        reliability_recomputer.run()
+        print(f"seeded {args.users} users, {args.seed_requests} requests, {args.seed_outcomes} outcomes "
+              f"in {time.perf_counter() - start:.1f}s")
+
+
+def start_server(app):
+    import logging
+    from werkzeug.serving import make_server
+
+    # one access-log line per request would dominate the run
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="load-test-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+class Client:
+    """One simulated user: a logged-in keep-alive session and the operations of the mix"""
+
+    def __init__(self, base_url, users, rng):
+        self.base_url = base_url
+        self.users = users
+        self.rng = rng
+        self.http = requests.Session()
+        self.user_id = None
+        # requests this client created as the logged-in user, for record-outcome
+        self.request_ids = []
+
+    def call(self, method, path, **kwargs):
+        return self.http.request(method, self.base_url + path, timeout=120, **kwargs)
+
+    def login(self):
+        self.user_id = self.rng.randint(1, self.users)
+        self.request_ids = []
+        return self.call("POST", "/api/login", json={'email': f"user{self.user_id}@load.test", 'password': PASSWORD})
+
+    def list_requests(self):
+        params = {'limit': 20}
+        if self.rng.random() < 0.5:
+            params['location'] = self.rng.choice(LOCATIONS)
+        return self.call("GET", "/requests", params=params)
+
+    def create_request(self):
+        response = self.call("POST", "/requests", json={
+            'type': self.rng.choice(('donation', 'exchange', 'service')),
+            'description': self.rng.choice(DESCRIPTIONS),
+            'city': 'gaza',
+        })
+        if response.status_code == 201:
+            self.request_ids.append(response.json()['id'])
+        return response
+
+    def find_matches(self):
+        return self.call("POST", "/api/matching/find-matches", json={
+            'description': self.rng.choice(DESCRIPTIONS),
+            'location': self.rng.choice(LOCATIONS),
+        })
+
+    def search_helpers(self):
+        skill = self.rng.choice(('medical', 'food', 'transport', 'shelter', 'education', 'tech', 'nurse', 'plumbing'))
+        params = {'skill': skill}
+        if self.rng.random() < 0.3:
+            params['location'] = self.rng.choice(LOCATIONS)
+        return self.call("GET", "/api/matching/search-helpers", params=params)
+
+    def record_outcome(self):
+        # outcomes are recorded by the requester, about someone else, once per helper
+        if not self.request_ids:
+            return self.create_request()
+        helper_id = self.rng.randint(1, self.users)
+        if helper_id == self.user_id:
+            helper_id = helper_id % self.users + 1
+        return self.call("POST", "/api/matching/record-outcome", json={
+            'request_id': self.rng.choice(self.request_ids),
+            'helper_user_id': helper_id,
+            'successful': self.rng.random() < 0.8,
+            'response_time_hours': round(self.rng.expovariate(1 / 6), 2),
+        })
+
+
+def parse_mix(spec):
+    mix = {}
+    for item in spec.split(','):
+        name, _, weight = item.partition('=')
+        if not hasattr(Client, name.strip()) or name.strip() == 'call':
+            raise SystemExit(f"unknown operation in --mix: {name}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def run_level(base_url, args, mix, concurrency):
+    """Drive the mix from `concurrency` clients for args.duration seconds; returns {op: [(latency_s, status)]}"""
+    names, weights = list(mix), list(mix.values())
+    results = defaultdict(list)
+    lock = threading.Lock()
+    warmup_until = time.perf_counter() + args.warmup
+    deadline = warmup_until + args.duration
+
+    def worker(index):
+        rng = random.Random(args.seed * 1000 + concurrency * 100 + index)
+        client = Client(base_url, args.users, rng)
+        client.login()
+        local = defaultdict(list)
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            op = rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                status = getattr(client, op)().status_code
+            except requests.RequestException:
+                status = 0
+            if started >= warmup_until:
+                local[op].append((time.perf_counter() - started, status))
+        with lock:
+            for op, samples in local.items():
+                results[op].extend(samples)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def summarize(results, duration):
+    report = {}
+    for op in sorted(results):
+        latencies = np.array([s[0] for s in results[op]]) * 1000
+        statuses = np.array([s[1] for s in results[op]])
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0, 0, 0)
+        report[op] = {
+            'count': int(len(latencies)),
+            'rps': round(len(latencies) / duration, 1),
+            'errors': int(np.count_nonzero((statuses == 0) | ((statuses >= 400) & (statuses != 429) & (statuses != 503)))),
+            'rejected': int(np.count_nonzero((statuses == 429) | (statuses == 503))),
+            'p50_ms': round(float(p50), 1),
+            'p95_ms': round(float(p95), 1),
+            'p99_ms': round(float(p99), 1),
+            'max_ms': round(float(latencies.max()), 1) if len(latencies) else 0.0,
+        }
+    everything = np.array([s[0] for samples in results.values() for s in samples]) * 1000
+    report['total'] = {
+        'count': int(len(everything)),
+        'rps': round(len(everything) / duration, 1),
+        'errors': sum(r['errors'] for r in report.values()),
+        'rejected': sum(r['rejected'] for r in report.values()),
+        'p50_ms': round(float(np.percentile(everything, 50)), 1) if len(everything) else 0.0,
+        'p95_ms': round(float(np.percentile(everything, 95)), 1) if len(everything) else 0.0,
+        'p99_ms': round(float(np.percentile(everything, 99)), 1) if len(everything) else 0.0,
+        'max_ms': round(float(everything.max()), 1) if len(everything) else 0.0,
+    }
+    return report
+
+
+def print_report(report, concurrency):
+    print(f"\nconcurrency={concurrency}")
+    print(f"{'endpoint':<16} {'count':>7} {'req/s':>8} {'err':>5} {'429/503':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for op, r in report.items():
+        print(f"{op:<16} {r['count']:>7} {r['rps']:>8.1f} {r['errors']:>5} {r['rejected']:>8} "
+              f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None,
+                        help="defaults to a SQLite file in the temp directory, reused between runs")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--seed-requests", type=int, default=5000)
+    parser.add_argument("--seed-outcomes", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="cost factor of the seeded password hashes")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"operation=weight list (default {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--sweep", type=int, nargs="+", help="run each concurrency level in turn (saturation sweep)")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before each level")
+    parser.add_argument("--json", help="write the full report to this file")
+    args = parser.parse_args()
+    args.database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.gettempdir(), f'sanned_load_{args.users}.db')}"
+
+    mix = parse_mix(args.mix)
+    configure_environment(args)
+    from app import create_app
+
+    app = create_app()
+    seed(app, args)
+    server, base_url = start_server(app)
+    print(f"serving on {base_url}, database {args.database_url}")
+
+    levels = args.sweep or [args.concurrency]
+    reports = {}
+    for concurrency in levels:
+        reports[concurrency] = summarize(run_level(base_url, args, mix, concurrency), args.duration)
+        print_report(reports[concurrency], concurrency)
+
+    if len(levels) > 1:
+        # the knee: the last level that still added at least 10% throughput
+        print(f"\n{'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        knee = levels[0]
+        for previous, concurrency in zip([None] + levels, levels):
+            total = reports[concurrency]['total']
+            if previous is not None and total['rps'] >= reports[previous]['total']['rps'] * 1.1:
+                knee = concurrency
+            print(f"{concurrency:>7} {total['rps']:>8.1f} {total['p50_ms']:>8.1f} {total['p99_ms']:>8.1f} {total['errors']:>7}")
+        print(f"saturation: throughput stops scaling past {knee} concurrent clients "
+              f"({reports[knee]['total']['rps']} req/s, p99 {reports[knee]['total']['p99_ms']} ms)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({'args': vars(args), 'levels': reports}, f, indent=2)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
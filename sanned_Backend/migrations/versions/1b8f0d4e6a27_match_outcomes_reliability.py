@@ -0,0 +1,51 @@
+"""match outcomes and materialized reliability
+
+Revision ID: 1b8f0d4e6a27
+Revises: e7b0c3d91f56
+Create Date: 2026-10-19 16:02:41.530912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b8f0d4e6a27'
+down_revision = 'e7b0c3d91f56'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('match_outcomes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('helper_id', sa.BigInteger(), nullable=False),
+    sa.Column('request_id', sa.Integer(), nullable=True),
+    sa.Column('recorded_by', sa.BigInteger(), nullable=True),
+    sa.Column('successful', sa.Boolean(), nullable=False),
+    sa.Column('response_time_hours', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['helper_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['recorded_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['request_id'], ['requests.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('match_outcomes', schema=None) as batch_op:
+        batch_op.create_index('ix_match_outcomes_created_at', ['created_at'], unique=False)
+        batch_op.create_index('ix_match_outcomes_helper_id_created_at', ['helper_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reliability_score', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('reliability_updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('reliability_updated_at')
+        batch_op.drop_column('reliability_score')
+
+    with op.batch_alter_table('match_outcomes', schema=None) as batch_op:
+        batch_op.drop_index('ix_match_outcomes_helper_id_created_at')
+        batch_op.drop_index('ix_match_outcomes_created_at')
+
+    op.drop_table('match_outcomes')
@@ -0,0 +1,65 @@
+"""sponsorships and webhook event store
+
+Revision ID: 3f1c2a9b7d10
+Revises: 
+Create Date: 2026-10-19 09:12:44.318201
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9b7d10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sponsorships',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sponsor_id', sa.BigInteger(), nullable=False),
+    sa.Column('request_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=True),
+    sa.Column('pay_doer', sa.Boolean(), nullable=True),
+    sa.Column('status', sa.Enum('pending', 'reserved', 'paid', 'failed', name='sponsorship_statuses'), nullable=True),
+    sa.Column('checkout_id', sa.String(length=100), nullable=True),
+    sa.Column('checkout_url', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['request_id'], ['requests.id'], ),
+    sa.ForeignKeyConstraint(['sponsor_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('sponsorships', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_sponsorships_checkout_id'), ['checkout_id'], unique=False)
+
+    op.create_table('webhook_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('provider', sa.String(length=30), nullable=False),
+    sa.Column('event_id', sa.String(length=100), nullable=False),
+    sa.Column('event_type', sa.String(length=100), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('status', sa.Enum('received', 'processed', 'ignored', 'failed', name='webhook_event_statuses'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('received_at', sa.DateTime(), nullable=True),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('provider', 'event_id', name='uq_webhook_events_provider_event_id')
+    )
+    with op.batch_alter_table('webhook_events', schema=None) as batch_op:
+        batch_op.create_index('ix_webhook_events_status_id', ['status', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('webhook_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_webhook_events_status_id')
+
+    op.drop_table('webhook_events')
+    with op.batch_alter_table('sponsorships', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sponsorships_checkout_id'))
+
+    op.drop_table('sponsorships')
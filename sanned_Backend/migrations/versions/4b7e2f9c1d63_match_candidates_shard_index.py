@@ -0,0 +1,26 @@
+"""index match candidates by location shard
+
+Revision ID: 4b7e2f9c1d63
+Revises: 9d2c7a5e3f18
+Create Date: 2026-10-19 21:04:37.118520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2f9c1d63'
+down_revision = '9d2c7a5e3f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('match_candidates', schema=None) as batch_op:
+        batch_op.create_index('ix_match_candidates_location_id', ['location_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('match_candidates', schema=None) as batch_op:
+        batch_op.drop_index('ix_match_candidates_location_id')
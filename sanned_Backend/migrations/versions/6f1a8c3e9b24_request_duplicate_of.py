@@ -0,0 +1,30 @@
+"""near-duplicate requests
+
+Revision ID: 6f1a8c3e9b24
+Revises: 4b7e2f9c1d63
+Create Date: 2026-10-19 22:38:12.560914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f1a8c3e9b24'
+down_revision = '4b7e2f9c1d63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('requests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('duplicate_of_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_requests_duplicate_of_id'), ['duplicate_of_id'], unique=False)
+        batch_op.create_foreign_key('fk_requests_duplicate_of_id', 'requests', ['duplicate_of_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade():
+    with op.batch_alter_table('requests', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_requests_duplicate_of_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_requests_duplicate_of_id'))
+        batch_op.drop_column('duplicate_of_id')
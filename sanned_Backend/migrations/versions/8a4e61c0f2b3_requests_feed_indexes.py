@@ -0,0 +1,36 @@
+"""requests location column and feed indexes
+
+Revision ID: 8a4e61c0f2b3
+Revises: 3f1c2a9b7d10
+Create Date: 2026-10-19 11:02:17.640912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e61c0f2b3'
+down_revision = '3f1c2a9b7d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('requests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('location', sa.String(length=100), nullable=True))
+        batch_op.create_index('ix_requests_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_requests_status_created_at', ['status', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_requests_type_status_created_at', ['type', 'status', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_requests_location_status_created_at', ['location', 'status', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_requests_user_id_status', ['user_id', 'status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('requests', schema=None) as batch_op:
+        batch_op.drop_index('ix_requests_user_id_status')
+        batch_op.drop_index('ix_requests_location_status_created_at')
+        batch_op.drop_index('ix_requests_type_status_created_at')
+        batch_op.drop_index('ix_requests_status_created_at')
+        batch_op.drop_index('ix_requests_created_at_id')
+        batch_op.drop_column('location')
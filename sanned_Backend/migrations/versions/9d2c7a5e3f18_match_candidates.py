@@ -0,0 +1,109 @@
+"""materialized match candidates
+
+Revision ID: 9d2c7a5e3f18
+Revises: 1b8f0d4e6a27
+Create Date: 2026-10-19 17:21:09.402731
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d2c7a5e3f18'
+down_revision = '1b8f0d4e6a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('match_candidates',
+    sa.Column('user_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(length=150), nullable=False),
+    sa.Column('email', sa.String(length=150), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('location', sa.String(length=100), nullable=False),
+    sa.Column('location_id', sa.SmallInteger(), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('skills', sa.JSON(), nullable=False),
+    sa.Column('reliability', sa.Float(), nullable=True),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # populate from the current users; from here on it is kept current by app.services.candidate_view
+    _backfill(op.get_bind())
+
+
+# The schema and location table as of this revision, so the backfill does not depend on the
+# models or the matcher changing later.
+LOCATIONS = {
+    'gaza_city': (31.5017, 34.4668),
+    'khan_yunis': (31.3489, 34.3063),
+    'rafah': (31.2889, 34.2417),
+    'deir_al_balah': (31.4181, 34.3511),
+    'jabalya': (31.5314, 34.4833),
+    'beit_lahia': (31.5469, 34.5069),
+    'beit_hanoun': (31.5394, 34.5361),
+    'gaza_center': (31.5017, 34.4668),
+}
+DEFAULT_LOCATION = 'gaza_center'
+CANDIDATE_ROLES = ('sponsor', 'seeker_doer', 'both')
+
+users = sa.table('users',
+    sa.column('id', sa.BigInteger), sa.column('username', sa.String), sa.column('email', sa.String),
+    sa.column('phone_number', sa.String), sa.column('roles', sa.String), sa.column('localization', sa.String),
+    sa.column('latitude', sa.String), sa.column('longitude', sa.String), sa.column('is_in_gaza', sa.Boolean),
+    sa.column('reliability_score', sa.Float))
+user_skills = sa.table('user_skills',
+    sa.column('id', sa.String), sa.column('user_id', sa.BigInteger), sa.column('skill_id', sa.String),
+    sa.column('created_at', sa.DateTime))
+skills = sa.table('skills', sa.column('id', sa.String), sa.column('name', sa.String))
+match_candidates = sa.table('match_candidates',
+    sa.column('user_id', sa.BigInteger), sa.column('name', sa.String), sa.column('email', sa.String),
+    sa.column('phone', sa.String), sa.column('role', sa.String), sa.column('location', sa.String),
+    sa.column('location_id', sa.SmallInteger), sa.column('latitude', sa.Float), sa.column('longitude', sa.Float),
+    sa.column('skills', sa.JSON), sa.column('reliability', sa.Float), sa.column('refreshed_at', sa.DateTime))
+
+
+def _coordinate(value, fallback):
+    try:
+        return float(value) if value not in (None, '') else fallback
+    except (TypeError, ValueError):
+        return fallback
+
+
+def _backfill(connection):
+    names = {}
+    for user_id, name in connection.execute(
+        sa.select(user_skills.c.user_id, skills.c.name)
+        .select_from(user_skills.join(skills, user_skills.c.skill_id == skills.c.id))
+        .order_by(user_skills.c.created_at, user_skills.c.id)
+    ):
+        names.setdefault(user_id, []).append(name)
+
+    now = datetime.utcnow()
+    location_ids = {name: code for code, name in enumerate(LOCATIONS)}
+    rows = []
+    for u in connection.execute(sa.select(users).where(
+        users.c.roles.in_(CANDIDATE_ROLES), users.c.is_in_gaza == sa.true()
+    )):
+        location = '_'.join(u.localization.strip().lower().split()) if u.localization else None
+        location = location or DEFAULT_LOCATION
+        known = location if location in LOCATIONS else DEFAULT_LOCATION
+        lat, lon = LOCATIONS[known]
+        rows.append({
+            'user_id': u.id, 'name': u.username, 'email': u.email, 'phone': u.phone_number, 'role': u.roles,
+            'location': location, 'location_id': location_ids[known],
+            'latitude': _coordinate(u.latitude, lat), 'longitude': _coordinate(u.longitude, lon),
+            'skills': names.get(u.id, []), 'reliability': u.reliability_score, 'refreshed_at': now,
+        })
+    for start in range(0, len(rows), 500):
+        connection.execute(match_candidates.insert(), rows[start:start + 500])
+
+
+def downgrade():
+    op.drop_table('match_candidates')
@@ -0,0 +1,32 @@
+"""one match outcome per request and helper
+
+Revision ID: a3d5e8f1c7b2
+Revises: 6f1a8c3e9b24
+Create Date: 2026-10-19 23:41:05.218337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d5e8f1c7b2'
+down_revision = '6f1a8c3e9b24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # keep the first outcome recorded for each request and helper
+    op.execute(
+        "DELETE FROM match_outcomes WHERE request_id IS NOT NULL AND id NOT IN ("
+        "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM match_outcomes "
+        "WHERE request_id IS NOT NULL GROUP BY request_id, helper_id) AS first_outcomes)"
+    )
+    with op.batch_alter_table('match_outcomes', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_match_outcomes_request_id_helper_id', ['request_id', 'helper_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('match_outcomes', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_match_outcomes_request_id_helper_id', type_='unique')
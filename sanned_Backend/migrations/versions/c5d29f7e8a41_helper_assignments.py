@@ -0,0 +1,43 @@
+"""helper assignments
+
+Revision ID: c5d29f7e8a41
+Revises: 8a4e61c0f2b3
+Create Date: 2026-10-19 13:27:05.118374
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d29f7e8a41'
+down_revision = '8a4e61c0f2b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('helper_assignments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('request_id', sa.Integer(), nullable=False),
+    sa.Column('helper_id', sa.BigInteger(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('urgency', sa.String(length=20), nullable=True),
+    sa.Column('status', sa.Enum('proposed', 'accepted', 'declined', 'cancelled', name='assignment_statuses'), nullable=False),
+    sa.Column('run_id', sa.String(length=32), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['helper_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['request_id'], ['requests.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('helper_assignments', schema=None) as batch_op:
+        batch_op.create_index('ix_helper_assignments_helper_id_status', ['helper_id', 'status'], unique=False)
+        batch_op.create_index('ix_helper_assignments_request_id_status', ['request_id', 'status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('helper_assignments', schema=None) as batch_op:
+        batch_op.drop_index('ix_helper_assignments_request_id_status')
+        batch_op.drop_index('ix_helper_assignments_helper_id_status')
+
+    op.drop_table('helper_assignments')
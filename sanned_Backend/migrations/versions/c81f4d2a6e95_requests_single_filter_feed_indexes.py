@@ -0,0 +1,28 @@
+"""feed indexes for type-only and location-only pages
+
+Revision ID: c81f4d2a6e95
+Revises: a3d5e8f1c7b2
+Create Date: 2026-10-19 23:58:44.903126
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81f4d2a6e95'
+down_revision = 'a3d5e8f1c7b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('requests', schema=None) as batch_op:
+        batch_op.create_index('ix_requests_type_created_at', ['type', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_requests_location_created_at', ['location', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('requests', schema=None) as batch_op:
+        batch_op.drop_index('ix_requests_location_created_at')
+        batch_op.drop_index('ix_requests_type_created_at')
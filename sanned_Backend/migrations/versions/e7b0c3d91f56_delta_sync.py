@@ -0,0 +1,65 @@
+"""updated_at columns and tombstones for delta sync
+
+Revision ID: e7b0c3d91f56
+Revises: c5d29f7e8a41
+Create Date: 2026-10-19 15:48:31.902554
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b0c3d91f56'
+down_revision = 'c5d29f7e8a41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sync_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('row_id', sa.String(length=64), nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('sync_tombstones', schema=None) as batch_op:
+        batch_op.create_index('ix_sync_tombstones_deleted_at_id', ['deleted_at', 'id'], unique=False)
+
+    with op.batch_alter_table('requests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    with op.batch_alter_table('user_skills', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # existing rows count as last changed when they were created
+    op.execute("UPDATE requests SET updated_at = created_at")
+    op.execute("UPDATE matches SET updated_at = created_at")
+    op.execute("UPDATE user_skills SET updated_at = created_at")
+
+    with op.batch_alter_table('requests', schema=None) as batch_op:
+        batch_op.create_index('ix_requests_updated_at_id', ['updated_at', 'id'], unique=False)
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.create_index('ix_matches_updated_at_id', ['updated_at', 'id'], unique=False)
+    with op.batch_alter_table('user_skills', schema=None) as batch_op:
+        batch_op.create_index('ix_user_skills_user_id_updated_at', ['user_id', 'updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_skills', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_skills_user_id_updated_at')
+        batch_op.drop_column('updated_at')
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.drop_index('ix_matches_updated_at_id')
+        batch_op.drop_column('updated_at')
+    with op.batch_alter_table('requests', schema=None) as batch_op:
+        batch_op.drop_index('ix_requests_updated_at_id')
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('sync_tombstones', schema=None) as batch_op:
+        batch_op.drop_index('ix_sync_tombstones_deleted_at_id')
+
+    op.drop_table('sync_tombstones')